@@ -125,6 +125,23 @@ class ADwin:
             if self.raiseExceptions != 0:
                 raise ADwinError(functionName, self.Get_Error_Text(self.__err.value), self.__err.value)
 
+    def __numpyBuffer(self, out, Count, dtype, functionName):
+        '''Returns a contiguous numpy array of Count elements to transfer data into: \
+            a view of out if given, otherwise a newly allocated array.'''
+        if not _isNumpyAvailable:
+            raise ModuleNotFoundError("No module named 'numpy'")
+        if out is None:
+            return np.empty(Count, dtype=dtype)
+        if not isinstance(out, np.ndarray) or out.dtype != dtype:
+            raise TypeError('%s: out must be a numpy array of dtype %s' % (functionName, np.dtype(dtype).name))
+        if not out.flags.c_contiguous or not out.flags.writeable:
+            raise ValueError('%s: out must be a writeable C-contiguous array' % functionName)
+        if out.size < Count:
+            raise ValueError('%s: out has %d elements, %d required' % (functionName, out.size, Count))
+        if out.size == Count:
+            return out
+        return out.reshape(-1)[:Count]
+
     # system control and system information
     def Boot(self, Filename):
         '''Boot initializes the ADwin system and loads the file of the \
@@ -336,7 +353,7 @@ class ADwin:
     def SetData_Byte(self, Data, DataNo, Startindex, Count):
         '''SetData_Byte transfers int8 data from the PC into a DATA array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.int8)
+            data = np.ascontiguousarray(Data, dtype=np.int8)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int8))
             self.dll.e_Set_Data(ptr, self.ADWIN_DATATYPE_INT8, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -351,21 +368,27 @@ class ADwin:
             self.dll.e_Set_Data(data, self.ADWIN_DATATYPE_INT8, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetData_Byte')
 
-    def GetData_Byte(self, DataNo, StartIndex, Count):
-        '''GetData_Byte transfers int8 data from a DATA array of an ADwin system into an array.'''
+    def GetData_Byte(self, DataNo, StartIndex, Count, out=None):
+        '''GetData_Byte transfers int8 data from a DATA array of an ADwin system into an array.
+        If out (a C-contiguous int8 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.int8, 'GetData_Byte')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int8))
+            self.dll.e_Get_Data(ptr, self.ADWIN_DATATYPE_INT8, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetData_Byte')
+            return data
         dataType = ctypes.c_int8 * Count
         data = dataType(0)
         self.dll.e_Get_Data(data, self.ADWIN_DATATYPE_INT8, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetData_Byte')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.int8)
-        else:
-            return data
+        return data
 
     def SetData_Short(self, Data, DataNo, Startindex, Count):
         '''SetData_Short transfers int16 data from the PC into a DATA array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.int16)
+            data = np.ascontiguousarray(Data, dtype=np.int16)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int16))
             self.dll.e_Set_Data(ptr, self.ADWIN_DATATYPE_INT16, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -380,21 +403,27 @@ class ADwin:
             self.dll.e_Set_Data(data, self.ADWIN_DATATYPE_INT16, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetData_Short')
 
-    def GetData_Short(self, DataNo, StartIndex, Count):
-        '''GetData_Short transfers int16 data from a DATA array of an ADwin system into an array.'''
+    def GetData_Short(self, DataNo, StartIndex, Count, out=None):
+        '''GetData_Short transfers int16 data from a DATA array of an ADwin system into an array.
+        If out (a C-contiguous int16 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.int16, 'GetData_Short')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int16))
+            self.dll.e_Get_Data(ptr, self.ADWIN_DATATYPE_INT16, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetData_Short')
+            return data
         dataType = ctypes.c_int16 * Count
         data = dataType(0)
         self.dll.e_Get_Data(data, self.ADWIN_DATATYPE_INT16, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetData_Short')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.int16)
-        else:
-            return data
+        return data
 
     def SetData_Long(self, Data, DataNo, Startindex, Count):
         '''SetData_Long transfers int32 data from the PC into a DATA array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.int32)
+            data = np.ascontiguousarray(Data, dtype=np.int32)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int32))
             self.dll.e_Set_Data(ptr, self.ADWIN_DATATYPE_INT32, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -409,21 +438,27 @@ class ADwin:
             self.dll.e_Set_Data(data, self.ADWIN_DATATYPE_INT32, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetData_Long')
 
-    def GetData_Long(self, DataNo, StartIndex, Count):
-        '''GetData_Long transfers int32 data from a DATA array of an ADwin system into an array.'''
+    def GetData_Long(self, DataNo, StartIndex, Count, out=None):
+        '''GetData_Long transfers int32 data from a DATA array of an ADwin system into an array.
+        If out (a C-contiguous int32 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.int32, 'GetData_Long')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int32))
+            self.dll.e_Get_Data(ptr, self.ADWIN_DATATYPE_INT32, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetData_Long')
+            return data
         dataType = ctypes.c_int32 * Count
         data = dataType(0)
         self.dll.e_Get_Data(data, self.ADWIN_DATATYPE_INT32, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetData_Long')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.int32)
-        else:
-            return data
+        return data
 
     def SetData_Float(self, Data, DataNo, Startindex, Count):
         '''SetData_Float transfers float data from the PC into a DATA array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.float32)
+            data = np.ascontiguousarray(Data, dtype=np.float32)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
             self.dll.e_Set_Data(ptr, self.ADWIN_DATATYPE_SINGLE, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -438,21 +473,27 @@ class ADwin:
             self.dll.e_Set_Data(data, self.ADWIN_DATATYPE_SINGLE, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetData_Float')
 
-    def GetData_Float(self, DataNo, StartIndex, Count):
-        '''GetData_Float transfers float data from a DATA array of an ADwin system into an array.'''
+    def GetData_Float(self, DataNo, StartIndex, Count, out=None):
+        '''GetData_Float transfers float data from a DATA array of an ADwin system into an array.
+        If out (a C-contiguous float32 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.float32, 'GetData_Float')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
+            self.dll.e_Get_Data(ptr, self.ADWIN_DATATYPE_SINGLE, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetData_Float')
+            return data
         dataType = ctypes.c_float * Count
         data = dataType(0)
         self.dll.e_Get_Data(data, self.ADWIN_DATATYPE_SINGLE, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetData_Float')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.float32)
-        else:
-            return data
+        return data
 
     def SetData_Double(self, Data, DataNo, Startindex, Count):
         '''SetData_Double transfers double data from the PC into a DATA array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.float64)
+            data = np.ascontiguousarray(Data, dtype=np.float64)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
             self.dll.e_Set_Data(ptr, self.ADWIN_DATATYPE_DOUBLE, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -467,21 +508,27 @@ class ADwin:
             self.dll.e_Set_Data(data, self.ADWIN_DATATYPE_DOUBLE, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetData_Double')
 
-    def GetData_Double(self, DataNo, StartIndex, Count):
-        '''GetData_Double transfers double data from a DATA array of an ADwin system into an array.'''
+    def GetData_Double(self, DataNo, StartIndex, Count, out=None):
+        '''GetData_Double transfers double data from a DATA array of an ADwin system into an array.
+        If out (a C-contiguous float64 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.float64, 'GetData_Double')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+            self.dll.e_Get_Data(ptr, self.ADWIN_DATATYPE_DOUBLE, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetData_Double')
+            return data
         dataType = ctypes.c_double * Count
         data = dataType(0)
         self.dll.e_Get_Data(data, self.ADWIN_DATATYPE_DOUBLE, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetData_Double')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.float64)
-        else:
-            return data
+        return data
 
     def SetData_Int64(self, Data, DataNo, Startindex, Count):
         '''SetData_Double transfers int64 data from the PC into a DATA array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.int64)
+            data = np.ascontiguousarray(Data, dtype=np.int64)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int64))
             self.dll.e_Set_Data(ptr, self.ADWIN_DATATYPE_INT64, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -496,16 +543,22 @@ class ADwin:
             self.dll.e_Set_Data(data, self.ADWIN_DATATYPE_INT64, DataNo, Startindex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetData_Int64')
 
-    def GetData_Int64(self, DataNo, StartIndex, Count):
-        '''GetData_Double transfers int64 data from a DATA array of an ADwin system into an array.'''
+    def GetData_Int64(self, DataNo, StartIndex, Count, out=None):
+        '''GetData_Double transfers int64 data from a DATA array of an ADwin system into an array.
+        If out (a C-contiguous int64 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.int64, 'GetData_Int64')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int64))
+            self.dll.e_Get_Data(ptr, self.ADWIN_DATATYPE_INT64, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetData_Int64')
+            return data
         dataType = ctypes.c_int64 * Count
         data = dataType(0)
         self.dll.e_Get_Data(data, self.ADWIN_DATATYPE_INT64, DataNo, StartIndex, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetData_Int64')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.int64)
-        else:
-            return data
+        return data
 
     # Transfer of FIFO Arrays
     def Fifo_Empty(self, FifoNo):
@@ -528,7 +581,7 @@ class ADwin:
     def SetFifo_Byte(self, FifoNo, Data, Count):
         '''SetFifo_Byte transfers int8 data from the PC to a FIFO array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.int8)
+            data = np.ascontiguousarray(Data, dtype=np.int8)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int8))
             self.dll.e_Set_Fifo(ptr, self.ADWIN_DATATYPE_INT8, FifoNo, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -543,21 +596,27 @@ class ADwin:
             self.dll.e_Set_Fifo(data, self.ADWIN_DATATYPE_INT8, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetFifo_Byte')
 
-    def GetFifo_Byte(self, FifoNo, Count):
-        '''GetFifo_Byte transfers int8 FIFO data from the ADwin system to the PC.'''
+    def GetFifo_Byte(self, FifoNo, Count, out=None):
+        '''GetFifo_Byte transfers int8 FIFO data from the ADwin system to the PC.
+        If out (a C-contiguous int8 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.int8, 'GetFifo_Byte')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int8))
+            self.dll.e_Get_Fifo(ptr, self.ADWIN_DATATYPE_INT8, FifoNo, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetFifo_Byte')
+            return data
         dataType = ctypes.c_int8 * Count
         data = dataType(0)
         self.dll.e_Get_Fifo(data, self.ADWIN_DATATYPE_INT8, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetFifo_Byte')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.int8)
-        else:
-            return data
+        return data
 
     def SetFifo_Short(self, FifoNo, Data, Count):
         '''SetFifo_Short transfers int16 data from the PC to a FIFO array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.int16)
+            data = np.ascontiguousarray(Data, dtype=np.int16)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int16))
             self.dll.e_Set_Fifo(ptr, self.ADWIN_DATATYPE_INT16, FifoNo, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -572,21 +631,27 @@ class ADwin:
             self.dll.e_Set_Fifo(data, self.ADWIN_DATATYPE_INT16, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetFifo_Short')
 
-    def GetFifo_Short(self, FifoNo, Count):
-        '''GetFifo_Short transfers int16 FIFO data from the ADwin system to the PC.'''
+    def GetFifo_Short(self, FifoNo, Count, out=None):
+        '''GetFifo_Short transfers int16 FIFO data from the ADwin system to the PC.
+        If out (a C-contiguous int16 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.int16, 'GetFifo_Short')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int16))
+            self.dll.e_Get_Fifo(ptr, self.ADWIN_DATATYPE_INT16, FifoNo, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetFifo_Short')
+            return data
         dataType = ctypes.c_int16 * Count
         data = dataType(0)
         self.dll.e_Get_Fifo(data, self.ADWIN_DATATYPE_INT16, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetFifo_Short')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.int16)
-        else:
-            return data
+        return data
 
     def SetFifo_Long(self, FifoNo, Data, Count):
         '''SetFifo_Long transfers int32 data from the PC to a FIFO array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.int32)
+            data = np.ascontiguousarray(Data, dtype=np.int32)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int32))
             self.dll.e_Set_Fifo(ptr, self.ADWIN_DATATYPE_INT32, FifoNo, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -601,21 +666,27 @@ class ADwin:
             self.dll.e_Set_Fifo(data, self.ADWIN_DATATYPE_INT32, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetFifo_Long')
 
-    def GetFifo_Long(self, FifoNo, Count):
-        '''GetFifo_Long transfers int32 FIFO data from the ADwin system to the PC.'''
+    def GetFifo_Long(self, FifoNo, Count, out=None):
+        '''GetFifo_Long transfers int32 FIFO data from the ADwin system to the PC.
+        If out (a C-contiguous int32 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.int32, 'GetFifo_Long')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int32))
+            self.dll.e_Get_Fifo(ptr, self.ADWIN_DATATYPE_INT32, FifoNo, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetFifo_Long')
+            return data
         dataType = ctypes.c_int32 * Count
         data = dataType(0)
         self.dll.e_Get_Fifo(data, self.ADWIN_DATATYPE_INT32, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetFifo_Long')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.int32)
-        else:
-            return data
+        return data
 
     def SetFifo_Float(self, FifoNo, Data, Count):
         '''SetFifo_Float transfers float data from the PC into a FIFO array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.float32)
+            data = np.ascontiguousarray(Data, dtype=np.float32)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
             self.dll.e_Set_Fifo(ptr, self.ADWIN_DATATYPE_SINGLE, FifoNo, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -630,21 +701,27 @@ class ADwin:
             self.dll.e_Set_Fifo(data, self.ADWIN_DATATYPE_SINGLE, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetFifo_Float')
 
-    def GetFifo_Float(self, FifoNo, Count):
-        '''GetFifo_Float transfers float FIFO data from the ADwin system to the PC.'''
+    def GetFifo_Float(self, FifoNo, Count, out=None):
+        '''GetFifo_Float transfers float FIFO data from the ADwin system to the PC.
+        If out (a C-contiguous float32 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.float32, 'GetFifo_Float')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
+            self.dll.e_Get_Fifo(ptr, self.ADWIN_DATATYPE_SINGLE, FifoNo, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetFifo_Float')
+            return data
         dataType = ctypes.c_float * Count
         data = dataType(0)
         self.dll.e_Get_Fifo(data, self.ADWIN_DATATYPE_SINGLE, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetFifo_Float')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.float32)
-        else:
-            return data
+        return data
 
     def SetFifo_Double(self, FifoNo, Data, Count):
         '''SetFifo_Double transfers double data from the PC into a FIFO array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.float64)
+            data = np.ascontiguousarray(Data, dtype=np.float64)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
             self.dll.e_Set_Fifo(ptr, self.ADWIN_DATATYPE_DOUBLE, FifoNo, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -659,21 +736,27 @@ class ADwin:
             self.dll.e_Set_Fifo(data, self.ADWIN_DATATYPE_DOUBLE, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetFifo_Double')
 
-    def GetFifo_Double(self, FifoNo, Count):
-        '''GetFifo_Double transfers double FIFO data from the ADwin system to the PC.'''
+    def GetFifo_Double(self, FifoNo, Count, out=None):
+        '''GetFifo_Double transfers double FIFO data from the ADwin system to the PC.
+        If out (a C-contiguous float64 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.float64, 'GetFifo_Double')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+            self.dll.e_Get_Fifo(ptr, self.ADWIN_DATATYPE_DOUBLE, FifoNo, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetFifo_Double')
+            return data
         dataType = ctypes.c_double * Count
         data = dataType(0)
         self.dll.e_Get_Fifo(data, self.ADWIN_DATATYPE_DOUBLE, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetFifo_Double')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.float64)
-        else:
-            return data
+        return data
 
     def SetFifo_Int64(self, FifoNo, Data, Count):
         '''SetFifo_Int64 transfers int64 data from the PC into a FIFO array of the ADwin system.'''
         if _isNumpyAvailable:
-            data = np.array(Data, dtype=np.int64)
+            data = np.ascontiguousarray(Data, dtype=np.int64)
             ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int64))
             self.dll.e_Set_Fifo(ptr, self.ADWIN_DATATYPE_INT64, FifoNo, Count, self.DeviceNo, self.__errPointer)
         else:
@@ -688,16 +771,22 @@ class ADwin:
             self.dll.e_Set_Fifo(data, self.ADWIN_DATATYPE_INT64, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('SetFifo_Int64')
 
-    def GetFifo_Int64(self, FifoNo, Count):
-        '''GetFifo_Double transfers int64 FIFO data from the ADwin system to the PC.'''
+    def GetFifo_Int64(self, FifoNo, Count, out=None):
+        '''GetFifo_Double transfers int64 FIFO data from the ADwin system to the PC.
+        If out (a C-contiguous int64 numpy array with at least Count elements) is given,
+        the data is transferred directly into it; otherwise a numpy array is returned if
+        useNumpyArrays is set.'''
+        if out is not None or self.useNumpyArrays:
+            data = self.__numpyBuffer(out, Count, np.int64, 'GetFifo_Int64')
+            ptr = data.ctypes.data_as(ctypes.POINTER(ctypes.c_int64))
+            self.dll.e_Get_Fifo(ptr, self.ADWIN_DATATYPE_INT64, FifoNo, Count, self.DeviceNo, self.__errPointer)
+            self.__checkError('GetFifo_Int64')
+            return data
         dataType = ctypes.c_int64 * Count
         data = dataType(0)
         self.dll.e_Get_Fifo(data, self.ADWIN_DATATYPE_INT64, FifoNo, Count, self.DeviceNo, self.__errPointer)
         self.__checkError('GetFifo_Int64')
-        if self.useNumpyArrays:
-            return np.array(data, dtype=np.int64)
-        else:
-            return data
+        return data
 
     def Data2File(self, Filename, DataNo, StartIndex, Count, Mode):
         ''' Writes array-elements of ADwin-System immediately to harddisk '''
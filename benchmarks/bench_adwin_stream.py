@@ -0,0 +1,59 @@
+"""
+Packed ADwin Streaming Benchmark
+End-to-end PackedBufferReader throughput against the driver simulator
+
+Run from the repository root:
+    python -m benchmarks.bench_adwin_stream
+"""
+import time
+
+from hardware.adwin_board import AdWinGoldIII, PackedDecoder
+from hardware.adwin_sim import PackedAnalogProcess
+from hardware.adwin_stream import PackedBufferReader
+
+PROCESS_NO = 9
+DURATION_S = 2.0
+# Processdelays on the simulated T12 (1 ns per unit): 10 kHz .. 200 kHz steps
+PROCESSDELAYS = (100_000, 20_000, 10_000, 5_000)
+
+
+def run(board: AdWinGoldIII, processdelay: int, volts: bool) -> dict:
+    """Stream for DURATION_S; returns steps read, expected and overruns"""
+    adwin = board._adwin
+    adwin.dll.add_process(PROCESS_NO, PackedAnalogProcess(n_channels=16, bits=16),
+                          processdelay=processdelay)
+    adwin.Start_Process(PROCESS_NO)
+
+    reader = PackedBufferReader(board, decoder=PackedDecoder(16, 16, volts=volts),
+                                poll_interval_s=0.005)
+    reader.sync()
+    steps = overruns = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION_S:
+        block = reader.read()
+        if block is not None:
+            steps += block.data.shape[0]
+            overruns += block.overrun
+        time.sleep(reader.poll_interval_s)
+    elapsed = time.perf_counter() - start
+
+    adwin.Stop_Process(PROCESS_NO)
+    return {"steps": steps, "expected": elapsed * 1e9 / processdelay,
+            "elapsed": elapsed, "overruns": overruns}
+
+
+def main():
+    board = AdWinGoldIII(simulate=True)
+    print(f"{'rate kHz':>9} {'output':>7} {'MS/s':>8} {'read %':>7} {'overruns':>9}")
+    for processdelay in PROCESSDELAYS:
+        for volts in (False, True):
+            result = run(board, processdelay, volts)
+            rate = result["steps"] * 16 / result["elapsed"] / 1e6
+            read = 100.0 * result["steps"] / result["expected"]
+            print(f"{1e6 / processdelay:>9.0f} {'volts' if volts else 'codes':>7} "
+                  f"{rate:>8.2f} {read:>7.1f} {result['overruns']:>9}")
+    board._adwin.dll.close()
+
+
+if __name__ == "__main__":
+    main()
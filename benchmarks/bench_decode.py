@@ -0,0 +1,49 @@
+"""
+Packed ADwin Sample Decoding Benchmark
+Throughput of PackedDecoder for the 16-channel packed buffer
+
+Run from the repository root:
+    python -m benchmarks.bench_decode
+"""
+import time
+
+import numpy as np
+
+from hardware.adwin_board import PackedDecoder
+
+# One full DATA_180 buffer of the 16-channel packed process
+BUFFER_LONGS = 1_000_000
+N_CHANNELS = 16
+
+
+def make_block(bits: int) -> np.ndarray:
+    """Random raw block packing two bits-wide codes per LONG"""
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 1 << bits, size=(BUFFER_LONGS, 2), dtype=np.int64)
+    return (codes[:, 0] | (codes[:, 1] << 16)).astype(np.uint32).view(np.int32)
+
+
+def run(decoder: PackedDecoder, raw: np.ndarray, repeats: int = 20) -> float:
+    """Decode into a preallocated output; returns million samples per second"""
+    out = np.empty((raw.size * 2 // N_CHANNELS, N_CHANNELS), dtype=decoder.dtype)
+    decoder.decode(raw, out=out)  # warm up
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        decoder.decode(raw, out=out)
+    elapsed = time.perf_counter() - start
+    return raw.size * 2 * repeats / elapsed / 1e6
+
+
+def main():
+    print(f"{'bits':>5} {'output':>8} {'MS/s':>10}")
+    for bits in (12, 14, 16):
+        raw = make_block(bits)
+        for volts in (False, True):
+            decoder = PackedDecoder(n_channels=N_CHANNELS, bits=bits, volts=volts)
+            rate = run(decoder, raw)
+            print(f"{bits:>5} {'volts' if volts else 'codes':>8} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Fused Preprocessing Benchmark
+Frame passes and time of the fused stage against the default three-stage chain
+
+Run from the repository root:
+    python -m benchmarks.bench_fused
+"""
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import processing.pipeline as pipeline_module
+from processing.background import HistogramMedianBackground, MedianBackground
+from processing.pipeline import (
+    BackgroundSubtraction,
+    CentroidDetection,
+    FusedPreprocessing,
+    GaussianFilter,
+    ProcessingPipeline,
+)
+from benchmarks.bench_pipeline import make_frames
+
+CACHE_BYTES = 1 << 20  # stand-in for L2: regions touched again while they fit are free
+
+
+class Traffic:
+    """
+    Frame-sized memory traffic, counted in frame traversals
+
+    Every operation on a frame buffer (or part of it) adds the elements it
+    touches, unless that region is a block of at most half of CACHE_BYTES
+    that was touched recently and the regions since then fit in
+    CACHE_BYTES, i.e. it would still be in cache. Whole frames never count
+    as cached, whatever their size.
+    """
+
+    def __init__(self):
+        self.elements = 0
+        self._recent = OrderedDict()
+
+    def touch(self, array: np.ndarray):
+        key = (array.__array_interface__["data"][0], array.shape, array.strides)
+        if key in self._recent:
+            self._recent.move_to_end(key)
+            return
+        self.elements += array.size
+        if array.nbytes > CACHE_BYTES // 2:
+            self._recent.clear()
+            return
+        self._recent[key] = array.nbytes
+        while sum(self._recent.values()) > CACHE_BYTES:
+            self._recent.popitem(last=False)
+
+    def full_pass(self, size: int, count: int = 1):
+        """Whole-frame passes inside scipy (nothing stays cached)"""
+        self.elements += count * size
+        self._recent.clear()
+
+
+TRAFFIC = Traffic()
+
+
+def _plain(value):
+    if isinstance(value, CountingArray):
+        TRAFFIC.touch(value)
+        return value.view(np.ndarray)
+    if isinstance(value, (tuple, list)):
+        return type(value)(_plain(v) for v in value)
+    return value
+
+
+class CountingArray(np.ndarray):
+    """Frame buffer view that reports the regions numpy operations touch"""
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = _plain(inputs)
+        if "out" in kwargs:
+            kwargs["out"] = _plain(kwargs["out"])
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        return func(*_plain(args), **{k: _plain(v) for k, v in kwargs.items()})
+
+    def partition(self, *args, **kwargs):
+        return _plain(self).partition(*args, **kwargs)
+
+
+class CountingNdimage:
+    """scipy.ndimage stand-in counting the frame passes of the filters used"""
+
+    def __init__(self, ndimage):
+        self._ndimage = ndimage
+
+    def __getattr__(self, name):
+        return getattr(self._ndimage, name)
+
+    def gaussian_filter(self, input, *args, **kwargs):
+        # One read and one write pass per axis
+        TRAFFIC.full_pass(input.size, 2 * input.ndim)
+        return self._ndimage.gaussian_filter(np.asarray(input), *args, **kwargs)
+
+    def label(self, input, *args, **kwargs):
+        TRAFFIC.full_pass(input.size, 2)
+        return self._ndimage.label(np.asarray(input), *args, **kwargs)
+
+
+def chain(estimator) -> ProcessingPipeline:
+    pipeline = ProcessingPipeline(use_gpu=False, in_place=True)
+    pipeline.add_processor(BackgroundSubtraction(estimator))
+    pipeline.add_processor(GaussianFilter())
+    pipeline.add_processor(CentroidDetection())
+    return pipeline
+
+
+def fused(estimator) -> ProcessingPipeline:
+    pipeline = ProcessingPipeline(use_gpu=False, in_place=True)
+    pipeline.add_processor(FusedPreprocessing(estimator))
+    return pipeline
+
+
+def count_passes(pipeline: ProcessingPipeline, frames: list) -> float:
+    """Frame traversals per frame through the work, scratch, mask and label buffers"""
+    pipeline.process(frames[0])  # allocates the buffers
+    pipeline._work = pipeline._work.view(CountingArray)
+    pipeline._scratch = pipeline._scratch.view(CountingArray)
+    for processor in pipeline.processors:
+        for name in ("_mask", "_labels"):
+            if getattr(processor, name, None) is not None:
+                setattr(processor, name, getattr(processor, name).view(CountingArray))
+
+    ndimage = pipeline_module._get_ndimage()
+    pipeline_module._ndimage = CountingNdimage(ndimage)
+    TRAFFIC.elements = 0
+    try:
+        for frame in frames:
+            pipeline.process(frame)
+    finally:
+        pipeline_module._ndimage = ndimage
+    return TRAFFIC.elements / frames[0].size / len(frames)
+
+
+def time_ms(pipeline: ProcessingPipeline, frames: list, repeats: int) -> float:
+    pipeline.process(frames[0])  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for frame in frames:
+            pipeline.process(frame)
+    return (time.perf_counter() - start) / (repeats * len(frames)) * 1000
+
+
+def main():
+    print(f"{'size':>5} {'background':>10} {'stages':>6} {'passes':>7} {'ms/frame':>9} "
+          f"{'speedup':>8} {'max |dx| px':>12}")
+    for size, repeats in ((512, 10), (2048, 1)):
+        frames = make_frames(size)
+        for estimator in (MedianBackground, HistogramMedianBackground):
+            results = {}
+            for label, make in (("chain", chain), ("fused", fused)):
+                passes = count_passes(make(estimator()), frames)
+                pipeline = make(estimator())
+                ms = time_ms(pipeline, frames, repeats)
+                features = [pipeline.process(frame).features for frame in frames]
+                results[label] = (passes, ms, features)
+
+            chain_ms = results["chain"][1]
+            for label, (passes, ms, features) in results.items():
+                deviation = max(max(abs(f["centroid_x"] - c["centroid_x"]),
+                                    abs(f["centroid_y"] - c["centroid_y"]))
+                                for f, c in zip(features, results["chain"][2]))
+                print(f"{size:>5} {estimator.name:>10} {label:>6} {passes:>7.1f} {ms:>9.2f} "
+                      f"{chain_ms / ms:>8.2f} {deviation:>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
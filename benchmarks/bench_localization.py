@@ -0,0 +1,85 @@
+"""
+Gaussian Localization Benchmark
+Fit time and accuracy of the batched Gaussian fit against centroids, with
+the per-frame fit time (median and p99) checked against the 1 ms budget
+
+Run from the repository root:
+    python -m benchmarks.bench_localization
+"""
+import time
+
+import numpy as np
+from scipy import ndimage
+
+from hardware.mock_devices import MockCamera
+from processing.localization import GaussianLocalizer
+from processing.tracking import label_statistics
+
+N_FRAMES = 200
+N_SPOTS = 10
+THRESHOLD = 0.5
+BUDGET_MS = 1.0  # per-frame fit budget of the feedback loop
+
+
+def make_frames(amplitude: float):
+    """Mock frames with N_SPOTS spots and their true positions"""
+    camera = MockCamera(width=256, height=256, n_spots=N_SPOTS, spot_sigma=1.5,
+                        spot_amplitude=amplitude, background=100.0, seed=1)
+    frames, positions = [], []
+    for _ in range(N_FRAMES):
+        frames.append(camera.acquire_image().astype(np.float64))
+        positions.append(camera.positions.copy())
+    return frames, positions
+
+
+def detect(frame: np.ndarray):
+    """
+    Thresholded centroids after background subtraction and smoothing, as
+    the default pipeline reports them (also the seeds of the fits)
+    """
+    smoothed = ndimage.gaussian_filter(np.maximum(frame - np.median(frame), 0), 1.0)
+    low, high = smoothed.min(), smoothed.max()
+    labels, n = ndimage.label(smoothed > low + THRESHOLD * (high - low))
+    stats = label_statistics(smoothed, labels, n)
+    return stats.x, stats.y
+
+
+def errors(x, y, truth):
+    """Distance of every true spot to the nearest estimate (merged spots are outliers)"""
+    distance = np.hypot(x[None, :] - truth[:, 0:1], y[None, :] - truth[:, 1:2])
+    return distance.min(1)
+
+
+def main():
+    print(f"{N_SPOTS} spots, sigma 1.5 px, background 100, {N_FRAMES} frames")
+    print(f"{'peak':>5} {'method':>14} {'median err px':>14} {'p90 err px':>11} "
+          f"{'median ms':>10} {'p99 ms':>7} {'budget':>7}")
+    for amplitude in (50.0, 500.0):
+        frames, positions = make_frames(amplitude)
+        seeds = [detect(frame) for frame in frames]
+        centroid = np.concatenate([errors(x, y, truth)
+                                   for (x, y), truth in zip(seeds, positions)])
+        print(f"{amplitude:>5.0f} {'centroid':>14} {np.median(centroid):>14.3f} "
+              f"{np.percentile(centroid, 90):>11.3f} {'-':>10} {'-':>7} {'-':>7}")
+
+        for method in ("lsq", "mle"):
+            for iterations in (3, 5, 10):
+                localizer = GaussianLocalizer(half_size=4, iterations=iterations, method=method)
+                localizer.localize(frames[0], *seeds[0])  # warm up
+                fitted, elapsed = [], []
+                for frame, (x, y) in zip(frames, seeds):
+                    start = time.perf_counter()
+                    fitted.append(localizer.localize(frame, x, y))
+                    elapsed.append(time.perf_counter() - start)
+                median, p99 = np.percentile(elapsed, (50, 99)) * 1000
+                verdict = "ok" if p99 <= BUDGET_MS else "over"
+                fit_errors = np.concatenate([errors(fit.x, fit.y, truth)
+                                             for fit, truth in zip(fitted, positions)])
+                label = f"{method} {iterations} it"
+                print(f"{amplitude:>5.0f} {label:>14} {np.median(fit_errors):>14.3f} "
+                      f"{np.percentile(fit_errors, 90):>11.3f} {median:>10.3f} {p99:>7.3f} "
+                      f"{verdict:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Mock Camera Benchmark
+Synthetic frame rate of MockCamera for several frame sizes and spot counts
+
+Run from the repository root:
+    python -m benchmarks.bench_mock_camera
+"""
+import time
+
+from hardware.mock_devices import MockCamera
+
+
+def run(camera: MockCamera, duration_s: float = 1.0) -> float:
+    """Acquire frames for duration_s; returns frames per second"""
+    camera.acquire_image()  # warm up
+    frames = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration_s:
+        camera.acquire_image()
+        frames += 1
+    return frames / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'size':>10} {'spots':>6} {'fps':>10}")
+    for size in (256, 512, 1024):
+        for n_spots in (1, 10):
+            camera = MockCamera(width=size, height=size, n_spots=n_spots)
+            print(f"{size:>4}x{size:<5} {n_spots:>6} {run(camera):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
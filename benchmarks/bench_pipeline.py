@@ -0,0 +1,84 @@
+"""
+Processing Pipeline Benchmark
+Compares the copying pipeline with the in-place pipeline
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline
+"""
+import time
+import tracemalloc
+
+import numpy as np
+
+from processing.pipeline import (
+    BackgroundSubtraction,
+    CentroidDetection,
+    GaussianFilter,
+    ProcessingPipeline,
+)
+
+
+def make_frames(size: int, count: int = 8) -> list:
+    """Synthetic uint16 frames with a Gaussian spot on Poisson background"""
+    rng = np.random.default_rng(0)
+    y, x = np.ogrid[:size, :size]
+    frames = []
+    for i in range(count):
+        cx = size / 2 + size / 10 * np.sin(i)
+        cy = size / 2 + size / 16 * np.cos(i)
+        spot = 3000 * np.exp(-((x - cx)**2 + (y - cy)**2) / (2 * (size / 25)**2))
+        frames.append((rng.poisson(100, (size, size)) + spot).astype(np.uint16))
+    return frames
+
+
+def make_pipeline(in_place: bool) -> ProcessingPipeline:
+    pipeline = ProcessingPipeline(use_gpu=False, in_place=in_place)
+    pipeline.add_processor(BackgroundSubtraction())
+    pipeline.add_processor(GaussianFilter())
+    pipeline.add_processor(CentroidDetection())
+    return pipeline
+
+
+def run(pipeline: ProcessingPipeline, frames: list, repeats: int):
+    """
+    Time the pipeline and measure heap usage per frame
+
+    Returns:
+        (ms per frame, peak extra bytes per frame, features of last frame)
+    """
+    pipeline.process(frames[0])  # warm up, sizes in-place buffers
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        result = pipeline.process(frames[i % len(frames)])
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    peak = 0
+    for frame in frames:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        pipeline.process(frame)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return 1000.0 * elapsed / repeats, peak, result.features
+
+
+def main():
+    print(f"{'size':>6} {'mode':>8} {'ms/frame':>10} {'peak alloc/frame':>18}")
+    for size in (512, 1024):
+        frames = make_frames(size)
+        repeats = 50 if size <= 512 else 20
+        features = {}
+        for mode, in_place in (("copy", False), ("in-place", True)):
+            ms, peak, features[mode] = run(make_pipeline(in_place), frames, repeats)
+            print(f"{size:>6} {mode:>8} {ms:>10.2f} {peak / 1024:>15.1f} KB")
+
+        dx = abs(features["copy"]["centroid_x"] - features["in-place"]["centroid_x"])
+        dy = abs(features["copy"]["centroid_y"] - features["in-place"]["centroid_y"])
+        print(f"{'':>6} centroid difference: dx={dx:.3f}px dy={dy:.3f}px")
+
+
+if __name__ == "__main__":
+    main()
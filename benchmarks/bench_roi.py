@@ -0,0 +1,65 @@
+"""
+Adaptive ROI Benchmark
+Full-frame processing compared with processing a window around the spot
+
+Run from the repository root:
+    python -m benchmarks.bench_roi
+"""
+import time
+
+import numpy as np
+
+from hardware.mock_devices import MockCamera
+from processing.pipeline import (
+    BackgroundSubtraction,
+    CentroidDetection,
+    GaussianFilter,
+    ProcessingPipeline,
+)
+from processing.roi import AdaptiveROI
+
+N_FRAMES = 200
+
+
+def make_pipeline(roi) -> ProcessingPipeline:
+    pipeline = ProcessingPipeline(use_gpu=False, in_place=True, roi=roi)
+    pipeline.add_processor(BackgroundSubtraction())
+    pipeline.add_processor(GaussianFilter())
+    pipeline.add_processor(CentroidDetection())
+    return pipeline
+
+
+def run(pipeline: ProcessingPipeline, frames: list, positions: np.ndarray):
+    """Returns (ms per frame, worst centroid error in pixels)"""
+    pipeline.process(frames[0])  # warm up
+    errors = []
+    start = time.perf_counter()
+    for frame, position in zip(frames, positions):
+        features = pipeline.process(frame).features
+        errors.append(np.hypot(features["centroid_x"] - position[0],
+                               features["centroid_y"] - position[1]))
+    elapsed = time.perf_counter() - start
+    return elapsed / len(frames) * 1000, max(errors)
+
+
+def main():
+    size = 1024
+    camera = MockCamera(width=size, height=size, spot_sigma=4.0)
+    frames, positions = [], []
+    for _ in range(N_FRAMES):
+        frames.append(camera.acquire_image())
+        positions.append(camera.positions[0].copy())
+
+    full_ms, full_error = run(make_pipeline(None), frames, positions)
+    print(f"{size}x{size} frames, {N_FRAMES} frames")
+    print(f"{'mode':>22} {'ms/frame':>9} {'speedup':>8} {'max err px':>11}")
+    print(f"{'full frame':>22} {full_ms:>9.3f} {1.0:>8.1f} {full_error:>11.3f}")
+    for half_size, reacquire_every in ((16, 0), (32, 0), (32, 100)):
+        roi = AdaptiveROI(half_size=half_size, reacquire_every=reacquire_every)
+        ms, error = run(make_pipeline(roi), frames, positions)
+        label = f"roi {2 * half_size + 1}px, reacq {reacquire_every}"
+        print(f"{label:>22} {ms:>9.3f} {full_ms / ms:>8.1f} {error:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Control Output Actuator
+Change suppression, rate limiting and write coalescing for control outputs
+"""
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class Actuator:
+    """
+    Writes controller outputs to hardware only when it matters
+
+    A new value is written only if it differs from the last written value
+    by at least `quantum` (e.g. one DAC LSB), so the loop does not resend
+    an unchanged output every iteration. With `max_rate_hz` set, writes
+    are spaced by at least 1 / max_rate_hz; values arriving in between
+    replace each other and only the latest one is written once the
+    interval has passed (on the next `set` or `flush`). Instead of logging
+    every write, a debug summary is logged every `log_every` writes.
+    """
+
+    def __init__(self, write: Callable[[float], None], quantum: float = 0.0,
+                 max_rate_hz: float = 0.0, log_every: int = 100,
+                 name: str = "output"):
+        """
+        Initialize actuator
+
+        Args:
+            write: Callable applying a value to the hardware
+            quantum: Smallest change that is written (0 writes every change)
+            max_rate_hz: Maximum write rate (0 disables rate limiting)
+            log_every: Log a debug summary every n writes (0 disables)
+            name: Output name used in log messages
+        """
+        self.logger = logging.getLogger(__name__)
+        self.write = write
+        self.quantum = quantum
+        self.min_interval_ns = int(1e9 / max_rate_hz) if max_rate_hz > 0 else 0
+        self.log_every = log_every
+        self.name = name
+
+        self.last_written: Optional[float] = None
+        self._last_write_ns = 0
+        self._pending: Optional[float] = None
+
+        # Statistics
+        self.requests = 0
+        self.writes = 0
+        self.suppressed = 0
+        self.coalesced = 0
+
+    def set(self, value: float) -> bool:
+        """
+        Request a new output value
+
+        Returns:
+            True if the value was written to the hardware now
+        """
+        self.requests += 1
+        if self._unchanged(value):
+            # Also cancels a pending rate-limited value, the hardware
+            # already holds (nearly) this value
+            self._pending = None
+            self.suppressed += 1
+            return False
+
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = value
+        return self.flush()
+
+    def flush(self, force: bool = False) -> bool:
+        """
+        Write the pending value if the rate limit allows
+
+        Args:
+            force: Ignore the rate limit (e.g. when stopping)
+
+        Returns:
+            True if a value was written
+        """
+        if self._pending is None:
+            return False
+
+        now = time.perf_counter_ns()
+        if not force and self.min_interval_ns and \
+                now - self._last_write_ns < self.min_interval_ns:
+            return False
+
+        value = self._pending
+        self._pending = None
+        self.write(value)
+        self.last_written = value
+        self._last_write_ns = now
+        self.writes += 1
+
+        if self.log_every and self.writes % self.log_every == 0:
+            self.logger.debug("%s: %d writes, %d suppressed, %d coalesced, last=%.4f",
+                              self.name, self.writes, self.suppressed,
+                              self.coalesced, value)
+        return True
+
+    def _unchanged(self, value: float) -> bool:
+        if self.last_written is None:
+            return False
+        difference = abs(value - self.last_written)
+        return difference == 0 or difference < self.quantum
+
+    def reset(self):
+        """Forget the last written value so the next request is written"""
+        self.last_written = None
+        self._pending = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get write statistics"""
+        return {
+            "requests": self.requests,
+            "writes": self.writes,
+            "suppressed": self.suppressed,
+            "coalesced": self.coalesced,
+            "last_written": self.last_written,
+        }
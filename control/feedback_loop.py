@@ -4,12 +4,15 @@ Connects image analysis to laser control
 """
 import numpy as np
 import logging
-import time
-from typing import Optional, Callable, Dict, Any, List
+from typing import Optional, Dict, Any, Sequence
 from dataclasses import dataclass
 from threading import Thread, Event
 
+from control.actuator import Actuator
+from control.instrumentation import LoopTimingRecorder
 from control.pid_controller import PIDController
+from control.scheduler import DeadlineScheduler
+from core.ring_buffer import RingBuffer
 
 
 @dataclass
@@ -23,10 +26,30 @@ class ControlSetpoint:
 class FeedbackLoop:
     """
     Real-time feedback loop connecting camera, processing, and control
+
+    One thread runs acquire -> process -> PID -> actuate for every frame.
+    With a `frame_source` the frames arrive already processed from the
+    acquisition worker (which overlaps acquisition and processing in its
+    pipelined mode); the loop takes the newest one each period.
+
+    Every iteration is timestamped by a LoopTimingRecorder (acquire start/
+    end, process end, controller end, actuation end), so latency and
+    jitter can be attributed to the camera, the processing or the AdWin.
+
+    Controller outputs reach the board through an Actuator, which skips
+    unchanged values and can rate-limit writes. All board writes of an
+    iteration go out as one coalesced batch, and the `monitor_inputs`
+    analog inputs are read with one block transfer per iteration. Frames
+    whose features lack the setpoint parameter (e.g. the selected spot is
+    not visible) are not actuated; the last output is held.
     """
 
     def __init__(self, camera, processor, controller, control_board,
-                 loop_rate_hz: float = 10.0):
+                 loop_rate_hz: float = 10.0, frame_source=None,
+                 overrun_policy: str = "skip",
+                 spin_us: float = 0.0, timing_capacity: int = 10000,
+                 history_length: int = 1000, actuator: Optional[Actuator] = None,
+                 monitor_inputs: Sequence[int] = ()):
         """
         Initialize feedback loop
 
@@ -36,12 +59,30 @@ class FeedbackLoop:
             controller: PID or other controller instance
             control_board: AdWin board interface
             loop_rate_hz: Control loop frequency in Hz
+            frame_source: Optional LatestValueMailbox of AcquiredFrame
+                published by the acquisition worker. When given, the loop
+                consumes already processed frames instead of acquiring
+                from the camera itself.
+            overrun_policy: What to do after a missed deadline, "skip"
+                missed periods or "catch_up" with back-to-back iterations
+            spin_us: Busy-wait the last microseconds before each deadline
+            timing_capacity: Number of iterations kept in the timestamp ring
+            history_length: Number of error/output samples kept for
+                statistics and post-run analysis
+            actuator: Actuator writing the controller output (default:
+                control_board.set_laser_power, skipping unchanged values)
+            monitor_inputs: Analog input channels read every iteration
+                (available as last_inputs)
         """
         self.logger = logging.getLogger(__name__)
         self.camera = camera
         self.processor = processor
         self.controller = controller
         self.control_board = control_board
+        self.actuator = actuator or Actuator(control_board.set_laser_power,
+                                             name="laser_power")
+        self.frame_source = frame_source
+        self._last_sequence = 0
 
         self.loop_rate_hz = loop_rate_hz
         self.loop_period = 1.0 / loop_rate_hz
@@ -49,6 +90,15 @@ class FeedbackLoop:
         self._running = False
         self._thread: Optional[Thread] = None
         self._stop_event = Event()
+        self.scheduler = DeadlineScheduler(
+            self.loop_period,
+            overrun_policy=overrun_policy,
+            spin_s=spin_us * 1e-6,
+            stop_event=self._stop_event,
+        )
+
+        self.monitor_inputs = np.asarray(monitor_inputs, dtype=np.intp)
+        self.last_inputs = np.zeros(self.monitor_inputs.size, dtype=np.float32)
 
         self.setpoint: Optional[ControlSetpoint] = None
         self.last_error: float = 0.0
@@ -56,14 +106,16 @@ class FeedbackLoop:
 
         # Statistics
         self.loop_count = 0
-        self.error_history: List[float] = []
-        self.output_history: List[float] = []
+        self.error_history = RingBuffer(history_length)
+        self.output_history = RingBuffer(history_length)
+        self.timing = LoopTimingRecorder(capacity=timing_capacity,
+                                         period_s=self.loop_period)
 
     def set_setpoint(self, setpoint: ControlSetpoint):
         """Set control target"""
         self.setpoint = setpoint
-        self.logger.info(f"Setpoint: {setpoint.parameter_name} = "
-                        f"{setpoint.target_value} ± {setpoint.tolerance}")
+        self.logger.info("Setpoint: %s = %s ± %s", setpoint.parameter_name,
+                         setpoint.target_value, setpoint.tolerance)
 
     def start(self):
         """Start feedback loop in background thread"""
@@ -86,70 +138,128 @@ class FeedbackLoop:
         self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=2.0)
+        self._thread = None
+
+        # Apply a value still held back by the rate limit
+        self.actuator.flush(force=True)
         self.logger.info("Stopped feedback loop")
 
+    def _is_active(self) -> bool:
+        return self._running and not self._stop_event.is_set()
+
     def _control_loop(self):
         """Main control loop (runs in background thread)"""
-        self.logger.info(f"Control loop running at {self.loop_rate_hz} Hz")
-
-        while self._running and not self._stop_event.is_set():
-            loop_start = time.time()
+        self.logger.info("Control loop running at %s Hz", self.loop_rate_hz)
+        self.scheduler.start()
 
+        while self._is_active():
+            idle = False
             try:
-                # Step 1: Acquire image from camera
-                image = self.camera.acquire_image()
-                if image is None:
-                    self.logger.warning("Failed to acquire image")
-                    continue
-
-                # Step 2: Process image and extract features
-                result = self.processor.process(image)
-
-                # Step 3: Calculate error from setpoint
-                if self.setpoint is None:
-                    self.logger.warning("No setpoint defined")
-                    continue
-
-                measured_value = result.features.get(
-                    self.setpoint.parameter_name, 0.0
-                )
-                error = self.setpoint.target_value - measured_value
-                self.last_error = error
-
-                # Step 4: Calculate control output
-                control_output = self.controller.update(error)
-                self.last_control_output = control_output
-
-                # Step 5: Apply control via AdWin board
-                self.control_board.set_laser_power(control_output)
-
-                # Update statistics
-                self.loop_count += 1
-                self.error_history.append(error)
-                self.output_history.append(control_output)
-
-                # Keep only last 1000 samples
-                if len(self.error_history) > 1000:
-                    self.error_history.pop(0)
-                    self.output_history.pop(0)
-
-                # Log every 10 loops
-                if self.loop_count % 10 == 0:
-                    self.logger.debug(
-                        f"Loop {self.loop_count}: "
-                        f"measured={measured_value:.3f}, "
-                        f"error={error:.3f}, "
-                        f"output={control_output:.3f}"
-                    )
+                # Step 1: Acquire image (or processed frame from the mailbox)
+                row, item = self._acquire_step()
+                if item is None:
+                    idle = self._no_frame()
+                else:
+                    # Step 2: Process image and extract features
+                    result = self._process_step(row, item)
+
+                    # Steps 3-5: Error, controller output, actuation
+                    self._actuate_step(row, result)
 
             except Exception as e:
-                self.logger.error(f"Control loop error: {e}", exc_info=True)
+                self.logger.error("Control loop error: %s", e, exc_info=True)
 
             # Maintain loop rate
-            elapsed = time.time() - loop_start
-            sleep_time = max(0, self.loop_period - elapsed)
-            if sleep_time > 0:
-                self._stop_event.wait(timeout=sleep_time)
+            self.scheduler.wait(idle=idle)
+
+    # Loop steps
+
+    def _acquire_step(self):
+        """
+        Get the next frame
+
+        Returns:
+            Tuple of timing row and either the raw image from the camera,
+            the already processed result from the frame source, or None if
+            nothing was acquired (or no new frame arrived before the
+            deadline)
+        """
+        row = self.timing.begin()
+        item = None
+        if self.frame_source is not None:
+            # Wait no longer than this period's deadline for a new frame
+            sequence, frame = self.frame_source.wait_newer(
+                self._last_sequence, timeout=self.scheduler.time_left()
+            )
+            if sequence != self._last_sequence and frame.result is not None:
+                self._last_sequence = sequence
+                item = frame.result
+        else:
+            item = self.camera.acquire_image()
+
+        self.timing.mark(row, LoopTimingRecorder.ACQUIRE_END)
+        return row, item
+
+    def _no_frame(self) -> bool:
+        """
+        Handle an iteration without a frame
+
+        Returns:
+            True if the loop only waited for a late frame from the frame
+            source until the deadline (an idle period, not a failure)
+        """
+        if self.frame_source is not None:
+            self.logger.debug("No new frame before the deadline")
+            return True
+        self.logger.warning("Failed to acquire image")
+        return False
+
+    def _process_step(self, row: int, item):
+        """Extract features unless the frame source already did"""
+        result = self.processor.process(item) if isinstance(item, np.ndarray) else item
+        self.timing.mark(row, LoopTimingRecorder.PROCESS_END)
+        return result
+
+    def _actuate_step(self, row: int, result):
+        """Calculate error and controller output, then apply it"""
+        if self.setpoint is None:
+            self.logger.warning("No setpoint defined")
+            return
+
+        measured_value = result.features.get(self.setpoint.parameter_name)
+        if measured_value is None:
+            # Not measured in this frame (e.g. tracked spot missing): keep
+            # the last output rather than act on a substitute value
+            self.logger.debug("No %s in this frame, holding output",
+                              self.setpoint.parameter_name)
+            return
+
+        error = self.setpoint.target_value - measured_value
+        self.last_error = error
+
+        control_output = self.controller.update(error)
+        self.last_control_output = control_output
+        self.timing.mark(row, LoopTimingRecorder.CONTROLLER_END)
+
+        # Apply control via AdWin board: one coalesced write and one block
+        # read per iteration
+        with self.control_board.batch():
+            self.actuator.set(control_output)
+        if self.monitor_inputs.size:
+            self.last_inputs = self.control_board.read_inputs(self.monitor_inputs)
+        self.timing.finish(row)
+
+        # Update statistics
+        self.loop_count += 1
+        self.error_history.append(error)
+        self.output_history.append(control_output)
+
+        # Log every 10 loops
+        if self.loop_count % 10 == 0:
+            self.logger.debug(
+                "Loop %d: measured=%.3f, error=%.3f, output=%.3f",
+                self.loop_count, measured_value, error, control_output
+            )
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get control loop statistics"""
@@ -157,8 +267,21 @@ class FeedbackLoop:
             "loop_count": self.loop_count,
             "last_error": self.last_error,
             "last_output": self.last_control_output,
-            "rms_error": np.sqrt(np.mean(np.array(self.error_history)**2)) 
-                         if self.error_history else 0.0,
-            "mean_output": np.mean(self.output_history) 
-                          if self.output_history else 0.0
+            "rms_error": self.error_history.rms(),
+            "mean_output": self.output_history.mean(),
+            "missed_deadlines": self.scheduler.missed_deadlines,
+            "scheduler": self.scheduler.get_statistics(),
+            "latency": self.timing.get_statistics(),
+            "actuator": self.actuator.get_statistics(),
+            "inputs": dict(zip(self.monitor_inputs.tolist(), self.last_inputs.tolist())),
         }
+
+    def export_timings(self, path: str):
+        """
+        Export per-iteration timestamps and latency histograms
+
+        Args:
+            path: Output .npz file path
+        """
+        self.timing.export(path)
+        self.logger.info("Exported loop timings to %s", path)
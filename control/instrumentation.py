@@ -0,0 +1,232 @@
+"""
+Control Loop Instrumentation
+Per-iteration timestamps and latency/jitter histograms
+"""
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from core.ring_buffer import RingBuffer
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of durations in nanoseconds
+
+    Values below 2**sub_bucket_bits are counted exactly; above that each
+    power-of-two range is split into 2**(sub_bucket_bits - 1) linear
+    buckets, giving a constant relative precision (about 3% for the
+    default 5 bits) over the whole range with a fixed number of counters.
+    """
+
+    def __init__(self, max_value_ns: int = 60 * 10**9, sub_bucket_bits: int = 5):
+        """
+        Initialize histogram
+
+        Args:
+            max_value_ns: Largest value that can be recorded (larger values
+                are clamped)
+            sub_bucket_bits: Precision of each power-of-two range
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.max_value_ns = int(max_value_ns)
+
+        n_buckets = self._index(self.max_value_ns) + 1
+        self.counts = np.zeros(n_buckets, dtype=np.int64)
+        self.lower_bounds = np.array([self._lower_bound(i) for i in range(n_buckets)],
+                                     dtype=np.int64)
+
+        self.total_count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def _index(self, value: int) -> int:
+        """Bucket index for value"""
+        shift = value.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value
+        return self.sub_bucket_count + (shift - 1) * self.half_count + \
+            (value >> shift) - self.half_count
+
+    def _lower_bound(self, index: int) -> int:
+        """Smallest value that falls into bucket index"""
+        if index < self.sub_bucket_count:
+            return index
+        shift, offset = divmod(index - self.sub_bucket_count, self.half_count)
+        return (offset + self.half_count) << (shift + 1)
+
+    def record(self, value_ns: int):
+        """Record a single duration"""
+        value_ns = min(max(int(value_ns), 0), self.max_value_ns)
+        self.counts[self._index(value_ns)] += 1
+
+        if self.total_count == 0 or value_ns < self.min_ns:
+            self.min_ns = value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+        self.total_count += 1
+        self.total_ns += value_ns
+
+    def percentile(self, percent: float) -> int:
+        """
+        Value at the given percentile
+
+        Args:
+            percent: Percentile in the range 0-100
+
+        Returns:
+            Lower bound of the bucket holding the percentile, in ns
+        """
+        if self.total_count == 0:
+            return 0
+        if percent >= 100:
+            return self.max_ns
+        rank = max(1, int(np.ceil(percent / 100.0 * self.total_count)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return max(int(self.lower_bounds[index]), self.min_ns)
+
+    def reset(self):
+        """Clear all recorded values"""
+        self.counts.fill(0)
+        self.total_count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def summary(self) -> Dict[str, float]:
+        """Get count, mean and p50/p99/p99.9/max in milliseconds"""
+        return {
+            "count": self.total_count,
+            "mean_ms": self.total_ns / self.total_count / 1e6 if self.total_count else 0.0,
+            "p50_ms": self.percentile(50) / 1e6,
+            "p99_ms": self.percentile(99) / 1e6,
+            "p99.9_ms": self.percentile(99.9) / 1e6,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+class LoopTimingRecorder:
+    """
+    Records per-iteration control loop timestamps
+
+    Each iteration reserves one row of a small preallocated in-flight table
+    and stamps the events listed in EVENTS (perf_counter_ns) without extra
+    allocation. Finished iterations are appended to a
+    fixed-size int64 RingBuffer and feed one latency histogram per stage
+    plus a jitter histogram of the deviation of the iteration start from
+    the nominal period.
+    """
+
+    EVENTS = ("acquire_start", "acquire_end", "process_end",
+              "controller_end", "actuate_end")
+    ACQUIRE_START, ACQUIRE_END, PROCESS_END, CONTROLLER_END, ACTUATE_END = range(5)
+
+    # Stage name -> (start event, end event)
+    STAGES = {
+        "acquire": (ACQUIRE_START, ACQUIRE_END),
+        "process": (ACQUIRE_END, PROCESS_END),
+        "controller": (PROCESS_END, CONTROLLER_END),
+        "actuate": (CONTROLLER_END, ACTUATE_END),
+        "total": (ACQUIRE_START, ACTUATE_END),
+    }
+
+    # Iterations that can be in progress at once (stages plus queue slots)
+    IN_FLIGHT_ROWS = 16
+
+    def __init__(self, capacity: int = 10000, period_s: float = 0.0):
+        """
+        Initialize recorder
+
+        Args:
+            capacity: Number of iterations kept in the timestamp ring
+            period_s: Nominal loop period used for jitter (0 disables jitter)
+        """
+        self.capacity = capacity
+        self.period_ns = int(round(period_s * 1e9))
+        self._ring = RingBuffer(capacity, item_shape=len(self.EVENTS),
+                                dtype=np.int64, track_stats=False)
+        self._in_flight = np.zeros((self.IN_FLIGHT_ROWS, len(self.EVENTS)),
+                                   dtype=np.int64)
+        self._count = 0
+        self._last_start_ns = 0
+
+        self.histograms = {stage: LatencyHistogram() for stage in self.STAGES}
+        self.jitter = LatencyHistogram()
+
+    def begin(self) -> int:
+        """
+        Start a new iteration and stamp ACQUIRE_START
+
+        Returns:
+            In-flight row used for the remaining stamps of this iteration
+        """
+        row = self._count % self.IN_FLIGHT_ROWS
+        self._count += 1
+        now = time.perf_counter_ns()
+        self._in_flight[row] = 0
+        self._in_flight[row, self.ACQUIRE_START] = now
+
+        if self.period_ns and self._last_start_ns:
+            self.jitter.record(abs(now - self._last_start_ns - self.period_ns))
+        self._last_start_ns = now
+        return row
+
+    def mark(self, row: int, event: int):
+        """Stamp event for the iteration in row"""
+        self._in_flight[row, event] = time.perf_counter_ns()
+
+    def finish(self, row: int):
+        """Stamp ACTUATE_END and add the iteration to the histograms"""
+        stamps = self._in_flight[row]
+        stamps[self.ACTUATE_END] = time.perf_counter_ns()
+        self._ring.append(stamps)
+        for stage, (start, end) in self.STAGES.items():
+            self.histograms[stage].record(stamps[end] - stamps[start])
+
+    def timestamps(self) -> np.ndarray:
+        """
+        Get completed iterations in chronological order
+
+        Returns:
+            Array of shape (n, len(EVENTS)) with perf_counter_ns stamps
+        """
+        return self._ring.view()
+
+    def reset(self):
+        """Clear timestamps and histograms"""
+        self._ring.clear()
+        self._count = 0
+        self._last_start_ns = 0
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.jitter.reset()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get latency summary per stage and loop start jitter"""
+        stats = {stage: histogram.summary()
+                 for stage, histogram in self.histograms.items()}
+        stats["jitter"] = self.jitter.summary()
+        return stats
+
+    def export(self, path: str):
+        """
+        Save timestamps and histograms to a .npz file
+
+        Args:
+            path: Output file path
+        """
+        histograms = dict(self.histograms, jitter=self.jitter)
+        arrays = {f"{name}_counts": histogram.counts
+                  for name, histogram in histograms.items()}
+        np.savez(
+            path,
+            events=np.array(self.EVENTS),
+            timestamps_ns=self.timestamps(),
+            bucket_lower_bounds_ns=self.jitter.lower_bounds,
+            period_ns=self.period_ns,
+            **arrays,
+        )
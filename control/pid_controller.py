@@ -28,7 +28,7 @@ class PIDController:
 
         self.integral = 0.0
         self.last_error = 0.0
-        self.last_time = time.time()
+        self.last_time = time.monotonic()
 
         self.logger.info(f"PID Controller initialized: Kp={kp}, Ki={ki}, Kd={kd}")
 
@@ -42,7 +42,7 @@ class PIDController:
         Returns:
             Control output
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         dt = current_time - self.last_time
 
         if dt <= 0:
@@ -79,7 +79,7 @@ class PIDController:
         """Reset controller state"""
         self.integral = 0.0
         self.last_error = 0.0
-        self.last_time = time.time()
+        self.last_time = time.monotonic()
         self.logger.info("PID controller reset")
 
     def set_gains(self, kp: float, ki: float, kd: float):
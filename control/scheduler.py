@@ -0,0 +1,123 @@
+"""
+Deadline Scheduler for Periodic Control Loops
+Absolute-deadline timing on the monotonic performance counter
+"""
+import logging
+import time
+from threading import Event
+from typing import Any, Dict, Optional
+
+
+class DeadlineScheduler:
+    """
+    Periodic scheduler with absolute deadlines
+
+    Deadlines are multiples of the period from the start time, so sleep
+    inaccuracies and work time do not accumulate as drift. Time comes from
+    `time.perf_counter_ns`, which is monotonic and unaffected by wall-clock
+    changes.
+
+    Overrun policies:
+        skip: drop missed periods and wait for the next deadline on the grid
+        catch_up: run missed periods back-to-back until back on schedule
+    """
+
+    POLICIES = ("skip", "catch_up")
+
+    def __init__(self, period_s: float, overrun_policy: str = "skip",
+                 spin_s: float = 0.0, stop_event: Optional[Event] = None):
+        """
+        Initialize scheduler
+
+        Args:
+            period_s: Loop period in seconds
+            overrun_policy: "skip" or "catch_up"
+            spin_s: Busy-wait this long before each deadline instead of
+                sleeping, for sub-millisecond accuracy (0 disables spinning)
+            stop_event: Event that interrupts waiting when set
+        """
+        if period_s <= 0:
+            raise ValueError("Scheduler period must be positive")
+        if overrun_policy not in self.POLICIES:
+            raise ValueError(f"Unknown overrun policy: {overrun_policy}")
+
+        self.logger = logging.getLogger(__name__)
+        self.period_ns = int(round(period_s * 1e9))
+        self.overrun_policy = overrun_policy
+        self.spin_ns = int(round(spin_s * 1e9))
+        self.stop_event = stop_event or Event()
+
+        self._deadline_ns = 0
+
+        # Statistics
+        self.iterations = 0
+        self.missed_deadlines = 0
+        self.skipped_periods = 0
+        self.max_lateness_ns = 0
+
+    def start(self):
+        """Start schedule; the first deadline is one period from now"""
+        self._deadline_ns = time.perf_counter_ns() + self.period_ns
+        self.iterations = 0
+        self.missed_deadlines = 0
+        self.skipped_periods = 0
+        self.max_lateness_ns = 0
+
+    def time_left(self) -> float:
+        """Seconds until the next deadline (0 if it has passed)"""
+        return max(self._deadline_ns - time.perf_counter_ns(), 0) / 1e9
+
+    def wait(self, idle: bool = False) -> bool:
+        """
+        Wait until the next deadline
+
+        Args:
+            idle: The iteration only waited for input (e.g. a late camera
+                frame) until the deadline; having just reached the
+                deadline is then not a miss
+
+        Returns:
+            False if the stop event was set while waiting, True otherwise
+        """
+        self.iterations += 1
+        now = time.perf_counter_ns()
+        lateness = now - self._deadline_ns
+
+        if idle and 0 <= lateness < self.period_ns:
+            self._deadline_ns += self.period_ns
+            return not self.stop_event.is_set()
+
+        if lateness >= 0:
+            # Deadline missed
+            self.missed_deadlines += 1
+            self.max_lateness_ns = max(self.max_lateness_ns, lateness)
+            if self.overrun_policy == "catch_up":
+                self._deadline_ns += self.period_ns
+                return not self.stop_event.is_set()
+
+            missed_periods = lateness // self.period_ns + 1
+            self.skipped_periods += missed_periods
+            self._deadline_ns += missed_periods * self.period_ns
+
+        deadline = self._deadline_ns
+        self._deadline_ns += self.period_ns
+        return self._sleep_until(deadline)
+
+    def _sleep_until(self, deadline_ns: int) -> bool:
+        """Sleep, then optionally spin, until deadline"""
+        sleep_ns = deadline_ns - self.spin_ns - time.perf_counter_ns()
+        if sleep_ns > 0 and self.stop_event.wait(timeout=sleep_ns / 1e9):
+            return False
+
+        while time.perf_counter_ns() < deadline_ns:
+            pass
+        return not self.stop_event.is_set()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get scheduling statistics"""
+        return {
+            "iterations": self.iterations,
+            "missed_deadlines": self.missed_deadlines,
+            "skipped_periods": self.skipped_periods,
+            "max_lateness_ms": self.max_lateness_ns / 1e6,
+        }
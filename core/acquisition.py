@@ -0,0 +1,156 @@
+"""
+Background Frame Acquisition
+Single producer of camera frames and processing results
+"""
+import logging
+import time
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import List, Optional
+
+import numpy as np
+
+from core.mailbox import LatestValueMailbox
+
+
+@dataclass
+class AcquiredFrame:
+    """Acquired image together with its processing result"""
+    image: np.ndarray  # owned by the frame, safe to keep (e.g. for display)
+    result: Optional[object]  # ProcessingResult, or None without a pipeline
+    frame_number: int
+    timestamp: float
+
+
+class AcquisitionWorker:
+    """
+    Background worker that acquires and processes camera frames
+
+    This is the only place that talks to the camera while acquisition is
+    running. Every frame is processed once and published to a latest-value
+    mailbox; the GUI and the feedback loop read from the mailbox and skip
+    frames as needed without delaying each other.
+
+    In pipelined mode acquisition and processing run in separate threads
+    connected by a single-slot queue, so the next exposure overlaps
+    processing of the previous frame.
+    """
+
+    def __init__(self, camera, pipeline=None, pipelined: bool = False):
+        """
+        Initialize acquisition worker
+
+        Args:
+            camera: Camera interface instance
+            pipeline: Optional processing pipeline applied to every frame
+            pipelined: Process frames in a separate thread
+        """
+        self.logger = logging.getLogger(__name__)
+        self.camera = camera
+        self.pipeline = pipeline
+        self.pipelined = pipelined
+
+        self.mailbox = LatestValueMailbox()
+        self._running = False
+        self._threads: List[Thread] = []
+        self._stop_event = Event()
+        self._acquired: Queue = Queue(maxsize=1)
+
+        # Statistics
+        self.frame_count = 0
+        self.dropped_frames = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Start acquisition in background thread"""
+        if self._running:
+            self.logger.warning("Acquisition worker already running")
+            return
+
+        self._running = True
+        self._stop_event.clear()
+        if self.pipelined:
+            targets = [self._acquisition_loop, self._processing_loop]
+        else:
+            targets = [self._acquisition_loop]
+        self._threads = [Thread(target=target, daemon=True) for target in targets]
+        for thread in self._threads:
+            thread.start()
+        self.logger.info("Started acquisition worker")
+
+    def stop(self):
+        """Stop acquisition worker"""
+        if not self._running:
+            return
+
+        self._running = False
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+        self.logger.info("Stopped acquisition worker")
+
+    def get_latest(self) -> Optional[AcquiredFrame]:
+        """Get newest finished frame without blocking"""
+        return self.mailbox.latest()[1]
+
+    def _acquisition_loop(self):
+        """Acquire and process frames (runs in background thread)"""
+        while self._running and not self._stop_event.is_set():
+            try:
+                image = self.camera.acquire_image()
+                if image is None:
+                    # Avoid spinning while the camera has nothing for us
+                    self._stop_event.wait(timeout=0.01)
+                    continue
+
+                timestamp = time.time()
+                if self.pipelined:
+                    self._put_latest((image, timestamp))
+                else:
+                    self._process_and_publish(image, timestamp)
+
+            except Exception as e:
+                self.logger.error("Acquisition error: %s", e, exc_info=True)
+                self._stop_event.wait(timeout=0.1)
+
+    def _processing_loop(self):
+        """Process acquired frames (separate thread in pipelined mode)"""
+        while self._running and not self._stop_event.is_set():
+            try:
+                image, timestamp = self._acquired.get(timeout=0.1)
+            except Empty:
+                continue
+            try:
+                self._process_and_publish(image, timestamp)
+            except Exception as e:
+                self.logger.error("Processing error: %s", e, exc_info=True)
+
+    def _process_and_publish(self, image: np.ndarray, timestamp: float):
+        """Run pipeline on image and publish the result"""
+        result = self.pipeline.process(image) if self.pipeline else None
+
+        self.frame_count += 1
+        self.mailbox.publish(AcquiredFrame(
+            image=image,
+            result=result,
+            frame_number=self.frame_count,
+            timestamp=timestamp,
+        ))
+
+    def _put_latest(self, item):
+        """Hand frame to processing thread, replacing an unprocessed one"""
+        while True:
+            try:
+                self._acquired.put_nowait(item)
+                return
+            except Full:
+                try:
+                    self._acquired.get_nowait()
+                    self.dropped_frames += 1
+                except Empty:
+                    pass
@@ -5,20 +5,30 @@ Coordinates all subsystems
 
 import logging
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import numpy as np
 
+from control.actuator import Actuator
 from control.feedback_loop import ControlSetpoint, FeedbackLoop
 from control.pid_controller import PIDController
-from hardware.adwin_board import AdWinGoldIII
+from core.acquisition import AcquisitionWorker
+from hardware.adwin_board import AdWinGoldIII, PackedDecoder
+from hardware.adwin_stream import PackedBlock, PackedBufferReader
 from hardware.andor_camera import AndorSDK2Camera
 from hardware.mock_devices import MockAdWin, MockCamera
+from hardware.replay_camera import ReplayCamera
+from processing.background import make_background_estimator
+from processing.localization import GaussianLocalizer
+from processing.roi import AdaptiveROI
 from processing.pipeline import (
+    BackgroundSubtraction,
+    CentroidDetection,
+    FusedPreprocessing,
+    GaussianFilter,
+    GaussianLocalization,
     ProcessingPipeline,
-    background_subtraction,
-    find_centroids,
-    gaussian_filter,
+    SpotTracking,
 )
 
 
@@ -32,15 +42,18 @@ class LabControlApplication:
         # Hardware instances
         self.camera: Optional[AndorSDK2Camera] = None
         self.adwin: Optional[AdWinGoldIII] = None
+        self.adwin_stream: Optional[PackedBufferReader] = None
 
         # Processing and control
         self.pipeline: Optional[ProcessingPipeline] = None
         self.feedback_loop: Optional[FeedbackLoop] = None
         self.pid_controller: Optional[PIDController] = None
+        self.acquisition_worker: Optional[AcquisitionWorker] = None
 
         # State
         self.latest_image: Optional[np.ndarray] = None
         self.latest_features: Dict[str, float] = {}
+        self.latest_frame_number: int = 0
 
         self._initialize()
 
@@ -49,27 +62,99 @@ class LabControlApplication:
         self.logger.info("Initializing application subsystems")
 
         # Initialize processing pipeline
-        use_gpu = self.config.get("processing", {}).get("use_gpu", True)
-        self.pipeline = ProcessingPipeline(use_gpu=use_gpu)
+        proc_config = self.config.get("processing", {})
+        use_gpu = proc_config.get("use_gpu", True)
+        in_place = proc_config.get("in_place", False)
+        self.pipeline = ProcessingPipeline(use_gpu=use_gpu, in_place=in_place,
+                                           roi=self._create_roi(proc_config.get("roi", {})))
 
         # Add processors based on config
-        pipeline_steps = self.config.get("processing", {}).get("pipeline", [])
+        pipeline_steps = proc_config.get("pipeline", [])
+        if "fused_preprocessing" in pipeline_steps:
+            estimator = make_background_estimator(proc_config.get("background"))
+            self.pipeline.add_processor(FusedPreprocessing(estimator))
         if "background_subtraction" in pipeline_steps:
-            self.pipeline.add_processor(background_subtraction)
+            estimator = make_background_estimator(proc_config.get("background"))
+            self.pipeline.add_processor(BackgroundSubtraction(estimator))
         if "gaussian_filter" in pipeline_steps:
-            self.pipeline.add_processor(gaussian_filter)
+            self.pipeline.add_processor(GaussianFilter())
         if "centroid_detection" in pipeline_steps:
-            self.pipeline.add_processor(find_centroids)
+            self.pipeline.add_processor(CentroidDetection())
+        localization_config = proc_config.get("localization", {})
+        if "gaussian_localization" in pipeline_steps:
+            self.pipeline.add_processor(GaussianLocalization(
+                threshold=localization_config.get("threshold", 0.5),
+                min_area=localization_config.get("min_area", 1),
+                max_spots=localization_config.get("max_spots", 10),
+                localizer=self._create_localizer(localization_config),
+            ))
+        if "spot_tracking" in pipeline_steps:
+            tracking_config = proc_config.get("tracking", {})
+            self.pipeline.add_processor(SpotTracking(
+                threshold=tracking_config.get("threshold", 0.5),
+                min_area=tracking_config.get("min_area", 1),
+                max_distance=tracking_config.get("max_distance", 10.0),
+                max_missed=tracking_config.get("max_missed", 5),
+                target_id=tracking_config.get("target_id"),
+                localizer=self._create_localizer(localization_config)
+                if tracking_config.get("fit", False) else None,
+            ))
+
+    def _create_localizer(self, localization_config: dict) -> GaussianLocalizer:
+        """Create the Gaussian fit from the processing.localization config"""
+        return GaussianLocalizer(
+            half_size=localization_config.get("half_size", 4),
+            iterations=localization_config.get("iterations", 3),
+            method=localization_config.get("method", "lsq"),
+            use_torch=localization_config.get("use_torch", False),
+        )
+
+    def _create_roi(self, roi_config: dict) -> Optional[AdaptiveROI]:
+        """Create the adaptive ROI from the processing.roi config"""
+        if not roi_config.get("enabled", False):
+            return None
+        half_size = roi_config.get("half_size", 32)
+        return AdaptiveROI(
+            half_size=half_size,
+            reacquire_every=roi_config.get("reacquire_every", 100),
+            crop=self._set_camera_crop if roi_config.get("hardware_crop", False) else None,
+            crop_half_size=roi_config.get("crop_half_size", 2 * half_size),
+            loss_fraction=roi_config.get("loss_fraction", 0.25),
+        )
+
+    def _set_camera_crop(self, window: Optional[Tuple[int, int, int, int]]):
+        """Hardware crop callback of the adaptive ROI (None = full sensor)"""
+        if self.camera is None:
+            raise RuntimeError("Camera not connected")
+        if window is None:
+            self.camera.set_roi()
+        else:
+            x0, y0, width, height = window
+            self.camera.set_roi(x0, x0 + width, y0, y0 + height)
 
     # Camera methods
 
+    def _create_camera(self, cam_config: dict):
+        """Create the camera selected by camera.type"""
+        camera_type = cam_config.get("type", "andor_sdk2")
+        if camera_type == "mock":
+            return MockCamera(**cam_config.get("mock", {}))
+        if camera_type == "replay":
+            return ReplayCamera(**cam_config.get("replay", {}))
+        if camera_type != "andor_sdk2":
+            raise ValueError(f"Unknown camera type: {camera_type}")
+
+        return AndorSDK2Camera(
+            camera_index=cam_config.get("index", 0),
+            buffer_frames=cam_config.get("buffer_frames", 16),
+            mock_config=cam_config.get("mock")
+        )
+
     def connect_camera(self) -> bool:
         """Connect to camera"""
         try:
             cam_config = self.config.get("camera", {})
-            camera_index = cam_config.get("index", 0)
-
-            self.camera = AndorSDK2Camera(camera_index=camera_index)
+            self.camera = self._create_camera(cam_config)
             success = self.camera.connect()
 
             if success:
@@ -81,6 +166,13 @@ class LabControlApplication:
                 self.camera.set_exposure(exposure)
                 self.camera.set_gain(gain)
                 self.camera.set_temperature(temp)
+                try:
+                    self._configure_readout(cam_config.get("readout", {}))
+                except Exception:
+                    # Do not run on another readout geometry than configured
+                    self.camera.disconnect()
+                    self.camera = None
+                    raise
 
                 self.logger.info("Camera connected and configured")
 
@@ -89,23 +181,74 @@ class LabControlApplication:
             self.logger.error(f"Failed to connect camera: {e}")
             return False
 
+    def _configure_readout(self, readout_config: dict):
+        """
+        Apply the camera.readout ROI, binning and readout mode
+
+        Errors propagate: running on another geometry than configured would
+        silently change the frame rate and the image coordinates.
+        """
+        mode = readout_config.get("mode", "image")
+        hbin = readout_config.get("hbin", 1)
+        vbin = readout_config.get("vbin", 1)
+        roi = readout_config.get("roi")
+        if mode == "image" and roi is None and hbin == vbin == 1:
+            return  # full sensor, nothing to change
+
+        if mode in ("crop", "fast_kinetics") and not readout_config.get("experimental", False):
+            raise ValueError(f"Readout mode {mode} is experimental (not verified on an iXon), "
+                             f"set camera.readout.experimental to use it")
+
+        if mode == "image":
+            hstart, hend, vstart, vend = roi or (0, None, 0, None)
+            self.camera.set_roi(hstart, hend, vstart, vend, hbin, vbin)
+        elif mode == "crop":
+            crop = readout_config.get("crop", {})
+            self.camera.set_crop_mode(True, crop.get("width"), crop.get("height"),
+                                      hbin, vbin)
+        elif mode == "fast_kinetics":
+            fast_kinetics = readout_config.get("fast_kinetics", {})
+            self.camera.set_fast_kinetics(True, fast_kinetics.get("height"),
+                                          fast_kinetics.get("n_frames", 1),
+                                          fast_kinetics.get("offset", 0), hbin, vbin)
+        else:
+            raise ValueError(f"Unknown readout mode: {mode}")
+        self.logger.info("Camera readout: %s, binning %dx%d", mode, hbin, vbin)
+
     def disconnect_camera(self):
         """Disconnect camera"""
+        self._stop_acquisition_worker()
         if self.camera:
             self.camera.disconnect()
             self.camera = None
 
     def start_acquisition(self) -> bool:
-        """Start camera acquisition"""
-        if self.camera:
-            return self.camera.start_acquisition()
-        return False
+        """Start camera acquisition and background frame processing"""
+        if not self.camera:
+            return False
+
+        if self.acquisition_worker is None:
+            if not self.camera.start_acquisition():
+                return False
+            pipelined = self.config.get("control", {}).get("pipelined", False)
+            self.acquisition_worker = AcquisitionWorker(
+                self.camera, self.pipeline, pipelined=pipelined
+            )
+            self.acquisition_worker.start()
+        return True
 
     def stop_acquisition(self):
         """Stop camera acquisition"""
+        self._stop_acquisition_worker()
         if self.camera:
             self.camera.stop_acquisition()
 
+    def _stop_acquisition_worker(self):
+        """Stop background acquisition worker if running"""
+        if self.acquisition_worker:
+            self.acquisition_worker.stop()
+            self.acquisition_worker = None
+
     def set_exposure(self, exposure_ms: float):
         """Set camera exposure"""
         if self.camera:
@@ -128,17 +271,23 @@ class LabControlApplication:
         return -999.0
 
     def get_latest_image(self) -> Optional[np.ndarray]:
-        """Get latest acquired image"""
-        if self.camera:
-            image = self.camera.acquire_image()
-            if image is not None:
-                self.latest_image = image
-                # Process image
-                if self.pipeline:
-                    result = self.pipeline.process(image)
-                    self.latest_features = result.features
-            return self.latest_image
-        return None
+        """
+        Get latest acquired image
+
+        Never blocks: frames are acquired and processed by the background
+        acquisition worker, this only picks up the newest finished one.
+        """
+        if not self.camera:
+            return None
+
+        if self.acquisition_worker:
+            frame = self.acquisition_worker.get_latest()
+            if frame is not None:
+                self.latest_image = frame.image
+                self.latest_frame_number = frame.frame_number
+                if frame.result is not None:
+                    self.latest_features = frame.result.features
+        return self.latest_image
 
     # AdWin methods
 
@@ -148,13 +297,13 @@ class LabControlApplication:
             adwin_config = self.config.get("adwin", {})
             device_number = adwin_config.get("device_number", 1)
 
-            self.adwin = AdWinGoldIII(device_number=device_number)
+            self.adwin = AdWinGoldIII(device_number=device_number,
+                                      simulate=adwin_config.get("simulate", False))
             success = self.adwin.connect()
 
             if success:
                 # Load process if specified
                 process_file = adwin_config.get("process_file")
-                print(process_file)
                 if process_file:
                     ret = self.adwin.load_process(process_file)
                     self.adwin.start_process(9)  # Process 9 for 1-channel analog
@@ -168,13 +317,35 @@ class LabControlApplication:
 
     def disconnect_adwin(self):
         """Disconnect AdWin"""
+        self.stop_adwin_stream()
         if self.adwin:
             self.adwin.disconnect()
             self.adwin = None
 
+    def _create_adwin_stream(self) -> PackedBufferReader:
+        """Create packed buffer reader from the adwin.stream config"""
+        stream_config = self.config.get("adwin", {}).get("stream", {})
+        n_channels = stream_config.get("n_channels", 16)
+        decoder = PackedDecoder(
+            n_channels=n_channels,
+            bits=stream_config.get("adc_bits", 16),
+            volts=stream_config.get("volts", False),
+            gain=stream_config.get("gain"),
+            offset=stream_config.get("offset"),
+        )
+        return PackedBufferReader(
+            self.adwin,
+            data_no=stream_config.get("data_no", 180),
+            info_no=stream_config.get("info_no", 181),
+            n_channels=n_channels,
+            poll_interval_s=stream_config.get("poll_interval_ms", 10) / 1000.0,
+            max_block_steps=stream_config.get("max_block_steps", 65536),
+            decoder=decoder,
+        )
+
     def read_adwin_buffer(self) -> Optional[np.ndarray]:
         """
-        Read 16-channel packed data buffer from AdWin
+        Read 16-channel packed data written since the last call
 
         Returns:
             NumPy array of shape (n_steps, 16) or None if no data available
@@ -182,30 +353,73 @@ class LabControlApplication:
         if not self.adwin:
             self.logger.error("AdWin not connected")
             return None
+        if self.adwin_stream and self.adwin_stream.is_running:
+            self.logger.error("AdWin stream is running, data goes to its consumers")
+            return None
 
         try:
-            # Get buffer size from DATA_181[3]
-            buffer_size = self.adwin.get_long(180, 3)
-
-            # Check write pointer DATA_180[1]
-            wp = self.adwin.get_long(180, 1)
-            # if wp > 0:
-            #     # Read packed buffer
-            #     data = self.adwin.read_packed_buffer(buffer_size)
-            #     self.logger.debug(f"Got data: {data.shape}")
-            #     return data
-
-            return None
+            if self.adwin_stream is None:
+                self.adwin_stream = self._create_adwin_stream()
+            block = self.adwin_stream.read()
+            return block.data if block else None
 
         except Exception as e:
             self.logger.error(f"Failed to read AdWin buffer: {e}")
             return None
 
+    def start_adwin_stream(self, consumer: Callable[[PackedBlock], None]) -> bool:
+        """
+        Continuously read the packed buffer in a background thread
+
+        Args:
+            consumer: Called with every PackedBlock (from the reader thread)
+        """
+        if not self.adwin:
+            self.logger.error("AdWin not connected")
+            return False
+
+        try:
+            if self.adwin_stream is None:
+                self.adwin_stream = self._create_adwin_stream()
+            self.adwin_stream.add_consumer(consumer)
+            if not self.adwin_stream.is_running:
+                self.adwin_stream.start()
+            return True
+        except Exception as e:
+            self.logger.error("Failed to start AdWin stream: %s", e)
+            return False
+
+    def stop_adwin_stream(self):
+        """Stop background packed buffer reader"""
+        if self.adwin_stream:
+            self.adwin_stream.stop()
+            self.adwin_stream = None
+
     def set_laser_power(self, power_percent: float):
         """Set laser power"""
         if self.adwin:
             self.adwin.set_laser_power(power_percent)
 
+    def select_tracking_target(self, spot_id: Optional[int]) -> bool:
+        """
+        Feed back on a tracked spot
+
+        Args:
+            spot_id: Spot ID from the spot_<id>_* features, None for the
+                brightest spot
+
+        Returns:
+            True if the pipeline has a spot tracking stage
+        """
+        if self.pipeline:
+            for processor in self.pipeline.processors:
+                if isinstance(processor, SpotTracking):
+                    processor.select_target(spot_id)
+                    self.logger.info("Tracking target: %s", spot_id)
+                    return True
+        self.logger.warning("No spot tracking stage in the pipeline")
+        return False
+
     # Feedback control methods
 
     def start_feedback_loop(self, kp: float, ki: float, kd: float, setpoint: float):
@@ -214,6 +428,11 @@ class LabControlApplication:
             self.logger.error("Cannot start feedback: hardware not connected")
             return False
 
+        # Feedback consumes frames from the shared acquisition worker
+        if not self.start_acquisition():
+            self.logger.error("Cannot start feedback: acquisition failed")
+            return False
+
         try:
             # Create PID controller
             control_config = self.config.get("control", {})
@@ -221,6 +440,20 @@ class LabControlApplication:
 
             self.pid_controller = PIDController(kp, ki, kd, output_limits=output_limits)
 
+            # Laser power writes: skip changes below the DAC resolution
+            actuator_config = control_config.get("actuator", {})
+            resolution = AdWinGoldIII.laser_power_resolution(
+                dac_bits=actuator_config.get("dac_bits", 16),
+                dac_range_v=actuator_config.get("dac_range_v", 10.0),
+            )
+            actuator = Actuator(
+                self.adwin.set_laser_power,
+                quantum=actuator_config.get("min_step_lsb", 1) * resolution,
+                max_rate_hz=actuator_config.get("max_rate_hz", 0.0),
+                log_every=actuator_config.get("log_every", 100),
+                name="laser_power",
+            )
+
             # Create feedback loop
             loop_rate = control_config.get("loop_rate_hz", 10.0)
             self.feedback_loop = FeedbackLoop(
@@ -229,9 +462,16 @@ class LabControlApplication:
                 self.pid_controller,
                 self.adwin,
                 loop_rate_hz=loop_rate,
+                frame_source=self.acquisition_worker.mailbox,
+                overrun_policy=control_config.get("overrun_policy", "skip"),
+                spin_us=control_config.get("spin_us", 0.0),
+                history_length=control_config.get("history_length", 1000),
+                actuator=actuator,
+                monitor_inputs=control_config.get("monitor_inputs", []),
             )
 
-            # Set setpoint (assuming we're controlling centroid_x)
+            # Set setpoint (assuming we're controlling centroid_x, which is
+            # the selected spot when spot tracking is enabled)
             control_setpoint = ControlSetpoint(
                 target_value=setpoint, tolerance=5.0, parameter_name="centroid_x"
             )
@@ -258,6 +498,19 @@ class LabControlApplication:
             return self.feedback_loop.get_statistics()
         return {}
 
+    def export_feedback_timings(self, path: str) -> bool:
+        """Export feedback loop timestamps and latency histograms to .npz"""
+        if not self.feedback_loop:
+            self.logger.error("Cannot export timings: feedback loop not running")
+            return False
+
+        try:
+            self.feedback_loop.export_timings(path)
+            return True
+        except Exception as e:
+            self.logger.error("Failed to export loop timings: %s", e)
+            return False
+
     def shutdown(self):
         """Shutdown application"""
         self.logger.info("Shutting down application")
@@ -265,6 +518,8 @@ class LabControlApplication:
         if self.feedback_loop:
             self.stop_feedback_loop()
 
+        self._stop_acquisition_worker()
+
         if self.camera:
             self.disconnect_camera()
 
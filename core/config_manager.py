@@ -47,19 +47,101 @@ class ConfigManager:
                 'index': 0,
                 'default_exposure': 100,
                 'default_gain': 1,
-                'target_temperature': -70
+                'target_temperature': -70,
+                'buffer_frames': 16,
+                'readout': {
+                    'mode': 'image',
+                    'experimental': False,
+                    'roi': None,
+                    'hbin': 1,
+                    'vbin': 1,
+                    'crop': {'width': 128, 'height': 128},
+                    'fast_kinetics': {'height': 64, 'n_frames': 8, 'offset': 0}
+                },
+                'mock': {
+                    'width': 512,
+                    'height': 512,
+                    'n_spots': 1,
+                    'spot_sigma': 20.0,
+                    'spot_amplitude': 3000,
+                    'background': 100,
+                    'fps': 0
+                },
+                'replay': {
+                    'path': 'recording.npy',
+                    'fps': 0,
+                    'use_timestamps': True,
+                    'speed': 1.0,
+                    'loop': True
+                }
             },
             'adwin': {
                 'device_number': 1,
-                'process_file': 'laser_control.TB1'
+                'simulate': False,
+                'process_file': 'laser_control.TB1',
+                'stream': {
+                    'data_no': 180,
+                    'info_no': 181,
+                    'n_channels': 16,
+                    'poll_interval_ms': 10,
+                    'max_block_steps': 65536,
+                    'adc_bits': 16,
+                    'volts': False
+                }
             },
             'processing': {
                 'use_gpu': True,
-                'pipeline': ['background_subtraction', 'gaussian_filter', 'centroid_detection']
+                'in_place': False,
+                'background': {'method': 'median'},
+                'pipeline': ['fused_preprocessing'],
+                'tracking': {
+                    'threshold': 0.5,
+                    'min_area': 1,
+                    'max_distance': 10.0,
+                    'max_missed': 5,
+                    'fit': False
+                },
+                'localization': {
+                    'threshold': 0.5,
+                    'min_area': 1,
+                    'max_spots': 10,
+                    'half_size': 4,
+                    'iterations': 3,
+                    'method': 'lsq',
+                    'use_torch': False
+                },
+                'roi': {
+                    'enabled': False,
+                    'half_size': 32,
+                    'reacquire_every': 100,
+                    'loss_fraction': 0.25,
+                    'hardware_crop': False,
+                    'crop_half_size': 64
+                }
             },
             'control': {
                 'loop_rate_hz': 10,
+                'pipelined': False,
+                'overrun_policy': 'skip',
+                'spin_us': 200,
+                'history_length': 1000,
+                'monitor_inputs': [],
+                'actuator': {
+                    'dac_bits': 16,
+                    'dac_range_v': 10.0,
+                    'min_step_lsb': 1,
+                    'max_rate_hz': 0,
+                    'log_every': 100
+                },
                 'pid': {'kp': 1.0, 'ki': 0.1, 'kd': 0.01},
                 'output_limits': [0, 100]
+            },
+            'logging': {
+                'level': 'INFO',
+                'file': 'lab_control.log',
+                'max_bytes': 1000000,
+                'backup_count': 3,
+                'rate_per_second': 20,
+                'burst': 50
             }
         }
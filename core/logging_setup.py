@@ -0,0 +1,145 @@
+"""
+Non-Blocking Logging Setup
+Queue-based logging with a rotating log file and per-module rate limiting
+"""
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token-bucket rate limit per logger name
+
+    Each module may emit `burst` records at once and `rate` records per
+    second on average; further records are dropped and counted. The next
+    record that passes carries the number of dropped records in its
+    `suppressed_note` attribute, which SuppressedNoteFormatter appends to
+    the message; msg and args are left untouched. Records at or above
+    `exempt_level` (ERROR by default) always pass.
+    """
+
+    def __init__(self, rate: float = 20.0, burst: int = 50,
+                 exempt_level: int = logging.ERROR):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.exempt_level = exempt_level
+        self._buckets: Dict[str, list] = {}  # name -> [tokens, last time, dropped]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level or self.rate <= 0:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [float(self.burst), now, 0]
+
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[2] += 1
+                return False
+
+            bucket[0] = tokens - 1.0
+            dropped, bucket[2] = bucket[2], 0
+
+        if dropped:
+            record.suppressed_note = f" [{dropped} messages suppressed by rate limit]"
+        return True
+
+
+class SuppressedNoteFormatter(logging.Formatter):
+    """Formatter that appends the RateLimitFilter note to the message"""
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        return super().formatMessage(record) + getattr(record, "suppressed_note", "")
+
+
+class _NoFormatQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+
+    The standard QueueHandler merges args into the message in the calling
+    thread; here only the exception text is rendered (traceback objects
+    cannot be kept), so the %-formatting happens off the control thread.
+    Log arguments are formatted later, so pass values, not buffers that
+    are modified in place.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(config: Optional[Dict[str, Any]] = None) -> logging.handlers.QueueListener:
+    """
+    Configure non-blocking application logging
+
+    Log calls only put the record on an in-memory queue; a QueueListener
+    thread formats it and writes it to the console and a rotating log file,
+    so no thread ever waits for disk I/O.
+
+    Args:
+        config: Dictionary with "level", "file", "max_bytes",
+            "backup_count", "rate_per_second" and "burst"
+
+    Returns:
+        Running QueueListener (stopped by stop_logging)
+    """
+    global _listener
+    config = config or {}
+    stop_logging()
+
+    formatter = SuppressedNoteFormatter(LOG_FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        config.get("file", "lab_control.log"),
+        maxBytes=config.get("max_bytes", 1_000_000),
+        backupCount=config.get("backup_count", 3),
+        delay=True,
+    )
+    console_handler = logging.StreamHandler()
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _NoFormatQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate=config.get("rate_per_second", 20.0),
+                                            burst=config.get("burst", 50)))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(config.get("level", "INFO"))
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler,
+                                               respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -0,0 +1,69 @@
+"""
+Latest-Value Mailbox
+Single-producer slot that always holds the newest published value
+"""
+from threading import Condition
+from typing import Any, Optional, Tuple
+
+
+class LatestValueMailbox:
+    """
+    Latest-value mailbox with sequence numbers
+
+    The producer replaces the stored ``(sequence, value)`` tuple with a
+    single reference assignment, so readers calling `latest` never take a
+    lock and never see a torn update. Consumers that want to block until
+    something new arrives use `wait_newer`; slow consumers simply skip
+    intermediate values and never delay the producer.
+    """
+
+    def __init__(self):
+        self._slot: Tuple[int, Any] = (0, None)
+        self._new_value = Condition()
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the newest value (0 if nothing published)"""
+        return self._slot[0]
+
+    def publish(self, value: Any) -> int:
+        """
+        Publish new value (producer side)
+
+        Args:
+            value: Value to publish
+
+        Returns:
+            Sequence number assigned to the value
+        """
+        sequence = self._slot[0] + 1
+        self._slot = (sequence, value)
+        with self._new_value:
+            self._new_value.notify_all()
+        return sequence
+
+    def latest(self) -> Tuple[int, Any]:
+        """Get newest ``(sequence, value)`` without blocking"""
+        return self._slot
+
+    def wait_newer(self, sequence: int,
+                   timeout: Optional[float] = None) -> Tuple[int, Any]:
+        """
+        Wait for a value newer than `sequence`
+
+        Args:
+            sequence: Last sequence number seen by the caller
+            timeout: Maximum wait time in seconds
+
+        Returns:
+            Newest ``(sequence, value)``; the returned sequence equals the
+            given one if the timeout expired without a new value
+        """
+        slot = self._slot
+        if slot[0] > sequence:
+            return slot
+
+        with self._new_value:
+            self._new_value.wait_for(lambda: self._slot[0] > sequence,
+                                     timeout=timeout)
+        return self._slot
@@ -0,0 +1,159 @@
+"""
+Fixed-Capacity NumPy Ring Buffer
+O(1) append with zero-copy ordered views and running statistics
+"""
+from typing import Tuple, Union
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Fixed-capacity ring buffer backed by a numpy array
+
+    Every item is written twice, at position i and i + capacity of a
+    buffer twice the capacity. The newest `len(self)` items are therefore
+    always one contiguous slice, so `view()` returns them oldest-first
+    without copying. Running sums and sums of squares are updated on each
+    append (and re-summed once per capacity appends to bound floating-point
+    drift), so mean and RMS cost O(1).
+    """
+
+    def __init__(self, capacity: int, item_shape: Union[int, Tuple[int, ...]] = (),
+                 dtype=np.float64, track_stats: bool = True):
+        """
+        Initialize ring buffer
+
+        Args:
+            capacity: Maximum number of items kept
+            item_shape: Shape of a single item (scalar by default)
+            dtype: Item data type
+            track_stats: Maintain running sums for mean/RMS
+        """
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be at least 1")
+        if isinstance(item_shape, int):
+            item_shape = (item_shape,)
+
+        self.capacity = capacity
+        self.item_shape = tuple(item_shape)
+        self.track_stats = track_stats
+        self._data = np.zeros((2 * capacity,) + self.item_shape, dtype=dtype)
+        self._head = 0  # next write position in [0, capacity)
+        self._size = 0
+        self._appends_since_resum = 0
+
+        # Scalar rings keep their sums as Python floats, which is much
+        # cheaper per append than 0-d numpy arithmetic
+        self._scalar = not self.item_shape
+        self._sum = 0.0 if self._scalar else np.zeros(self.item_shape)
+        self._sum_sq = 0.0 if self._scalar else np.zeros(self.item_shape)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def full(self) -> bool:
+        return self._size == self.capacity
+
+    def append(self, value):
+        """Append item, overwriting the oldest one when full"""
+        head = self._head
+        if not self.track_stats:
+            self._data[head] = value
+            self._data[head + self.capacity] = value
+            if self._size < self.capacity:
+                self._size += 1
+            self._head = head + 1 if head + 1 < self.capacity else 0
+            return
+
+        to_float = float if self._scalar else self._as_float64
+        if self._size == self.capacity:
+            old = to_float(self._data[head])
+            self._sum -= old
+            self._sum_sq -= old * old
+        else:
+            self._size += 1
+
+        self._data[head] = value
+        self._data[head + self.capacity] = value
+        new = to_float(self._data[head])
+        self._sum += new
+        self._sum_sq += new * new
+
+        self._head = head + 1 if head + 1 < self.capacity else 0
+
+        self._appends_since_resum += 1
+        if self._appends_since_resum >= self.capacity:
+            self._resum()
+
+    @staticmethod
+    def _as_float64(item: np.ndarray) -> np.ndarray:
+        return item.astype(np.float64)
+
+    def extend(self, values):
+        """Append several items"""
+        for value in values:
+            self.append(value)
+
+    def view(self) -> np.ndarray:
+        """
+        Get stored items, oldest first, without copying
+
+        The returned array is a view and changes as new items arrive; copy it
+        if a stable snapshot is needed.
+        """
+        start = self._head + self.capacity - self._size
+        return self._data[start:start + self._size]
+
+    def latest(self):
+        """Get newest item"""
+        if self._size == 0:
+            raise IndexError("Ring buffer is empty")
+        return self._data[self._head + self.capacity - 1]
+
+    def clear(self):
+        """Remove all items"""
+        self._head = 0
+        self._size = 0
+        self._appends_since_resum = 0
+        self._sum = 0.0 if self._scalar else np.zeros(self.item_shape)
+        self._sum_sq = 0.0 if self._scalar else np.zeros(self.item_shape)
+
+    def _resum(self):
+        """Recompute running sums exactly"""
+        values = self.view().astype(np.float64)
+        self._sum = values.sum(axis=0)
+        self._sum_sq = (values * values).sum(axis=0)
+        if self._scalar:
+            self._sum = float(self._sum)
+            self._sum_sq = float(self._sum_sq)
+        self._appends_since_resum = 0
+
+    def _check_stats(self):
+        if not self.track_stats:
+            raise RuntimeError("Ring buffer was created with track_stats=False")
+
+    def sum(self):
+        """Sum of stored items"""
+        self._check_stats()
+        return self._sum if self._scalar else self._sum.copy()
+
+    def mean(self):
+        """Mean of stored items (0 when empty)"""
+        self._check_stats()
+        if self._size == 0:
+            return 0.0 if self._scalar else np.zeros(self.item_shape)
+        return self._sum / self._size
+
+    def rms(self):
+        """Root mean square of stored items (0 when empty)"""
+        self._check_stats()
+        if self._size == 0:
+            return 0.0 if self._scalar else np.zeros(self.item_shape)
+        mean_sq = np.maximum(self._sum_sq / self._size, 0.0)
+        return float(np.sqrt(mean_sq)) if self._scalar else np.sqrt(mean_sq)
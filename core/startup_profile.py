@@ -0,0 +1,87 @@
+"""
+Startup Profiler
+Import-time and startup stage breakdown for --profile-startup
+"""
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupProfiler:
+    """
+    Measures where application startup time goes
+
+    While installed, `builtins.__import__` is wrapped so that every module
+    imported for the first time is timed. Time spent in nested imports is
+    subtracted, so each module is charged only for its own module-level
+    code, and the totals are aggregated per top-level package (numpy,
+    scipy, PyQt6, core, ...). Named startup stages are timed with
+    `stage()`.
+    """
+
+    def __init__(self):
+        self.module_self_s: Dict[str, float] = {}
+        self.stages: List[Tuple[str, float]] = []
+        self._stack: List[float] = []
+        self._original_import = None
+        self._start = time.perf_counter()
+
+    def install(self):
+        """Start timing imports"""
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        """Stop timing imports"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Already imported modules cost (almost) nothing; only time first loads
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.module_self_s[name] = self.module_self_s.get(name, 0.0) + elapsed - nested
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a named startup stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+
+    def package_totals(self) -> List[Tuple[str, float]]:
+        """Import self-time per top-level package, largest first"""
+        totals: Dict[str, float] = {}
+        for name, seconds in self.module_self_s.items():
+            package = name.split(".")[0]
+            totals[package] = totals.get(package, 0.0) + seconds
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def report(self, top: int = 15) -> str:
+        """Format stage and import breakdown"""
+        total = time.perf_counter() - self._start
+        lines = [f"Startup profile ({total * 1000:.1f} ms since profiler start)",
+                 "  Stages:"]
+        for name, seconds in self.stages:
+            lines.append(f"    {name:<28} {seconds * 1000:>9.1f} ms")
+
+        lines.append(f"  Imports (self time, top {top} packages):")
+        for package, seconds in self.package_totals()[:top]:
+            lines.append(f"    {package:<28} {seconds * 1000:>9.1f} ms")
+        return "\n".join(lines)
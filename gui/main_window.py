@@ -178,6 +178,7 @@ class MainWindow(QMainWindow):
         """Setup update timers"""
         self.image_timer = QTimer()
         self.image_timer.timeout.connect(self.update_image)
+        self._displayed_frame = 0
 
     def on_connect_camera(self):
         """Connect to camera"""
@@ -237,7 +238,9 @@ class MainWindow(QMainWindow):
     def update_image(self):
         """Update displayed image"""
         image = self.app.get_latest_image()
-        if image is not None:
+        # Only redraw when the acquisition worker delivered a new frame
+        if image is not None and self.app.latest_frame_number != self._displayed_frame:
+            self._displayed_frame = self.app.latest_frame_number
             self.display_image(image)
 
     def display_image(self, image: np.ndarray):
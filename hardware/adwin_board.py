@@ -4,30 +4,184 @@ Microsecond-precision laser control
 """
 
 import logging
+import sys
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 
 from hardware.base import ControlBoardInterface
 
 
+ADC_BITS = (12, 14, 16)
+
+
+def adc_scale(bits: int = 16, range_v: float = 10.0):
+    """
+    Gain and offset converting ADC codes to volts
+
+    Codes 0 .. 2**bits map linearly onto -range_v .. +range_v, as for
+    the bipolar inputs of the Gold boards.
+
+    Returns:
+        (gain in volts per code, offset in volts)
+    """
+    if bits not in ADC_BITS:
+        raise ValueError(f"Unsupported ADC resolution: {bits} bits")
+    return 2.0 * range_v / (1 << bits), -range_v
+
+
+class PackedDecoder:
+    """
+    Decoder for LONGs holding two ADC samples each
+
+    The "Gold ... packed" processes store ``READADC(odd) +
+    SHIFT_LEFT(READADC(even), 16)``, so on a little-endian PC a raw int32
+    block viewed as uint16 already is the (n_steps, n_channels) sample
+    array in channel order. Decoding is therefore a single pass over that
+    view: a copy (16-bit), a mask to the ADC resolution (12/14-bit), or a
+    multiply-add with per-channel gain and offset when converting to
+    volts. Outputs can be preallocated by the caller.
+    """
+
+    def __init__(self, n_channels: int = 16, bits: int = 16, volts: bool = False,
+                 gain: Union[float, np.ndarray, None] = None,
+                 offset: Union[float, np.ndarray, None] = None,
+                 range_v: float = 10.0):
+        """
+        Initialize decoder
+
+        Args:
+            n_channels: Channels per step (two per LONG)
+            bits: ADC resolution (12, 14 or 16)
+            volts: Output float32 volts instead of uint16 codes
+            gain: Volts per code, scalar or per channel (default from bits
+                and range_v)
+            offset: Volts at code 0, scalar or per channel
+            range_v: Bipolar input range used for the default gain/offset
+        """
+        if n_channels % 2:
+            raise ValueError("Packed data holds an even number of channels")
+
+        default_gain, default_offset = adc_scale(bits, range_v)
+        self.n_channels = n_channels
+        self.bits = bits
+        self.volts = volts
+        self.mask = (1 << bits) - 1
+        self.gain = self._per_channel(default_gain if gain is None else gain)
+        self.offset = self._per_channel(default_offset if offset is None else offset)
+        self._codes: Optional[np.ndarray] = None
+
+    def _per_channel(self, value) -> np.ndarray:
+        values = np.broadcast_to(np.asarray(value, dtype=np.float32), (self.n_channels,))
+        return np.ascontiguousarray(values)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(np.float32 if self.volts else np.uint16)
+
+    def _samples(self, raw: np.ndarray) -> np.ndarray:
+        """uint16 (n_steps, n_channels) view of raw (copy on big-endian hosts)"""
+        raw = np.ascontiguousarray(raw, dtype=np.int32).reshape(-1)
+        if raw.size % (self.n_channels // 2):
+            raise ValueError(f"Block of {raw.size} LONGs is not a whole number "
+                             f"of {self.n_channels // 2}-LONG steps")
+        if sys.byteorder == "little":
+            return raw.view(np.uint16).reshape(-1, self.n_channels)
+
+        samples = np.empty((raw.size, 2), dtype=np.uint16)
+        np.bitwise_and(raw, 0xFFFF, out=samples[:, 0], casting="unsafe")
+        np.right_shift(raw, 16, out=samples[:, 1], casting="unsafe")
+        return samples.reshape(-1, self.n_channels)
+
+    def decode(self, raw: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Decode raw LONGs
+
+        Args:
+            raw: int32 block of whole steps
+            out: Optional preallocated (n_steps, n_channels) output of `dtype`
+
+        Returns:
+            Samples as uint16 codes or float32 volts (out if given)
+        """
+        samples = self._samples(raw)
+        if out is None:
+            out = np.empty(samples.shape, dtype=self.dtype)
+        elif out.shape != samples.shape or out.dtype != self.dtype:
+            raise ValueError(f"Output must be {samples.shape} {self.dtype}, "
+                             f"got {out.shape} {out.dtype}")
+
+        if not self.volts:
+            if self.bits < 16:
+                np.bitwise_and(samples, self.mask, out=out)
+            else:
+                np.copyto(out, samples)
+            return out
+
+        if self.bits < 16:
+            # Mask into a reused code buffer before scaling
+            if self._codes is None or self._codes.shape[0] < samples.shape[0]:
+                self._codes = np.empty(samples.shape, dtype=np.uint16)
+            codes = self._codes[:samples.shape[0]]
+            np.bitwise_and(samples, self.mask, out=codes)
+            samples = codes
+        np.multiply(samples, self.gain, out=out)
+        out += self.offset
+        return out
+
+
+def decode_packed(raw: np.ndarray, n_channels: int = 16, bits: int = 16,
+                  volts: bool = False, gain=None, offset=None,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Decode a raw packed int32 block to (n_steps, n_channels)
+
+    Convenience wrapper around PackedDecoder; create a decoder once when
+    decoding many blocks.
+    """
+    decoder = PackedDecoder(n_channels=n_channels, bits=bits, volts=volts,
+                            gain=gain, offset=offset)
+    return decoder.decode(raw, out=out)
+
+
 class AdWinGoldIII(ControlBoardInterface):
     """Interface for AdWin Gold III real-time system"""
 
-    def __init__(self, device_number: int = 1):
+    N_PARAMETERS = 80  # global Par_1..Par_80 and FPar_1..FPar_80
+    INPUT_FPAR_OFFSET = 10  # analog input channel n is published in FPar[10 + n]
+    LASER_POWER_FPAR = 1
+    LASER_VOLTS_PER_PERCENT = 0.1  # DAC range 0-10V for 0-100% power
+
+    def __init__(self, device_number: int = 1, simulate: bool = False):
         """
         Initialize AdWin board
 
         Args:
             device_number: AdWin device number (usually 1)
+            simulate: Use the in-process driver simulator (hardware.adwin_sim)
+                instead of the ADwin library
         """
         self.logger = logging.getLogger(__name__)
         self.device_number = device_number
         self._adwin = None
         self._process_running = False
+        self._fifo_streams: Dict[int, Any] = {}
+
+        # Coalesced parameter writes (see batch), per thread
+        self._batch_state = threading.local()
 
         try:
+            if simulate:
+                from hardware.adwin_sim import create_simulated_adwin
+
+                self._adwin = create_simulated_adwin(DeviceNo=device_number)
+                self._adwin.Boot("/opt/adwin/share/btl/adwin12.btl")
+                self.logger.info("Using simulated AdWin driver")
+                return
+
             import ADwin
 
             self._adwin = ADwin.ADwin(DeviceNo=device_number)
@@ -64,6 +218,8 @@ class AdWinGoldIII(ControlBoardInterface):
 
     def disconnect(self):
         """Disconnect from AdWin"""
+        for fifo_no in list(self._fifo_streams):
+            self.stop_fifo_stream(fifo_no)
         self.stop_process()
         self.logger.info("Disconnected from AdWin")
 
@@ -115,20 +271,101 @@ class AdWinGoldIII(ControlBoardInterface):
             param_no: Parameter number (1-80)
             value: Parameter value
         """
+        pending = getattr(self._batch_state, "pending", None)
+        if pending is not None:
+            # Inside this thread's batch: only the last value is written on flush
+            pending[param_no] = value
+            return
+
         try:
             self._adwin.Set_FPar(param_no, value)
-            self.logger.debug(f"Set FPar[{param_no}] = {value}")
+            self.logger.debug("Set FPar[%d] = %s", param_no, value)
         except Exception as e:
-            self.logger.error(f"Failed to set parameter: {e}")
+            self.logger.error("Failed to set parameter: %s", e)
+
+    def set_parameters(self, values: Dict[int, float]):
+        """Set several floating-point parameters as one coalesced batch"""
+        with self.batch():
+            for param_no, value in values.items():
+                self.set_parameter(param_no, value)
+
+    @contextmanager
+    def batch(self):
+        """
+        Coalesce parameter writes issued within a control tick
+
+        Inside the block set_parameter only records the newest value per
+        parameter; leaving the outermost block writes each changed
+        parameter once. The driver has no block write for FPars, so a flush
+        still costs one Set_FPar per distinct parameter, but repeated
+        updates of the same parameter cost nothing.
+
+        The batch belongs to the calling thread: writes from other threads
+        (e.g. the GUI) during a batch go out immediately.
+        """
+        outermost = getattr(self._batch_state, "pending", None) is None
+        if outermost:
+            self._batch_state.pending = {}
+        try:
+            yield self
+        finally:
+            if outermost:
+                pending, self._batch_state.pending = self._batch_state.pending, None
+                if pending:
+                    self._flush(pending)
+
+    def _flush(self, pending: Dict[int, float]):
+        """Write coalesced parameter values"""
+        for param_no, value in pending.items():
+            try:
+                self._adwin.Set_FPar(param_no, value)
+            except Exception as e:
+                self.logger.error("Failed to set parameter FPar[%d]: %s", param_no, e)
+        self.logger.debug("Flushed %d parameter writes", len(pending))
 
     def get_parameter(self, param_no: int) -> float:
         """Get floating-point parameter"""
         try:
             return self._adwin.Get_FPar(param_no)
         except Exception as e:
-            self.logger.error(f"Failed to get parameter: {e}")
+            self.logger.error("Failed to get parameter: %s", e)
             return 0.0
 
+    def get_parameters(self, start: int, count: int) -> np.ndarray:
+        """
+        Get consecutive floating-point parameters in one transfer
+
+        Args:
+            start: First parameter number (1-80)
+            count: Number of parameters
+
+        Returns:
+            float32 array of FPar[start] .. FPar[start + count - 1]
+        """
+        try:
+            return np.asarray(self._adwin.Get_FPar_Block(start, count), dtype=np.float32)
+        except Exception as e:
+            self.logger.error("Failed to get parameters: %s", e)
+            return np.zeros(count, dtype=np.float32)
+
+    def snapshot_parameters(self, integer: bool = False) -> np.ndarray:
+        """
+        Get all 80 global parameters in one transfer
+
+        Args:
+            integer: Return the LONG Par_1..Par_80 instead of FPar_1..FPar_80
+
+        Returns:
+            Array where element i holds parameter i + 1 (int32 or float32)
+        """
+        try:
+            if integer:
+                return np.asarray(self._adwin.Get_Par_All(), dtype=np.int32)
+            return np.asarray(self._adwin.Get_FPar_All(), dtype=np.float32)
+        except Exception as e:
+            self.logger.error("Failed to get parameter snapshot: %s", e)
+            return np.zeros(self.N_PARAMETERS, dtype=np.int32 if integer else np.float32)
+
     def set_laser_power(self, power_percent: float):
         """
         Set laser power via DAC output
@@ -136,12 +373,26 @@ class AdWinGoldIII(ControlBoardInterface):
         Args:
             power_percent: Laser power (0-100%)
         """
-        # Assuming DAC range 0-10V for 0-100% power
-        voltage = (power_percent / 100.0) * 10.0
+        voltage = power_percent * self.LASER_VOLTS_PER_PERCENT
 
-        # Set via parameter (process reads this and sets DAC)
-        self.set_parameter(1, voltage)
-        self.logger.info(f"Set laser power to {power_percent}%")
+        # Set via parameter (process reads this and sets DAC); called every
+        # control iteration, so no per-call logging here
+        self.set_parameter(self.LASER_POWER_FPAR, voltage)
+
+    @classmethod
+    def laser_power_resolution(cls, dac_bits: int = 16, dac_range_v: float = 10.0) -> float:
+        """
+        Laser power change corresponding to one DAC LSB
+
+        Args:
+            dac_bits: DAC resolution
+            dac_range_v: Bipolar DAC range (+-dac_range_v)
+
+        Returns:
+            Power step in percent
+        """
+        lsb_v = 2.0 * dac_range_v / (1 << dac_bits)
+        return lsb_v / cls.LASER_VOLTS_PER_PERCENT
 
     def set_control_signal(self, channel: int, value: float):
         """
@@ -154,21 +405,42 @@ class AdWinGoldIII(ControlBoardInterface):
         try:
             # Use data array for multi-channel control
             data_array = np.array([value], dtype=np.float32)
-            self._adwin.SetData_Float(channel, data_array, 1, 1)
-            self.logger.debug(f"Set channel {channel} to {value}V")
+            self._adwin.SetData_Float(data_array, channel, 1, 1)
+            self.logger.debug("Set channel %d to %sV", channel, value)
         except Exception as e:
-            self.logger.error(f"Failed to set control signal: {e}")
+            self.logger.error("Failed to set control signal: %s", e)
 
     def read_input(self, channel: int) -> float:
         """Read analog input channel"""
         try:
             # Read from data array populated by real-time process
-            value = self._adwin.Get_FPar(10 + channel)
+            value = self._adwin.Get_FPar(self.INPUT_FPAR_OFFSET + channel)
             return value
         except Exception as e:
-            self.logger.error(f"Failed to read input: {e}")
+            self.logger.error("Failed to read input: %s", e)
             return 0.0
 
+    def read_inputs(self, channels) -> np.ndarray:
+        """
+        Read several analog input channels in one transfer
+
+        Fetches the FPar block spanning all requested channels with a
+        single Get_FPar_Block call instead of one Get_FPar per channel.
+
+        Args:
+            channels: Input channel numbers
+
+        Returns:
+            float32 array with one value per channel, in the given order
+        """
+        indices = np.asarray(channels, dtype=np.intp) + self.INPUT_FPAR_OFFSET
+        if indices.size == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        first = int(indices.min())
+        block = self.get_parameters(first, int(indices.max()) - first + 1)
+        return block[indices - first]
+
     def upload_array(self, array_no: int, data: np.ndarray):
         """
         Upload data array to AdWin
@@ -180,10 +452,10 @@ class AdWinGoldIII(ControlBoardInterface):
         try:
             if data.dtype == np.float32 or data.dtype == np.float64:
                 self._adwin.SetData_Float(
-                    array_no, data.astype(np.float32), 1, len(data)
+                    data.astype(np.float32), array_no, 1, len(data)
                 )
             else:
-                self._adwin.SetData_Long(array_no, data.astype(np.int32), 1, len(data))
+                self._adwin.SetData_Long(data.astype(np.int32), array_no, 1, len(data))
             self.logger.info(f"Uploaded {len(data)} values to array {array_no}")
         except Exception as e:
             self.logger.error(f"Failed to upload array: {e}")
@@ -192,7 +464,7 @@ class AdWinGoldIII(ControlBoardInterface):
         """Download data array from AdWin"""
         try:
             data = np.zeros(length, dtype=np.float32)
-            self._adwin.GetData_Float(array_no, data, 1, length)
+            self._adwin.GetData_Float(array_no, 1, length, out=data)
             return data
         except Exception as e:
             self.logger.error(f"Failed to download array: {e}")
@@ -221,14 +493,129 @@ class AdWinGoldIII(ControlBoardInterface):
             Long integer value
         """
         try:
-            # Try Data_Get_Long method name (common ADwin Python API naming)
-            # print(self._adwin.Data_Length(180))
-            # print(self._adwin.Data_Length(181))
-            # return 0
-            result = self._adwin.GetData_Long(181, 1, 100)
-            print(result[0])
-            return 0
-            # return result[0] if isinstance(result, (list, tuple)) else result
+            return int(self.read_longs(data_no, index, 1)[0])
         except Exception as e:
-            self.logger.error(f"Failed to get long DATA_{data_no}[{index}]: {e}")
+            self.logger.error("Failed to get long DATA_%d[%d]: %s", data_no, index, e)
             return 0
+
+    def read_longs(self, data_no: int, start: int, count: int,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Read LONG values from a data array
+
+        Args:
+            data_no: Data array number
+            start: First index (1-based)
+            count: Number of values
+            out: Optional C-contiguous int32 array the values are transferred
+                into directly (no intermediate copy)
+
+        Returns:
+            int32 array with count values (a view of out if given)
+
+        Raises:
+            Exception from the ADwin driver on transfer errors
+        """
+        if out is None:
+            out = np.empty(count, dtype=np.int32)
+        return self._adwin.GetData_Long(data_no, start, count, out=out)
+
+    # FIFO streaming
+
+    def fifo_count(self, fifo_no: int) -> int:
+        """Number of values waiting in a FIFO"""
+        return int(self._adwin.Fifo_Full(fifo_no))
+
+    def fifo_free(self, fifo_no: int) -> int:
+        """Number of free elements in a FIFO"""
+        return int(self._adwin.Fifo_Empty(fifo_no))
+
+    def clear_fifo(self, fifo_no: int):
+        """Reset FIFO read and write pointers"""
+        self._adwin.Fifo_Clear(fifo_no)
+
+    def read_fifo(self, fifo_no: int, count: int, dtype: Optional[str] = None,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Read values from a FIFO
+
+        Args:
+            fifo_no: FIFO data array number
+            count: Number of values (at most fifo_count)
+            dtype: "long" or "float" (taken from out if given)
+            out: Optional C-contiguous int32/float32 array the values are
+                transferred into directly
+
+        Returns:
+            Array with count values (a view of out if given)
+        """
+        if out is None:
+            out = np.empty(count, dtype=np.float32 if dtype == "float" else np.int32)
+        if out.dtype == np.float32:
+            return self._adwin.GetFifo_Float(fifo_no, count, out=out)
+        return self._adwin.GetFifo_Long(fifo_no, count, out=out)
+
+    def write_fifo(self, fifo_no: int, data: np.ndarray):
+        """
+        Write values to a FIFO (int32 -> SetFifo_Long, float -> SetFifo_Float)
+
+        The caller must not write more than fifo_free values. Contiguous
+        int32/float32 arrays are passed to the driver without copying.
+        """
+        if np.issubdtype(data.dtype, np.floating):
+            self._adwin.SetFifo_Float(fifo_no, data, len(data))
+        else:
+            self._adwin.SetFifo_Long(fifo_no, data, len(data))
+
+    def start_fifo_stream(self, fifo_no: int, callback=None, dtype: str = "long",
+                          max_block: int = 65536, n_buffers: int = 8,
+                          poll_interval_s: float = 0.001):
+        """
+        Continuously read a FIFO in a background thread
+
+        Args:
+            fifo_no: FIFO data array number
+            callback: Called with every FifoBlock from the reader thread;
+                without callback iterate over reader.blocks_iter() instead
+            dtype: "long" or "float", as declared in the ADbasic process
+            max_block: Largest number of values per transfer
+            n_buffers: Receive slots, i.e. blocks that stay valid
+            poll_interval_s: Sleep between polls while the FIFO is empty
+
+        Returns:
+            Running FifoStreamReader
+        """
+        from hardware.adwin_stream import FifoStreamReader
+
+        self.stop_fifo_stream(fifo_no)
+        reader = FifoStreamReader(self, fifo_no, dtype=dtype, max_block=max_block,
+                                  n_buffers=n_buffers, poll_interval_s=poll_interval_s)
+        if callback is not None:
+            reader.add_consumer(callback)
+        self._fifo_streams[fifo_no] = reader
+        reader.start()
+        return reader
+
+    def stream_waveform(self, fifo_no: int, waveform: np.ndarray, dtype: str = "float",
+                        repeat: bool = True, max_block: int = 65536,
+                        poll_interval_s: float = 0.001):
+        """
+        Stream a waveform to a FIFO read by the process driving the DAC
+
+        Returns:
+            Running FifoWaveformWriter
+        """
+        from hardware.adwin_stream import FifoWaveformWriter
+
+        self.stop_fifo_stream(fifo_no)
+        writer = FifoWaveformWriter(self, fifo_no, waveform, dtype=dtype, repeat=repeat,
+                                    max_block=max_block, poll_interval_s=poll_interval_s)
+        self._fifo_streams[fifo_no] = writer
+        writer.start()
+        return writer
+
+    def stop_fifo_stream(self, fifo_no: int):
+        """Stop FIFO reader or waveform writer on fifo_no"""
+        stream = self._fifo_streams.pop(fifo_no, None)
+        if stream:
+            stream.stop()
@@ -0,0 +1,916 @@
+"""
+AdWin Driver Simulator
+In-process stand-in for the ADwin DLL / libadwin.so used by ADwin.py
+"""
+import ctypes
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+
+# ADwin transfer data types (ADwin.ADWIN_DATATYPE_*)
+DATATYPES = {
+    1: np.dtype(np.int8),
+    2: np.dtype(np.int16),
+    3: np.dtype(np.int32),
+    5: np.dtype(np.float32),
+    6: np.dtype(np.float64),
+    7: np.dtype(np.int64),
+}
+DATATYPE_STRING = 8  # index of "string" in ADwin.ADwin_Datatypes
+
+# Processor type code -> (processdelay clock in Hz, name)
+PROCESSORS = {
+    9: (40e6, "T9"),
+    1010: (40e6, "T10"),
+    1011: (300e6, "T11"),
+    1012: (1e9, "T12"),
+}
+
+N_PARAMETERS = 80
+N_PROCESSES = 10
+DEFAULT_PROCESSDELAY = 1000
+
+# Error numbers of the simulator (not the driver's own numbering)
+ERROR_TEXTS = {
+    0: "No error.",
+    1001: "Simulated device is not booted.",
+    1002: "Process file not found.",
+    1003: "Process number out of range.",
+    1004: "Process is not loaded.",
+    1005: "Process is running.",
+    1006: "Parameter index out of range.",
+    1007: "Data array is not declared.",
+    1008: "Start index and count exceed the data array.",
+    1009: "FIFO is not declared.",
+    1010: "FIFO does not hold enough values.",
+    1011: "FIFO does not have enough free space.",
+    1012: "Unsupported data type.",
+    1013: "Data array is not a string.",
+}
+
+
+class SimulatorError(Exception):
+    """Error raised inside a simulated DLL call, reported through the error pointer"""
+
+    def __init__(self, number: int):
+        super().__init__(ERROR_TEXTS.get(number, "Unknown error."))
+        self.number = number
+
+
+def _export(function):
+    """Mark a SimulatedADwinDLL method as a DLL export"""
+    function._dll_export = True
+    return function
+
+
+class _Export:
+    """Callable DLL symbol; ADwin.py sets `restype` on some of them"""
+
+    def __init__(self, function: Callable):
+        self.function = function
+        self.restype = ctypes.c_int
+
+    def __call__(self, *args):
+        return self.function(*args)
+
+
+def _set_error(err, number: int):
+    if err is not None:
+        err.contents.value = number
+
+
+def _transfer_buffer(buffer, count: int, dtype: np.dtype) -> np.ndarray:
+    """numpy view of a ctypes array or pointer passed to a transfer function"""
+    if count <= 0:
+        return np.empty(0, dtype=dtype)
+    if isinstance(buffer, ctypes.Array):
+        return np.frombuffer(buffer, dtype=dtype, count=count)
+    address = ctypes.cast(buffer, ctypes.c_void_p).value
+    raw = (ctypes.c_char * (count * dtype.itemsize)).from_address(address)
+    return np.frombuffer(raw, dtype=dtype, count=count)
+
+
+def _read_header(process_file: Path) -> Dict[str, str]:
+    """ADbasic header of the .BAS source next to a compiled process file"""
+    header: Dict[str, str] = {}
+    for source in (process_file.with_suffix(".BAS"), process_file.with_suffix(".Bas"),
+                   process_file.with_suffix(".bas")):
+        if source.exists():
+            for line in source.read_text(errors="replace").splitlines():
+                if line.startswith("'<Header End>"):
+                    break
+                match = re.match(r"'\s*(\w+)\s*=\s*(.*?)\s*$", line)
+                if match:
+                    header[match.group(1)] = match.group(2)
+            break
+    return header
+
+
+class SimulatedFifo:
+    """FIFO array with a fill level"""
+
+    def __init__(self, dtype: np.dtype, length: int):
+        self.data = np.zeros(length, dtype=dtype)
+        self.read_index = 0
+        self.count = 0
+
+    @property
+    def free(self) -> int:
+        return self.data.size - self.count
+
+    def clear(self):
+        self.read_index = 0
+        self.count = 0
+
+    def put(self, values: np.ndarray):
+        """Append values (caller checks free space)"""
+        write_index = (self.read_index + self.count) % self.data.size
+        first = min(values.size, self.data.size - write_index)
+        self.data[write_index:write_index + first] = values[:first]
+        self.data[:values.size - first] = values[first:]
+        self.count += values.size
+
+    def get(self, out: np.ndarray):
+        """Remove out.size values into out (caller checks the fill level)"""
+        first = min(out.size, self.data.size - self.read_index)
+        np.copyto(out[:first], self.data[self.read_index:self.read_index + first],
+                  casting="unsafe")
+        np.copyto(out[first:], self.data[:out.size - first], casting="unsafe")
+        self.read_index = (self.read_index + out.size) % self.data.size
+        self.count -= out.size
+
+
+class SimulatedProcess:
+    """
+    Python re-implementation of an ADbasic process
+
+    `init` runs on Start_Process (the INIT: section) and `event` runs the
+    EVENT: section for `n_events` consecutive events at once, vectorized
+    where possible. `finish` runs on Stop_Process (the FINISH: section).
+    A process sets `period_s` to choose its own processdelay in INIT, as
+    "PROCESSDELAY = ..." does; otherwise the header value is used.
+    """
+
+    period_s: Optional[float] = None
+
+    def init(self, sim: "SimulatedADwinDLL"):
+        pass
+
+    def event(self, sim: "SimulatedADwinDLL", first_event: int, n_events: int,
+              event_period_s: float):
+        pass
+
+    def finish(self, sim: "SimulatedADwinDLL"):
+        pass
+
+
+class CounterProcess(SimulatedProcess):
+    """
+    "Pro Minimal": every event writes its write pointer into DATA_180
+
+    DATA_181 holds the write pointer, the buffer size and one value per
+    step; the loop counter is not used (Flags = 0).
+    """
+
+    period_s = 100e-6
+
+    def __init__(self, buffer_size: int = 100_000, data_no: int = 180, info_no: int = 181):
+        self.buffer_size = buffer_size
+        self.data_no = data_no
+        self.info_no = info_no
+
+    def init(self, sim):
+        self.buffer = sim.declare_data(self.data_no, np.int32, self.buffer_size)
+        self.info = sim.declare_data(self.info_no, np.int32, 200)
+        self.info[:5] = (1, 0, self.buffer_size, 1, 0)
+
+    def event(self, sim, first_event, n_events, event_period_s):
+        pointers = (self.info[0] - 1 + np.arange(n_events)) % self.buffer_size + 1
+        self.buffer[pointers[-self.buffer_size:] - 1] = pointers[-self.buffer_size:]
+        self.info[0] = pointers[-1] % self.buffer_size + 1
+        sim.pars[0] = self.info[0]
+
+
+class PackedAnalogProcess(SimulatedProcess):
+    """
+    "Gold/Pro ... Channels analog packed" measurement process
+
+    Every event converts all channels and stores two ADC codes per LONG
+    (``READADC(odd) + SHIFT_LEFT(READADC(even), 16)``) at the write
+    pointer of the circular DATA_180. DATA_181 holds write pointer, loop
+    counter, buffer size, LONGs per step and flags, as in the ADbasic
+    source. Input voltages come from `signal(t)`, which returns an
+    (n_events, n_channels) array for the event times t; by default
+    channel k is a 1 V sine at k Hz plus Gaussian noise.
+    """
+
+    def __init__(self, n_channels: int = 16, bits: int = 16, buffer_size: int = 1_000_000,
+                 data_no: int = 180, info_no: int = 181, range_v: float = 10.0,
+                 noise_v: float = 0.001,
+                 signal: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+                 seed: int = 0):
+        if n_channels % 2:
+            raise ValueError("Packed data holds an even number of channels")
+        self.n_channels = n_channels
+        self.bits = bits
+        self.values_count = n_channels // 2
+        # BUFSIZE is a whole-numbered multiple of the values count
+        self.buffer_size = buffer_size - buffer_size % self.values_count
+        self.data_no = data_no
+        self.info_no = info_no
+        self.range_v = range_v
+        self.noise_v = noise_v
+        self.signal = signal or self._default_signal
+        self._rng = np.random.default_rng(seed)
+        self._frequencies = np.arange(1, n_channels + 1, dtype=np.float64)
+
+    def _default_signal(self, t: np.ndarray) -> np.ndarray:
+        volts = np.sin(2 * np.pi * np.outer(t, self._frequencies))
+        if self.noise_v:
+            volts += self._rng.normal(0.0, self.noise_v, volts.shape)
+        return volts
+
+    def init(self, sim):
+        self.buffer = sim.declare_data(self.data_no, np.int32, self.buffer_size)
+        self.info = sim.declare_data(self.info_no, np.int32, 200)
+        self.info[:5] = (1, 0, self.buffer_size, self.values_count, 1)
+
+    def convert(self, volts: np.ndarray) -> np.ndarray:
+        """ADC codes (0 .. 2**bits - 1) for bipolar input voltages"""
+        full_scale = 1 << self.bits
+        codes = np.rint((volts + self.range_v) * (full_scale / (2 * self.range_v)))
+        return np.clip(codes, 0, full_scale - 1).astype(np.uint32)
+
+    def event(self, sim, first_event, n_events, event_period_s):
+        # Only the newest buffer's worth of steps can survive in DATA_180
+        max_steps = self.buffer_size // self.values_count
+        skipped = max(0, n_events - max_steps)
+        t = (first_event + skipped + np.arange(n_events - skipped)) * event_period_s
+        codes = self.convert(self.signal(t))
+        block = (codes[:, 0::2] | (codes[:, 1::2] << 16)).view(np.int32).reshape(-1)
+
+        position = int(self.info[0]) - 1
+        loops = int(self.info[1])
+        # Skipped steps still advance the pointer and loop counter
+        position += skipped * self.values_count
+        loops += position // self.buffer_size
+        position %= self.buffer_size
+
+        offset = 0
+        while offset < block.size:
+            count = min(block.size - offset, self.buffer_size - position)
+            self.buffer[position:position + count] = block[offset:offset + count]
+            offset += count
+            position += count
+            if position == self.buffer_size:
+                position = 0
+                loops += 1
+        self.info[0] = position + 1
+        self.info[1] = loops
+
+
+class FifoProcess(SimulatedProcess):
+    """
+    FIFO acquisition and output process
+
+    Every event appends one sample (the event number, or a 1 V sine at
+    `frequency_hz` for float FIFOs) to `input_fifo` and removes one value
+    from `output_fifo`, which the PC keeps filled; the last output value
+    goes to FPar_1. A full input or empty output FIFO is counted in
+    `overflows` / `underruns`, like a real process that checks FIFO_EMPTY.
+    """
+
+    def __init__(self, input_fifo: Optional[int] = 1, output_fifo: Optional[int] = None,
+                 dtype: str = "long", fifo_size: int = 100_000,
+                 frequency_hz: float = 10.0):
+        self.input_fifo = input_fifo
+        self.output_fifo = output_fifo
+        self.dtype = np.dtype(np.int32 if dtype == "long" else np.float32)
+        self.fifo_size = fifo_size
+        self.frequency_hz = frequency_hz
+        self.overflows = 0
+        self.underruns = 0
+        self._scratch = np.empty(0, dtype=self.dtype)
+
+    def init(self, sim):
+        if self.input_fifo is not None:
+            self.input = sim.declare_fifo(self.input_fifo, self.dtype, self.fifo_size)
+        if self.output_fifo is not None:
+            self.output = sim.declare_fifo(self.output_fifo, self.dtype, self.fifo_size)
+
+    def event(self, sim, first_event, n_events, event_period_s):
+        if self.input_fifo is not None:
+            events = first_event + np.arange(min(n_events, self.input.free))
+            if self.dtype.kind == "i":
+                samples = events.astype(np.int32)
+            else:
+                samples = np.sin(2 * np.pi * self.frequency_hz * event_period_s * events)
+            self.input.put(samples.astype(self.dtype))
+            self.overflows += n_events - events.size
+
+        if self.output_fifo is not None:
+            count = min(n_events, self.output.count)
+            if count:
+                if self._scratch.size < count:
+                    self._scratch = np.empty(count, dtype=self.dtype)
+                self.output.get(self._scratch[:count])
+                sim.fpars[0] = self._scratch[count - 1]
+            self.underruns += n_events - count
+
+
+def default_process_factory(process_file: Path) -> SimulatedProcess:
+    """Pick the simulated process for a compiled process file by its name"""
+    name = process_file.stem
+    match = re.search(r"(\d+) Channels? analog packed", name, re.IGNORECASE)
+    if match:
+        bits = 16 if re.search(r"16Bit|Light16|^Pro", name, re.IGNORECASE) else 12
+        return PackedAnalogProcess(n_channels=int(match.group(1)), bits=bits)
+    if re.search(r"Minimal", name, re.IGNORECASE):
+        return CounterProcess()
+    return SimulatedProcess()
+
+
+class _ProcessSlot:
+    """A loaded process with its status and event clock"""
+
+    def __init__(self, process: SimulatedProcess, processdelay: int, file: str):
+        self.process = process
+        self.processdelay = processdelay
+        self.file = file
+        self.running = False
+        self.start_time = 0.0
+        self.events = 0  # events run since start_time
+        self.total_events = 0
+
+
+class SimulatedADwinDLL:
+    """
+    In-process simulation of the ADwin driver library
+
+    Provides the e_* functions ADwin.py calls through ctypes, with the same
+    arguments (ctypes pointers and arrays, error pointer), on top of
+    simulated device memory: Par_1..80 and FPar_1..80, DATA arrays and
+    FIFOs with declared type and length, and up to 10 processes. Loaded
+    processes are Python re-implementations (SimulatedProcess) chosen from
+    the process file name by `process_factory`. While a process runs, a
+    background thread catches up with the simulated event clock every
+    `tick_s`, running all events due since the last tick
+    (processdelay / processor clock per event) in one vectorized call.
+    Calls from the PC and event batches are serialized by one lock, so a
+    transfer never sees a half-written event, as on the real device.
+    """
+
+    def __init__(self, processor: int = 1012, tick_s: float = 0.001,
+                 process_factory: Callable[[Path], SimulatedProcess] = default_process_factory):
+        """
+        Initialize simulator
+
+        Args:
+            processor: Processor type code (9, 1010, 1011 or 1012)
+            tick_s: Interval at which running processes catch up
+            process_factory: Returns the SimulatedProcess for a process file
+        """
+        if processor not in PROCESSORS:
+            raise ValueError(f"Unsupported processor type: {processor}")
+        self.logger = logging.getLogger(__name__)
+        self.processor = processor
+        self.clock_hz = PROCESSORS[processor][0]
+        self.tick_s = tick_s
+        self.process_factory = process_factory
+
+        self.device_no = 1
+        self.booted = False
+        self.pars = np.zeros(N_PARAMETERS, dtype=np.int32)
+        self.fpars = np.zeros(N_PARAMETERS, dtype=np.float64)
+        self.data: Dict[int, np.ndarray] = {}
+        self.fifos: Dict[int, SimulatedFifo] = {}
+        self.processes: Dict[int, _ProcessSlot] = {}
+        self.transsize = 336
+        self.sanitize_floats = 1
+
+        self._lock = threading.RLock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._busy_s = 0.0
+        self._busy_since = time.perf_counter()
+
+        # DLL symbols are instance attributes so `restype` can be set on them
+        for name in dir(type(self)):
+            function = getattr(type(self), name)
+            if getattr(function, "_dll_export", False):
+                setattr(self, name, _Export(function.__get__(self)))
+
+    # Device memory used by simulated processes
+
+    def declare_data(self, data_no: int, dtype, length: int) -> np.ndarray:
+        """Declare DATA_<data_no> (DIM DATA_n[length] AS ...); returns 0-based storage"""
+        with self._lock:
+            self.data[data_no] = np.zeros(length, dtype=dtype)
+            return self.data[data_no]
+
+    def declare_fifo(self, fifo_no: int, dtype, length: int) -> SimulatedFifo:
+        """Declare DATA_<fifo_no> as FIFO"""
+        with self._lock:
+            self.data.pop(fifo_no, None)
+            self.fifos[fifo_no] = SimulatedFifo(np.dtype(dtype), length)
+            return self.fifos[fifo_no]
+
+    def add_process(self, process_no: int, process: SimulatedProcess,
+                    processdelay: int = DEFAULT_PROCESSDELAY):
+        """Load a SimulatedProcess directly instead of from a process file"""
+        with self._lock:
+            self._check_process_no(process_no)
+            if process_no in self.processes and self.processes[process_no].running:
+                raise SimulatorError(1005)
+            self.processes[process_no] = _ProcessSlot(process, processdelay, "")
+
+    def close(self):
+        """Stop all processes and the event thread"""
+        with self._lock:
+            for slot in self.processes.values():
+                self._stop_slot(slot)
+        self._stop_thread()
+
+    # Event clock
+
+    def _event_period_s(self, slot: _ProcessSlot) -> float:
+        return slot.processdelay / self.clock_hz
+
+    def _start_slot(self, slot: _ProcessSlot):
+        slot.process.init(self)
+        if slot.process.period_s is not None:
+            slot.processdelay = max(1, round(slot.process.period_s * self.clock_hz))
+        slot.running = True
+        slot.start_time = time.perf_counter()
+        slot.events = 0
+        slot.total_events = 0
+        self._start_thread()
+
+    def _stop_slot(self, slot: _ProcessSlot):
+        if slot.running:
+            self._run_due_events(slot, time.perf_counter())
+            slot.running = False
+            slot.process.finish(self)
+
+    def _run_due_events(self, slot: _ProcessSlot, now: float):
+        period = self._event_period_s(slot)
+        due = int((now - slot.start_time) / period) - slot.events
+        if due > 0:
+            slot.process.event(self, slot.total_events, due, period)
+            slot.events += due
+            slot.total_events += due
+
+    def _start_thread(self):
+        if self._running:
+            return
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._event_loop, daemon=True)
+        self._thread.start()
+
+    def _stop_thread(self):
+        self._running = False
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _event_loop(self):
+        """Run due events of all running processes every tick"""
+        while self._running:
+            start = time.perf_counter()
+            with self._lock:
+                for slot in self.processes.values():
+                    if slot.running:
+                        try:
+                            self._run_due_events(slot, start)
+                        except Exception:
+                            self.logger.exception("Simulated process %s failed", slot.file)
+                            slot.running = False
+            self._busy_s += time.perf_counter() - start
+            self._stop_event.wait(self.tick_s)
+
+    def _check_process_no(self, process_no: int):
+        if not 1 <= process_no <= N_PROCESSES:
+            raise SimulatorError(1003)
+
+    def _call(self, err, function, *args):
+        """Run a DLL function body, reporting SimulatorError via the error pointer"""
+        try:
+            with self._lock:
+                result = function(*args)
+            _set_error(err, 0)
+            return result
+        except SimulatorError as e:
+            _set_error(err, e.number)
+            return 0
+
+    def _data_array(self, data_no: int) -> np.ndarray:
+        if data_no not in self.data:
+            raise SimulatorError(1007)
+        return self.data[data_no]
+
+    def _data_range(self, data_no: int, start: int, count: int) -> np.ndarray:
+        array = self._data_array(data_no)
+        if start < 1 or count < 0 or start - 1 + count > array.size:
+            raise SimulatorError(1008)
+        return array[start - 1:start - 1 + count]
+
+    def _fifo(self, fifo_no: int) -> SimulatedFifo:
+        if fifo_no not in self.fifos:
+            raise SimulatorError(1009)
+        return self.fifos[fifo_no]
+
+    @staticmethod
+    def _dtype(datatype: int) -> np.dtype:
+        if datatype not in DATATYPES:
+            raise SimulatorError(1012)
+        return DATATYPES[datatype]
+
+    def _par_index(self, index: int) -> int:
+        if not 1 <= index <= N_PARAMETERS:
+            raise SimulatorError(1006)
+        return index - 1
+
+    def _par_block(self, start: int, count: int) -> slice:
+        if start < 1 or count < 0 or start - 1 + count > N_PARAMETERS:
+            raise SimulatorError(1006)
+        return slice(start - 1, start - 1 + count)
+
+    # System control and information
+
+    @_export
+    def Set_DeviceNo(self, device_no):
+        self.device_no = device_no
+
+    @_export
+    def e_ADboot(self, filename, device_no, memsize, msg, err):
+        def boot():
+            for slot in self.processes.values():
+                self._stop_slot(slot)
+            self.processes.clear()
+            self.data.clear()
+            self.fifos.clear()
+            self.pars[:] = 0
+            self.fpars[:] = 0
+            self.booted = True
+            self.logger.info("Simulated AdWin booted (%s)", PROCESSORS[self.processor][1])
+        return self._call(err, boot)
+
+    @_export
+    def e_ADTest_Version(self, device_no, msg, err):
+        return self._call(err, lambda: 0 if self.booted else 1)
+
+    @_export
+    def e_ADProzessorTyp(self, device_no, err):
+        return self._call(err, lambda: self.processor)
+
+    @_export
+    def e_AD_Workload(self, priority, device_no, err):
+        def workload():
+            now = time.perf_counter()
+            elapsed = now - self._busy_since
+            busy = self._busy_s
+            self._busy_s = 0.0
+            self._busy_since = now
+            return int(min(100.0, 100.0 * busy / elapsed)) if elapsed > 0 else 0
+        return self._call(err, workload)
+
+    @_export
+    def e_AD_Memory_all_byte(self, mem_spec, device_no, err):
+        def free_memory():
+            used = sum(array.nbytes for array in self.data.values())
+            used += sum(fifo.data.nbytes for fifo in self.fifos.values())
+            return max(0, (256 << 20) - used)
+        return self._call(err, free_memory)
+
+    # Process control
+
+    @_export
+    def e_ADBload(self, filename, device_no, msg, err):
+        def load():
+            if not self.booted:
+                raise SimulatorError(1001)
+            path = Path(filename.decode() if isinstance(filename, bytes) else filename)
+            if not path.exists():
+                raise SimulatorError(1002)
+            header = _read_header(path)
+            process_no = int(header.get("Process_Number", path.suffix[-1:] or 0))
+            self._check_process_no(process_no)
+            slot = self.processes.get(process_no)
+            if slot is not None and slot.running:
+                raise SimulatorError(1005)
+            delay = int(header.get("Initial_Processdelay", DEFAULT_PROCESSDELAY))
+            self.processes[process_no] = _ProcessSlot(self.process_factory(path), delay, str(path))
+            self.logger.info("Simulated AdWin loaded %s as process %d", path.name, process_no)
+        return self._call(err, load)
+
+    def _slot(self, process_no: int) -> _ProcessSlot:
+        self._check_process_no(process_no)
+        if process_no not in self.processes:
+            raise SimulatorError(1004)
+        return self.processes[process_no]
+
+    @_export
+    def e_ADB_Start(self, process_no, device_no, err):
+        def start():
+            slot = self._slot(process_no)
+            if not slot.running:
+                self._start_slot(slot)
+        return self._call(err, start)
+
+    @_export
+    def e_ADB_Stop(self, process_no, device_no, err):
+        return self._call(err, lambda: self._stop_slot(self._slot(process_no)))
+
+    @_export
+    def e_Clear_Process(self, process_no, device_no, err):
+        def clear():
+            if self._slot(process_no).running:
+                raise SimulatorError(1005)
+            del self.processes[process_no]
+        return self._call(err, clear)
+
+    # Global variables; -100 + n is the status, -90 + n the processdelay of process n
+
+    @_export
+    def e_Get_ADBPar(self, index, device_no, err):
+        def get():
+            if -100 < index <= -90:
+                slot = self.processes.get(index + 100)
+                return 1 if slot is not None and slot.running else 0
+            if -90 < index <= -80:
+                return self._slot(index + 90).processdelay
+            return int(self.pars[self._par_index(index)])
+        return self._call(err, get)
+
+    @_export
+    def e_Set_ADBPar(self, index, value, device_no, err):
+        def set_par():
+            if -90 < index <= -80:
+                slot = self._slot(index + 90)
+                if slot.running:
+                    # Keep the events already run, continue at the new rate
+                    now = time.perf_counter()
+                    self._run_due_events(slot, now)
+                    slot.start_time = now
+                    slot.events = 0
+                slot.processdelay = max(1, int(value))
+            else:
+                self.pars[self._par_index(index)] = value
+        return self._call(err, set_par)
+
+    @_export
+    def e_Get_ADBPar_All(self, start, count, data, device_no, err):
+        def get_all():
+            _transfer_buffer(data, count, np.dtype(np.int32))[:] = \
+                self.pars[self._par_block(start, count)]
+        return self._call(err, get_all)
+
+    @_export
+    def e_Set_ADBFPar(self, index, value, device_no, err):
+        def set_fpar():
+            self.fpars[self._par_index(index)] = np.float32(getattr(value, "value", value))
+        return self._call(err, set_fpar)
+
+    @_export
+    def e_Get_ADBFPar(self, index, device_no, err):
+        return self._call(err, lambda: float(np.float32(self.fpars[self._par_index(index)])))
+
+    @_export
+    def e_Set_ADBFPar_Double(self, index, value, device_no, err):
+        def set_fpar():
+            self.fpars[self._par_index(index)] = getattr(value, "value", value)
+        return self._call(err, set_fpar)
+
+    @_export
+    def e_Get_ADBFPar_Double(self, index, device_no, err):
+        return self._call(err, lambda: float(self.fpars[self._par_index(index)]))
+
+    @_export
+    def e_Get_ADBFPar_All(self, start, count, data, device_no, err):
+        def get_all():
+            _transfer_buffer(data, count, np.dtype(np.float32))[:] = \
+                self.fpars[self._par_block(start, count)]
+        return self._call(err, get_all)
+
+    @_export
+    def e_Get_ADBFPar_All_Double(self, start, count, data, device_no, err):
+        def get_all():
+            _transfer_buffer(data, count, np.dtype(np.float64))[:] = \
+                self.fpars[self._par_block(start, count)]
+        return self._call(err, get_all)
+
+    # Data arrays
+
+    @_export
+    def e_GetDataLength(self, data_no, device_no, err):
+        def length():
+            if data_no in self.fifos:
+                return self.fifos[data_no].data.size
+            return self._data_array(data_no).size
+        return self._call(err, length)
+
+    def _data_type(self, data_no: int) -> int:
+        array = self.fifos[data_no].data if data_no in self.fifos else self._data_array(data_no)
+        if array.dtype == np.uint8:
+            return DATATYPE_STRING
+        return next(code for code, dtype in DATATYPES.items() if dtype == array.dtype)
+
+    @_export
+    def e_GetDataTyp(self, data_no, device_no, err):
+        return self._call(err, self._data_type, data_no)
+
+    @_export
+    def adwin_get_data_type(self, data_no, device_no):
+        try:
+            with self._lock:
+                return self._data_type(data_no)
+        except SimulatorError:
+            return 0
+
+    @_export
+    def e_Get_Data(self, buffer, datatype, data_no, start, count, device_no, err):
+        def get_data():
+            values = self._data_range(data_no, start, count)
+            np.copyto(_transfer_buffer(buffer, count, self._dtype(datatype)), values,
+                      casting="unsafe")
+        return self._call(err, get_data)
+
+    @_export
+    def e_Set_Data(self, buffer, datatype, data_no, start, count, device_no, err):
+        def set_data():
+            values = self._data_range(data_no, start, count)
+            np.copyto(values, _transfer_buffer(buffer, count, self._dtype(datatype)),
+                      casting="unsafe")
+        return self._call(err, set_data)
+
+    @_export
+    def Clear_Data(self, data_no, device_no, err):
+        def clear():
+            self._data_array(data_no)[:] = 0
+        return self._call(err, clear)
+
+    @_export
+    def e_SaveFast(self, filename, data_no, start, count, mode, device_no, err):
+        def save():
+            values = self._data_range(data_no, start, count)
+            with open(filename.decode(), "ab" if mode else "wb") as f:
+                values.tofile(f)
+        return self._call(err, save)
+
+    @_export
+    def File2Data(self, filename, datatype, data_no, start, device_no):
+        def load():
+            values = np.fromfile(filename.decode(), dtype=self._dtype(datatype))
+            self._data_range(data_no, start, values.size)[:] = values
+        err = ctypes.pointer(ctypes.c_int32(0))
+        self._call(err, load)
+        return err.contents.value
+
+    # String data arrays (stored as uint8 with a terminating zero)
+
+    def _string_array(self, data_no: int) -> np.ndarray:
+        array = self._data_array(data_no)
+        if array.dtype != np.uint8:
+            raise SimulatorError(1013)
+        return array
+
+    @_export
+    def e_Get_Data_String_Length(self, data_no, device_no, err):
+        def length():
+            array = self._string_array(data_no)
+            zeros = np.flatnonzero(array == 0)
+            return int(zeros[0]) if zeros.size else array.size
+        return self._call(err, length)
+
+    @_export
+    def e_Set_Data_String(self, string, data_no, device_no, err):
+        def set_string():
+            array = self._string_array(data_no)
+            if len(string) >= array.size:
+                raise SimulatorError(1008)
+            array[:len(string)] = np.frombuffer(string, dtype=np.uint8)
+            array[len(string)] = 0
+        return self._call(err, set_string)
+
+    @_export
+    def e_Get_Data_String(self, buffer, max_count, data_no, device_no, err):
+        def get_string():
+            array = self._string_array(data_no)
+            count = min(max_count, array.size)
+            target = _transfer_buffer(buffer, count, np.dtype(np.uint8))
+            target[:] = array[:count]
+            target[count - 1] = 0
+        return self._call(err, get_string)
+
+    # FIFOs
+
+    @_export
+    def e_Get_Fifo_Empty(self, fifo_no, device_no, err):
+        return self._call(err, lambda: self._fifo(fifo_no).free)
+
+    @_export
+    def e_Get_Fifo_Count(self, fifo_no, device_no, err):
+        return self._call(err, lambda: self._fifo(fifo_no).count)
+
+    @_export
+    def e_Clear_Fifo(self, fifo_no, device_no, err):
+        return self._call(err, lambda: self._fifo(fifo_no).clear())
+
+    @_export
+    def e_Get_Fifo(self, buffer, datatype, fifo_no, count, device_no, err):
+        def get_fifo():
+            fifo = self._fifo(fifo_no)
+            if count > fifo.count:
+                raise SimulatorError(1010)
+            fifo.get(_transfer_buffer(buffer, count, self._dtype(datatype)))
+        return self._call(err, get_fifo)
+
+    @_export
+    def e_Set_Fifo(self, buffer, datatype, fifo_no, count, device_no, err):
+        def set_fifo():
+            fifo = self._fifo(fifo_no)
+            if count > fifo.free:
+                raise SimulatorError(1011)
+            values = _transfer_buffer(buffer, count, self._dtype(datatype))
+            fifo.put(values.astype(fifo.data.dtype, copy=False))
+        return self._call(err, set_fifo)
+
+    # Error handling and driver settings
+
+    @_export
+    def ADGetErrorText(self, number, text, size):
+        buffer = getattr(text, "_obj", text)
+        message = ERROR_TEXTS.get(number, "Unknown error.").encode()[:size - 1]
+        ctypes.memmove(buffer, message + b"\0", len(message) + 1)
+        return 0
+
+    @_export
+    def SanitizeFloatingPointValues(self, flag):
+        self.sanitize_floats = flag
+
+    @_export
+    def e_Set_GD_Transsize(self, transsize, device_no, err):
+        def set_transsize():
+            self.transsize = transsize
+        return self._call(err, set_transsize)
+
+    @_export
+    def e_Get_GD_Transsize(self, device_no, err):
+        return self._call(err, lambda: self.transsize)
+
+    @_export
+    def getRetryCounter(self):
+        return 0
+
+    @_export
+    def getDeviceRetryCounter(self, device_no):
+        return 0
+
+    @_export
+    def incRetryCounter(self):
+        pass
+
+    @_export
+    def resetRetryCounter(self):
+        pass
+
+    @_export
+    def resetDeviceRetryCounter(self, device_no):
+        pass
+
+
+def create_simulated_adwin(DeviceNo: int = 1, raiseExceptions: int = 1, useNumpyArrays: int = 0,
+                           dll: Optional[SimulatedADwinDLL] = None):
+    """
+    ADwin.ADwin object talking to a SimulatedADwinDLL
+
+    The wrapper is used unchanged, only its library is replaced, so all
+    argument marshalling and error checks of ADwin.py are exercised.
+
+    Args:
+        DeviceNo, raiseExceptions, useNumpyArrays: As for ADwin.ADwin
+        dll: Simulator to use (default: a new T12 simulator)
+
+    Returns:
+        ADwin.ADwin instance (the simulator is its `dll` attribute)
+    """
+    import ADwin
+
+    adwin = ADwin.ADwin.__new__(ADwin.ADwin)
+    adwin.version = ADwin.version
+    adwin.ADwindir = ""
+    adwin.dll = dll if dll is not None else SimulatedADwinDLL()
+    adwin.dll.Set_DeviceNo(DeviceNo)
+    adwin.raiseExceptions = raiseExceptions
+    adwin.DeviceNo = DeviceNo
+    adwin.useNumpyArrays = useNumpyArrays
+    return adwin
@@ -0,0 +1,561 @@
+"""
+AdWin Data Streaming
+Continuous readout of the packed circular buffer and of FIFO arrays
+"""
+import logging
+import time
+from dataclasses import dataclass
+from queue import Empty, Full, Queue
+from threading import Event, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from hardware.adwin_board import PackedDecoder
+
+
+@dataclass
+class PackedBlock:
+    """Block of newly acquired samples"""
+    data: np.ndarray  # (n_steps, n_channels) ADC codes or volts
+    first_step: int  # absolute index of the first step since the process started
+    timestamp: float
+    overrun: bool  # steps were lost before this block
+
+
+class PackedBufferReader:
+    """
+    Streaming reader for the packed circular buffer on DATA_180/DATA_181
+
+    The "Gold ... analog packed" processes write two ADC values per LONG
+    into the circular buffer DATA_180 and keep their state in DATA_181:
+    [1] WritePointer (1-based index of the next LONG), [2] LoopCounter
+    (buffer wrap count), [3] BufferSize and [4] ValuesCount (LONGs per
+    step). The reader turns WritePointer and LoopCounter into an absolute
+    write position, reads only the span written since the last poll
+    (at most two transfers when the span wraps) into a preallocated
+    buffer, and decodes it to (n_steps, n_channels) with a PackedDecoder.
+
+    If more than BufferSize LONGs were written since the last poll, the
+    oldest data has been overwritten: the reader counts an overrun, drops
+    everything but the newest half buffer and flags the next block. The
+    pointer is read again after each transfer, so a block that was
+    overwritten while it was being read is detected the same way.
+    """
+
+    WRITE_POINTER, LOOP_COUNTER, BUFFER_SIZE, VALUES_COUNT = 1, 2, 3, 4
+
+    def __init__(self, board, data_no: int = 180, info_no: int = 181,
+                 n_channels: int = 16, poll_interval_s: float = 0.01,
+                 max_block_steps: int = 65536,
+                 decoder: Optional[PackedDecoder] = None):
+        """
+        Initialize reader
+
+        Args:
+            board: AdWinGoldIII (anything providing read_longs)
+            data_no: Data array holding the circular buffer
+            info_no: Data array holding pointer, loop counter and sizes
+            n_channels: Channels per step (two per LONG)
+            poll_interval_s: Sleep between polls in the background thread
+            max_block_steps: Largest number of steps read per poll
+            decoder: Sample decoder (16-bit codes by default)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.board = board
+        self.data_no = data_no
+        self.info_no = info_no
+        self.n_channels = n_channels
+        self.poll_interval_s = poll_interval_s
+        self.max_block_steps = max_block_steps
+        self.decoder = decoder or PackedDecoder(n_channels=n_channels)
+
+        self.buffer_size = 0
+        self.values_count = 0
+        self._read_pos = 0  # absolute LONG position of the next unread value
+        self._overrun = False
+        self._raw: Optional[np.ndarray] = None
+        self._pointer = np.zeros(2, dtype=np.int32)
+
+        self._consumers: List[Callable[[PackedBlock], None]] = []
+        self._running = False
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+
+        # Statistics
+        self.blocks = 0
+        self.steps_read = 0
+        self.transfers = 0
+        self.overruns = 0
+        self.lost_steps = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def add_consumer(self, consumer: Callable[[PackedBlock], None]):
+        """Register callable that receives every PackedBlock"""
+        self._consumers.append(consumer)
+
+    def remove_consumer(self, consumer: Callable[[PackedBlock], None]):
+        """Unregister consumer"""
+        if consumer in self._consumers:
+            self._consumers.remove(consumer)
+
+    def sync(self):
+        """
+        Read buffer geometry and start reading at the current write position
+
+        Raises:
+            ValueError: If the buffer layout does not match n_channels
+        """
+        info = self.board.read_longs(self.info_no, 1, 4)
+        self.buffer_size = int(info[self.BUFFER_SIZE - 1])
+        self.values_count = int(info[self.VALUES_COUNT - 1])
+
+        if self.values_count * 2 != self.n_channels:
+            raise ValueError(f"Process writes {self.values_count} LONGs per step, "
+                             f"expected {self.n_channels // 2} for {self.n_channels} channels")
+        if self.buffer_size <= 0 or self.buffer_size % self.values_count:
+            raise ValueError(f"Invalid packed buffer size {self.buffer_size}")
+
+        max_longs = min(self.max_block_steps * self.values_count, self.buffer_size)
+        if self._raw is None or self._raw.size != max_longs:
+            self._raw = np.empty(max_longs, dtype=np.int32)
+
+        write_pos = self._write_position(info[self.WRITE_POINTER - 1],
+                                         info[self.LOOP_COUNTER - 1])
+        self._read_pos = write_pos - write_pos % self.values_count
+        self.logger.info("Packed buffer synced: %d LONGs, %d LONGs/step",
+                         self.buffer_size, self.values_count)
+
+    def _write_position(self, write_pointer: int, loop_counter: int) -> int:
+        """Absolute number of LONGs written by the process"""
+        return int(loop_counter) * self.buffer_size + int(write_pointer) - 1
+
+    def _read_write_position(self) -> int:
+        """Read WritePointer and LoopCounter in a single transfer"""
+        pointer = self.board.read_longs(self.info_no, self.WRITE_POINTER, 2,
+                                        out=self._pointer)
+        return self._write_position(pointer[0], pointer[1])
+
+    def read(self) -> Optional[PackedBlock]:
+        """
+        Read all complete steps written since the last call
+
+        Returns:
+            PackedBlock, or None if no new step is available
+        """
+        if self._raw is None:
+            self.sync()
+
+        write_pos = self._read_write_position()
+        if write_pos - self._read_pos > self.buffer_size:
+            self._skip_to(write_pos)
+
+        n_longs = min(write_pos - self._read_pos, self._raw.size)
+        n_longs -= n_longs % self.values_count
+        if n_longs <= 0:
+            return None
+
+        start = self._read_pos
+        self._transfer(start, n_longs)
+
+        # Data may have been overwritten while it was transferred
+        write_pos = self._read_write_position()
+        if write_pos - start > self.buffer_size:
+            self._skip_to(write_pos)
+            return None
+
+        self._read_pos = start + n_longs
+        n_steps = n_longs // self.values_count
+        block = PackedBlock(
+            data=self.decoder.decode(self._raw[:n_longs]),
+            first_step=start // self.values_count,
+            timestamp=time.time(),
+            overrun=self._overrun,
+        )
+        self._overrun = False
+        self.blocks += 1
+        self.steps_read += n_steps
+        return block
+
+    def _transfer(self, start: int, n_longs: int):
+        """Copy n_longs from absolute position start into the raw buffer"""
+        offset = start % self.buffer_size
+        first = min(n_longs, self.buffer_size - offset)
+        self.board.read_longs(self.data_no, offset + 1, first, out=self._raw[:first])
+        self.transfers += 1
+        if n_longs > first:
+            # Wrapped around the end of the circular buffer
+            self.board.read_longs(self.data_no, 1, n_longs - first,
+                                  out=self._raw[first:n_longs])
+            self.transfers += 1
+
+    def _skip_to(self, write_pos: int):
+        """Drop overwritten data, keeping the newest half buffer"""
+        keep = self.buffer_size // 2
+        new_pos = write_pos - keep
+        new_pos += -new_pos % self.values_count  # next step boundary
+        lost = (new_pos - self._read_pos) // self.values_count
+        self.overruns += 1
+        self.lost_steps += lost
+        self._read_pos = new_pos
+        self._overrun = True
+        self.logger.warning("Packed buffer overrun, skipped %d steps", lost)
+
+    def start(self):
+        """Start polling in background thread"""
+        if self._running:
+            self.logger.warning("Packed buffer reader already running")
+            return
+
+        self.sync()
+        self._running = True
+        self._stop_event.clear()
+        self._thread = Thread(target=self._read_loop, daemon=True)
+        self._thread.start()
+        self.logger.info("Started packed buffer reader")
+
+    def stop(self):
+        """Stop background polling"""
+        if not self._running:
+            return
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        self.logger.info("Stopped packed buffer reader")
+
+    def _read_loop(self):
+        """Poll buffer and hand blocks to consumers (runs in background thread)"""
+        while self._running and not self._stop_event.is_set():
+            try:
+                block = self.read()
+                if block is None:
+                    self._stop_event.wait(timeout=self.poll_interval_s)
+                    continue
+                for consumer in self._consumers:
+                    consumer(block)
+            except Exception as e:
+                self.logger.error("Packed buffer read error: %s", e, exc_info=True)
+                self._stop_event.wait(timeout=0.1)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get reader statistics"""
+        return {
+            "blocks": self.blocks,
+            "steps_read": self.steps_read,
+            "transfers": self.transfers,
+            "overruns": self.overruns,
+            "lost_steps": self.lost_steps,
+        }
+
+
+@dataclass
+class FifoBlock:
+    """Block of values read from an AdWin FIFO"""
+    data: np.ndarray  # view into the reader's receive ring
+    first_index: int  # number of values read from the FIFO before this block
+    timestamp: float
+    fifo_full: bool  # FIFO was full when polled, values may have been lost
+
+
+class FifoStreamReader:
+    """
+    Continuous reader for an AdWin FIFO array
+
+    Each poll asks the board how many values the FIFO holds (Fifo_Full)
+    and transfers all of them, capped at max_block, directly into the next
+    slot of a preallocated receive ring. The block size therefore adapts
+    to the acquisition rate: a busy FIFO is drained in large transfers and
+    polled again immediately, an idle one is polled every
+    poll_interval_s. Block data are views into the ring and stay valid
+    until n_buffers further blocks have been read; copy them to keep
+    them longer.
+    """
+
+    DTYPES = {"long": np.int32, "float": np.float32}
+
+    def __init__(self, board, fifo_no: int, dtype: str = "long",
+                 max_block: int = 65536, n_buffers: int = 8,
+                 poll_interval_s: float = 0.001):
+        """
+        Initialize reader
+
+        Args:
+            board: AdWinGoldIII (anything providing fifo_count and read_fifo)
+            fifo_no: Number of the FIFO data array
+            dtype: "long" or "float", as declared in the ADbasic process
+            max_block: Largest number of values read per poll
+            n_buffers: Receive slots, i.e. blocks that stay valid
+            poll_interval_s: Sleep between polls while the FIFO is empty
+        """
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unknown FIFO data type: {dtype}")
+
+        self.logger = logging.getLogger(__name__)
+        self.board = board
+        self.fifo_no = fifo_no
+        self.dtype = dtype
+        self.max_block = max_block
+        self.poll_interval_s = poll_interval_s
+
+        self._ring = np.empty((n_buffers, max_block), dtype=self.DTYPES[dtype])
+        self._slot = 0
+        self._queue: Optional[Queue] = None
+
+        self._consumers: List[Callable[[FifoBlock], None]] = []
+        self._running = False
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+
+        # Statistics
+        self.blocks = 0
+        self.values_read = 0
+        self.full_events = 0
+        self.max_fill = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def add_consumer(self, consumer: Callable[[FifoBlock], None]):
+        """Register callable that receives every FifoBlock"""
+        self._consumers.append(consumer)
+
+    def remove_consumer(self, consumer: Callable[[FifoBlock], None]):
+        """Unregister consumer"""
+        if consumer in self._consumers:
+            self._consumers.remove(consumer)
+
+    def read(self) -> Optional[FifoBlock]:
+        """
+        Read the values currently in the FIFO (at most max_block)
+
+        Returns:
+            FifoBlock, or None if the FIFO is empty
+        """
+        available = self.board.fifo_count(self.fifo_no)
+        if available <= 0:
+            return None
+
+        fifo_full = self.board.fifo_free(self.fifo_no) == 0
+        if fifo_full:
+            self.full_events += 1
+        self.max_fill = max(self.max_fill, available)
+
+        count = min(available, self.max_block)
+        out = self._ring[self._slot, :count]
+        self._slot = (self._slot + 1) % len(self._ring)
+        self.board.read_fifo(self.fifo_no, count, out=out)
+
+        block = FifoBlock(data=out, first_index=self.values_read,
+                          timestamp=time.time(), fifo_full=fifo_full)
+        self.blocks += 1
+        self.values_read += count
+        return block
+
+    def blocks_iter(self, timeout: Optional[float] = None) -> Iterator[FifoBlock]:
+        """
+        Iterate over blocks from the running background reader
+
+        Blocks are copied so they stay valid while queued. Iteration ends
+        when the reader is stopped or no block arrives within timeout.
+        """
+        if self._queue is None:
+            self._queue = Queue(maxsize=len(self._ring))
+            self.add_consumer(self._enqueue)
+
+        while self._running or not self._queue.empty():
+            try:
+                yield self._queue.get(timeout=timeout if timeout is not None else 0.1)
+            except Empty:
+                if timeout is not None:
+                    return
+
+    def _enqueue(self, block: FifoBlock):
+        try:
+            self._queue.put_nowait(FifoBlock(block.data.copy(), block.first_index,
+                                             block.timestamp, block.fifo_full))
+        except Full:
+            self.logger.warning("FIFO block queue full, dropping block")
+
+    def start(self):
+        """Start polling in background thread"""
+        if self._running:
+            self.logger.warning("FIFO reader already running")
+            return
+
+        self._running = True
+        self._stop_event.clear()
+        self._thread = Thread(target=self._read_loop, daemon=True)
+        self._thread.start()
+        self.logger.info("Started FIFO reader on DATA_%d", self.fifo_no)
+
+    def stop(self):
+        """Stop background polling"""
+        if not self._running:
+            return
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        self.logger.info("Stopped FIFO reader on DATA_%d", self.fifo_no)
+
+    def _read_loop(self):
+        """Drain FIFO and hand blocks to consumers (runs in background thread)"""
+        while self._running and not self._stop_event.is_set():
+            try:
+                block = self.read()
+                if block is None:
+                    self._stop_event.wait(timeout=self.poll_interval_s)
+                    continue
+                for consumer in self._consumers:
+                    consumer(block)
+                if len(block.data) < self.max_block:
+                    # Drained the FIFO, give the process time to refill it
+                    self._stop_event.wait(timeout=self.poll_interval_s)
+            except Exception as e:
+                self.logger.error("FIFO read error: %s", e, exc_info=True)
+                self._stop_event.wait(timeout=0.1)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get reader statistics"""
+        return {
+            "blocks": self.blocks,
+            "values_read": self.values_read,
+            "full_events": self.full_events,
+            "max_fill": self.max_fill,
+        }
+
+
+class FifoWaveformWriter:
+    """
+    Streams a waveform into an AdWin FIFO for DAC output
+
+    Each poll writes as many values as the FIFO has free space for
+    (Fifo_Empty), capped at max_block, continuing where the previous write
+    stopped. The waveform is preconverted to a contiguous array of the
+    FIFO type once, so writes pass slices of it to the driver without
+    copying. With repeat the waveform is played cyclically.
+    """
+
+    def __init__(self, board, fifo_no: int, waveform: np.ndarray,
+                 dtype: str = "float", repeat: bool = True,
+                 max_block: int = 65536, poll_interval_s: float = 0.001):
+        """
+        Initialize writer
+
+        Args:
+            board: AdWinGoldIII (anything providing fifo_free and write_fifo)
+            fifo_no: Number of the FIFO data array
+            waveform: Values to output
+            dtype: "long" or "float", as declared in the ADbasic process
+            repeat: Play waveform cyclically instead of once
+            max_block: Largest number of values written per poll
+            poll_interval_s: Sleep between polls
+        """
+        if dtype not in FifoStreamReader.DTYPES:
+            raise ValueError(f"Unknown FIFO data type: {dtype}")
+
+        self.logger = logging.getLogger(__name__)
+        self.board = board
+        self.fifo_no = fifo_no
+        self.dtype = dtype
+        self.waveform = np.ascontiguousarray(waveform, dtype=FifoStreamReader.DTYPES[dtype])
+        if self.waveform.ndim != 1 or self.waveform.size == 0:
+            raise ValueError("Waveform must be a non-empty 1D array")
+        self.repeat = repeat
+        self.max_block = max_block
+        self.poll_interval_s = poll_interval_s
+
+        self._position = 0
+        self._running = False
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+
+        # Statistics
+        self.values_written = 0
+        self.underruns = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def finished(self) -> bool:
+        return not self.repeat and self._position >= self.waveform.size
+
+    def write(self) -> int:
+        """
+        Top up the FIFO
+
+        Returns:
+            Number of values written
+        """
+        if self.values_written and self.board.fifo_count(self.fifo_no) == 0:
+            # FIFO ran empty since the last write
+            self.underruns += 1
+
+        budget = min(self.board.fifo_free(self.fifo_no), self.max_block)
+        written = 0
+        while written < budget and not self.finished:
+            count = min(budget - written, self.waveform.size - self._position)
+            self.board.write_fifo(self.fifo_no,
+                                  self.waveform[self._position:self._position + count])
+            self._position += count
+            written += count
+            if self.repeat and self._position >= self.waveform.size:
+                self._position = 0
+
+        self.values_written += written
+        return written
+
+    def start(self):
+        """Start streaming in background thread"""
+        if self._running:
+            self.logger.warning("FIFO writer already running")
+            return
+
+        self._running = True
+        self._stop_event.clear()
+        self._thread = Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+        self.logger.info("Started waveform output on DATA_%d", self.fifo_no)
+
+    def stop(self):
+        """Stop streaming"""
+        if not self._running:
+            return
+
+        self._running = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self._thread = None
+        self.logger.info("Stopped waveform output on DATA_%d", self.fifo_no)
+
+    def _write_loop(self):
+        """Keep FIFO filled (runs in background thread)"""
+        while self._running and not self._stop_event.is_set() and not self.finished:
+            try:
+                self.write()
+            except Exception as e:
+                self.logger.error("FIFO write error: %s", e, exc_info=True)
+                self._stop_event.wait(timeout=0.1)
+                continue
+            self._stop_event.wait(timeout=self.poll_interval_s)
+        self._running = False
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get writer statistics"""
+        return {
+            "values_written": self.values_written,
+            "underruns": self.underruns,
+            "position": self._position,
+        }
@@ -4,26 +4,50 @@ Supports both SDK2 and SDK3 cameras
 """
 import numpy as np
 import logging
-from typing import Optional, Tuple, Dict, Any
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional, Tuple, Dict, Any, List
 from pathlib import Path
 
 from hardware.base import CameraInterface
 
 
+@dataclass
+class Frame:
+    """Frame read during continuous acquisition"""
+    data: np.ndarray  # owned by the caller, never overwritten by the camera
+    index: int
+    timestamp: float
+
+
 class AndorSDK2Camera(CameraInterface):
     """Interface for Andor SDK2 cameras (iXon, iKon, etc.)"""
 
-    def __init__(self, camera_index: int = 0):
+    def __init__(self, camera_index: int = 0, buffer_frames: int = 16,
+                 mock_config: Optional[Dict[str, Any]] = None):
         """
         Initialize Andor SDK2 camera
 
         Args:
             camera_index: Camera index (0 for first camera)
+            buffer_frames: Frames held by the SDK buffer during continuous
+                acquisition
+            mock_config: MockCamera keyword arguments used when the SDK
+                is not available
         """
         self.logger = logging.getLogger(__name__)
         self.camera_index = camera_index
         self._is_acquiring = False
+        self._buffered = False
         self._camera = None
+        self._pylablib = False
+        self._exposure_s = 0.1
+        self._acquisition_mode = "cont"  # "fast_kinetic" in fast kinetics
+        self._fast_kinetics: Optional[Tuple[int, int, int, int, int]] = None  # SDK geometry
+
+        self.buffer_frames = buffer_frames
+        self._frames_read = 0
 
         try:
             # Import Andor SDK - try multiple methods
@@ -32,7 +56,7 @@ class AndorSDK2Camera(CameraInterface):
             self.logger.warning(f"Andor SDK not found: {e}")
             self.logger.info("Using mock camera instead")
             from hardware.mock_devices import MockCamera
-            self._camera = MockCamera()
+            self._camera = MockCamera(**(mock_config or {}))
 
     def _initialize_sdk(self):
         """Initialize the Andor SDK"""
@@ -40,6 +64,7 @@ class AndorSDK2Camera(CameraInterface):
             # Try pylablib first (recommended)
             from pylablib.devices import Andor
             self._camera = Andor.AndorSDK2Camera(idx=self.camera_index)
+            self._pylablib = True
             self.logger.info("Initialized Andor camera via pylablib")
         except ImportError:
             # Fall back to direct SDK wrapper
@@ -84,14 +109,26 @@ class AndorSDK2Camera(CameraInterface):
             self.logger.info("Disconnected from camera")
 
     def start_acquisition(self) -> bool:
-        """Start continuous acquisition"""
+        """
+        Start continuous acquisition
+
+        With pylablib the camera runs in continuous mode with a circular SDK
+        buffer of `buffer_frames` frames, and frames are read from it
+        instead of snapping one frame at a time.
+        """
         try:
+            self._buffered = hasattr(self._camera, 'read_newest_image')
+            if self._buffered and hasattr(self._camera, 'setup_acquisition'):
+                self._camera.setup_acquisition(mode=self._acquisition_mode,
+                                               nframes=self.buffer_frames)
             if hasattr(self._camera, 'start_acquisition'):
                 self._camera.start_acquisition()
+            self._frames_read = 0
             self._is_acquiring = True
             self.logger.info("Started acquisition")
             return True
         except Exception as e:
+            self._buffered = False
             self.logger.error(f"Failed to start acquisition: {e}")
             return False
 
@@ -101,15 +138,85 @@ class AndorSDK2Camera(CameraInterface):
             if hasattr(self._camera, 'stop_acquisition'):
                 self._camera.stop_acquisition()
             self._is_acquiring = False
+            self._buffered = False
             self.logger.info("Stopped acquisition")
 
+    def _frame_timeout(self) -> float:
+        """Time to wait for the next frame in continuous mode"""
+        return 2 * self._exposure_s + 1.0
+
+    def _make_frame(self, image: np.ndarray, info=None) -> Frame:
+        """
+        Wrap an image read by pylablib
+
+        pylablib reads every frame into a new array, so the image is handed
+        out as is: copying it into a ring of preallocated slots would add a
+        copy without saving the allocation, and a slot would be overwritten
+        while a consumer (e.g. the GUI) may still hold it.
+        """
+        index = getattr(info, 'frame_index', None)
+        if index is None:
+            index = self._frames_read
+        self._frames_read += 1
+        return Frame(image, int(index), time.time())
+
+    def acquire_frame(self) -> Optional[Frame]:
+        """
+        Wait for and return the newest frame of a continuous acquisition
+
+        Returns:
+            Frame, or None if failed or not acquiring in buffered mode
+        """
+        if not (self._is_acquiring and self._buffered):
+            return None
+
+        try:
+            self._camera.wait_for_frame(timeout=self._frame_timeout())
+            image, info = self._camera.read_newest_image(return_info=True)
+            if image is None:
+                return None
+            return self._make_frame(image, info)
+        except Exception as e:
+            self.logger.error("Failed to read frame: %s", e)
+            return None
+
+    def read_frames(self) -> List[Frame]:
+        """
+        Read all frames acquired since the last read
+
+        Used for kinetic series where every frame matters. At most
+        `buffer_frames` frames are returned; older ones are dropped.
+
+        Returns:
+            List of Frames, oldest first
+        """
+        if not (self._is_acquiring and self._buffered):
+            return []
+
+        try:
+            images, infos = self._camera.read_multiple_images(return_info=True)
+            images = images[-self.buffer_frames:]
+            infos = infos[-self.buffer_frames:]
+            return [self._make_frame(image, info)
+                    for image, info in zip(images, infos)]
+        except Exception as e:
+            self.logger.error("Failed to read frames: %s", e)
+            return []
+
     def acquire_image(self) -> Optional[np.ndarray]:
         """
         Acquire single image from camera
 
+        During buffered continuous acquisition this returns the newest frame
+        read from the SDK buffer.
+
         Returns:
             numpy array with image data, or None if failed
         """
+        if self._is_acquiring and self._buffered:
+            frame = self.acquire_frame()
+            return frame.data if frame is not None else None
+
         try:
             if hasattr(self._camera, 'snap'):
                 image = self._camera.snap()
@@ -122,7 +229,7 @@ class AndorSDK2Camera(CameraInterface):
             return image
 
         except Exception as e:
-            self.logger.error(f"Failed to acquire image: {e}")
+            self.logger.error("Failed to acquire image: %s", e)
             return None
 
     def set_exposure(self, exposure_ms: float):
@@ -130,6 +237,11 @@ class AndorSDK2Camera(CameraInterface):
         try:
             if hasattr(self._camera, 'set_exposure'):
                 self._camera.set_exposure(exposure_ms / 1000.0)  # Convert to seconds
+            self._exposure_s = exposure_ms / 1000.0
+            if self._pylablib and self._fast_kinetics is not None:
+                # Fast kinetics takes its exposure from SetFastKineticsEx
+                with self._acquisition_stopped():
+                    self._apply_fast_kinetics()
             self.logger.info(f"Set exposure to {exposure_ms} ms")
         except Exception as e:
             self.logger.error(f"Failed to set exposure: {e}")
@@ -162,6 +274,172 @@ class AndorSDK2Camera(CameraInterface):
             self.logger.error(f"Failed to get temperature: {e}")
             return -999.0
 
+    @contextmanager
+    def _acquisition_stopped(self):
+        """Readout geometry can only change while the camera is idle"""
+        restart = self._is_acquiring
+        if restart:
+            self.stop_acquisition()
+        try:
+            yield
+        finally:
+            if restart:
+                self.start_acquisition()
+
+    def _require_pylablib(self, feature: str):
+        """Raise if `feature` is unavailable (direct SDK path; pylablib and mock have it)"""
+        if not self._pylablib and self._camera is None:
+            raise NotImplementedError(
+                f"{type(self).__name__} supports {feature} only through pylablib")
+
+    def _sdk_call(self, name: str, *args):
+        """
+        Call an SDK2 function that pylablib does not wrap (pylablib only)
+
+        SDK2 functions act on the currently selected camera, so this camera
+        is selected first, as pylablib's own methods do.
+        """
+        from pylablib.devices.Andor import atmcd32d_lib
+        self._camera._select_camera()
+        return getattr(atmcd32d_lib.wlib, name)(*args)
+
+    def _check_frame_shape(self, rows: int, cols: int, feature: str):
+        """Make sure pylablib reads frames of the shape the SDK delivers"""
+        shape = tuple(self._camera.get_data_dimensions())
+        if shape != (rows, cols):
+            raise RuntimeError(f"{feature}: pylablib expects {shape[0]}x{shape[1]} frames, "
+                               f"the camera reads out {rows}x{cols}")
+
+    def _apply_fast_kinetics(self):
+        """
+        SetFastKineticsEx with the stored geometry and the current exposure
+
+        Every frame of the series is one `height` row sub-frame. pylablib
+        sizes its frames from the image ROI, so the ROI is set to one
+        sub-frame first (SetImage) and SetFastKineticsEx applied last.
+        """
+        height, n_frames, offset, hbin, vbin = self._fast_kinetics
+        sensor_width = self._camera.get_detector_size()[0]
+        self._camera.set_roi(0, sensor_width, offset, offset + height, hbin, vbin)
+        image_read_mode = 4
+        self._sdk_call("SetFastKineticsEx", height, n_frames, self._exposure_s,
+                       image_read_mode, hbin, vbin, offset)
+        self._check_frame_shape(height // vbin, sensor_width // hbin, "Fast kinetics")
+
+    def set_roi(self, hstart: int = 0, hend: Optional[int] = None, vstart: int = 0,
+                vend: Optional[int] = None, hbin: int = 1, vbin: int = 1):
+        """
+        Set the readout ROI and binning
+
+        Reading out fewer (binned) rows is what raises the frame rate.
+
+        Args:
+            hstart, hend: Column range (unbinned, end exclusive, None = full)
+            vstart, vend: Row range (unbinned, end exclusive, None = full)
+            hbin, vbin: Horizontal and vertical binning
+        """
+        try:
+            with self._acquisition_stopped():
+                self._camera.set_roi(hstart, hend, vstart, vend, hbin, vbin)
+            self.logger.debug("Set ROI to %s:%s, %s:%s, binning %dx%d",
+                              hstart, hend, vstart, vend, hbin, vbin)
+        except Exception as e:
+            self.logger.error("Failed to set ROI: %s", e)
+            raise
+
+    def get_roi(self) -> Tuple[int, int, int, int, int, int]:
+        """Get (hstart, hend, vstart, vend, hbin, vbin)"""
+        return tuple(self._camera.get_roi())
+
+    def set_crop_mode(self, enabled: bool = True, width: Optional[int] = None,
+                      height: Optional[int] = None, hbin: int = 1, vbin: int = 1):
+        """
+        Enable or disable iXon isolated crop mode
+
+        Only a width x height area next to the readout register is read
+        out, which gives much higher frame rates than an ROI of the same
+        size (the rest of the sensor is not shifted out). pylablib has no
+        crop mode, so SetIsolatedCropMode is called directly and the image
+        ROI set to the crop area, which keeps pylablib's frame shape right.
+
+        Experimental: relies on pylablib internals and is not yet verified
+        on an iXon; the app only enables it with camera.readout.experimental.
+
+        Raises:
+            NotImplementedError: On the direct SDK path (no pylablib)
+            RuntimeError: If pylablib's frame shape does not match the crop
+        """
+        self._require_pylablib("crop mode")
+        try:
+            with self._acquisition_stopped():
+                if not self._pylablib:
+                    self._camera.set_crop_mode(enabled, width, height, hbin, vbin)
+                elif enabled:
+                    sensor_width, sensor_height = self._camera.get_detector_size()
+                    width, height = width or sensor_width, height or sensor_height
+                    self._sdk_call("SetIsolatedCropMode", 1, height, width, vbin, hbin)
+                    self._camera.set_roi(0, width, 0, height, hbin, vbin)
+                    self._check_frame_shape(height // vbin, width // hbin, "Crop mode")
+                else:
+                    sensor_width, sensor_height = self._camera.get_detector_size()
+                    self._sdk_call("SetIsolatedCropMode", 0, sensor_height, sensor_width, 1, 1)
+                    self._camera.set_roi()
+            if enabled:
+                self.logger.info("Crop mode enabled (%sx%s)", width, height)
+            else:
+                self.logger.info("Crop mode disabled")
+        except Exception as e:
+            self.logger.error("Failed to set crop mode: %s", e)
+            raise
+
+    def set_fast_kinetics(self, enabled: bool = True, height: Optional[int] = None,
+                          n_frames: int = 1, offset: int = 0, hbin: int = 1, vbin: int = 1):
+        """
+        Enable or disable fast kinetics
+
+        `height` rows starting at `offset` are exposed and shifted under the
+        masked part of the sensor `n_frames` times before one readout. With
+        pylablib the acquisition mode becomes "fast_kinetic" (also for the
+        next start_acquisition) with `n_frames` per series, and the
+        geometry, which pylablib does not expose, is set by
+        SetFastKineticsEx in image read mode. Each frame is one sub-frame
+        of height / vbin rows.
+
+        Experimental: relies on pylablib internals and is not yet verified
+        on an iXon; the app only enables it with camera.readout.experimental.
+
+        Raises:
+            NotImplementedError: On the direct SDK path (no pylablib)
+            RuntimeError: If pylablib's frame shape does not match a sub-frame
+        """
+        self._require_pylablib("fast kinetics")
+        try:
+            with self._acquisition_stopped():
+                if not self._pylablib:
+                    self._camera.set_fast_kinetics(enabled, height, n_frames, offset,
+                                                   hbin, vbin)
+                elif enabled:
+                    height = height or self._camera.get_detector_size()[1] // max(n_frames, 1)
+                    self._camera.set_acquisition_mode("fast_kinetic")
+                    self._camera.setup_fast_kinetic_mode(n_frames)
+                    self._fast_kinetics = (height, n_frames, offset, hbin, vbin)
+                    self._apply_fast_kinetics()
+                    self._acquisition_mode = "fast_kinetic"
+                else:
+                    self._camera.set_acquisition_mode("cont")
+                    self._camera.set_roi()
+                    self._acquisition_mode = "cont"
+                    self._fast_kinetics = None
+            if enabled:
+                self.logger.info("Fast kinetics enabled (%s x %s rows)", n_frames, height)
+            else:
+                self.logger.info("Fast kinetics disabled")
+        except Exception as e:
+            self._fast_kinetics = None
+            self._acquisition_mode = "cont"
+            self.logger.error("Failed to set fast kinetics: %s", e)
+            raise
+
     def get_info(self) -> Dict[str, Any]:
         """Get camera information"""
         return {
@@ -2,8 +2,9 @@
 Abstract Hardware Interfaces
 """
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 import numpy as np
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 
 class CameraInterface(ABC):
@@ -31,7 +32,12 @@ class CameraInterface(ABC):
 
     @abstractmethod
     def acquire_image(self) -> Optional[np.ndarray]:
-        """Acquire single image"""
+        """
+        Acquire single image
+
+        Returns a new array on every call; callers may keep it, the camera
+        does not write to it again.
+        """
         pass
 
     @abstractmethod
@@ -49,6 +55,29 @@ class CameraInterface(ABC):
         """Get camera information"""
         pass
 
+    # Readout geometry. Pixel ranges are unbinned sensor pixels with
+    # exclusive ends; cameras without hardware support raise
+    # NotImplementedError.
+
+    def set_roi(self, hstart: int = 0, hend: Optional[int] = None, vstart: int = 0,
+                vend: Optional[int] = None, hbin: int = 1, vbin: int = 1):
+        """Read out only columns hstart..hend and rows vstart..vend, binned"""
+        raise NotImplementedError(f"{type(self).__name__} does not support a hardware ROI")
+
+    def get_roi(self) -> Tuple[int, int, int, int, int, int]:
+        """Get (hstart, hend, vstart, vend, hbin, vbin)"""
+        raise NotImplementedError(f"{type(self).__name__} does not support a hardware ROI")
+
+    def set_crop_mode(self, enabled: bool = True, width: Optional[int] = None,
+                      height: Optional[int] = None, hbin: int = 1, vbin: int = 1):
+        """Isolated crop mode: read out only a width x height corner of the sensor"""
+        raise NotImplementedError(f"{type(self).__name__} does not support crop mode")
+
+    def set_fast_kinetics(self, enabled: bool = True, height: Optional[int] = None,
+                          n_frames: int = 1, offset: int = 0, hbin: int = 1, vbin: int = 1):
+        """Fast kinetics: expose `height` rows from `offset`, shift n_frames sub-frames"""
+        raise NotImplementedError(f"{type(self).__name__} does not support fast kinetics")
+
 
 class ControlBoardInterface(ABC):
     """Abstract interface for control boards"""
@@ -82,3 +111,15 @@ class ControlBoardInterface(ABC):
     def download_array(self, array_no: int, length: int) -> np.ndarray:
         """Download data array"""
         pass
+
+    # Per-tick I/O. Boards without coalescing write immediately; boards
+    # without block reads raise NotImplementedError.
+
+    @contextmanager
+    def batch(self):
+        """Coalesce the parameter writes issued inside the block"""
+        yield self
+
+    def read_inputs(self, channels) -> np.ndarray:
+        """Read several analog input channels in one transfer"""
+        raise NotImplementedError(f"{type(self).__name__} does not support block input reads")
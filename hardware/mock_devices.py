@@ -3,15 +3,53 @@ Mock Hardware Devices for Testing
 """
 import numpy as np
 import logging
-from typing import Dict, Any
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from hardware.base import CameraInterface, ControlBoardInterface
 
 
 class MockCamera(CameraInterface):
-    """Mock camera for testing without hardware"""
-
-    def __init__(self):
+    """
+    Mock camera for testing without hardware
+
+    Frames are synthesized from precomputed parts so the mock is faster
+    than any real camera: a bank of Poisson noise frames (slightly larger
+    than the sensor) is generated once, and each frame is a window of a
+    bank frame at a random offset. Gaussian spots are added only over a
+    local window around each spot, from a bank of uint16 spot templates
+    shifted by 1/subpixel_steps pixel steps in x and y; the template
+    nearest to the subpixel position is used. Spot brightness scales with
+    exposure (relative to 100 ms) and gain, templates are rebuilt when it
+    changes. With `fps` set, acquire_image paces frames to that rate.
+
+    Hardware ROI, binning, crop mode and fast kinetics are emulated: only
+    the read-out window is synthesized and then binned (summed, saturating
+    at 65535), and with `fps` set the frame interval shrinks with the
+    number of binned rows read out, the dominant readout cost of an EMCCD.
+    `positions` stays in full-sensor coordinates.
+    """
+
+    NOISE_MARGIN = 32  # extra noise pixels per axis for random offsets
+
+    def __init__(self, width: int = 512, height: int = 512, n_spots: int = 1,
+                 spot_sigma: float = 20.0, spot_amplitude: float = 3000.0,
+                 background: float = 100.0, fps: float = 0.0, noise_frames: int = 16,
+                 subpixel_steps: int = 8, seed: int = 0):
+        """
+        Initialize mock camera
+
+        Args:
+            width, height: Frame size in pixels
+            n_spots: Number of moving Gaussian spots
+            spot_sigma: Spot width in pixels
+            spot_amplitude: Spot peak counts at 100 ms exposure and gain 1
+            background: Mean Poisson background counts
+            fps: Frame rate pacing (0 returns frames as fast as possible)
+            noise_frames: Number of pregenerated noise frames
+            subpixel_steps: Template phases per pixel for subpixel shifts
+            seed: Random seed for noise, spot positions and offsets
+        """
         self.logger = logging.getLogger(__name__)
         self.connected = False
         self.acquiring = False
@@ -20,6 +58,49 @@ class MockCamera(CameraInterface):
         self.temperature = -70.0
         self.frame_count = 0
 
+        self.width = width
+        self.height = height
+        self.n_spots = n_spots
+        self.spot_amplitude = spot_amplitude
+        self.fps = fps
+        self._next_frame_time = 0.0
+        self._rng = np.random.default_rng(seed)
+
+        margin = self.NOISE_MARGIN
+        self._noise = self._rng.poisson(
+            background, (noise_frames, height + margin, width + margin)
+        ).astype(np.uint16)
+
+        # Spot motion: the first spot circles the frame centre as before,
+        # further spots start at random positions with random phases
+        # (no spots: background-only frames)
+        self._centers = np.empty((n_spots, 2))
+        self._phases = np.zeros(n_spots)
+        if n_spots:
+            self._centers[0] = (width / 2, height / 2)
+            self._centers[1:] = self._rng.uniform((0.2 * width, 0.2 * height),
+                                                  (0.8 * width, 0.8 * height), (n_spots - 1, 2))
+            self._phases[1:] = self._rng.uniform(0, 2 * np.pi, n_spots - 1)
+        self._motion = np.array([min(50.0, 0.1 * width), min(30.0, 0.1 * height)])
+        self.positions = self._centers.copy()  # (x, y) of the spots in the last frame
+
+        # 1-D spot profiles for the subpixel shifts; 2-D templates are
+        # built from them for the current brightness
+        self._radius = int(np.ceil(4 * spot_sigma))
+        self._subpixel_steps = subpixel_steps
+        offsets = np.arange(-self._radius, self._radius + 1)
+        shifts = np.arange(subpixel_steps) / subpixel_steps
+        self._profiles = np.exp(-(offsets[None, :] - shifts[:, None]) ** 2
+                                / (2 * spot_sigma ** 2))
+        self._noise_max = int(self._noise.max())
+        self._templates: Optional[np.ndarray] = None
+        self._template_amplitude: Optional[float] = None
+
+        # Readout geometry (hstart, hend, vstart, vend, hbin, vbin)
+        self._roi = (0, width, 0, height, 1, 1)
+        self.readout_mode = "image"  # image | crop | fast_kinetics
+        self.fast_kinetics_frames = 1
+
     def connect(self) -> bool:
         self.connected = True
         self.logger.info("Mock camera connected")
@@ -34,6 +115,7 @@ class MockCamera(CameraInterface):
         if not self.connected:
             return False
         self.acquiring = True
+        self._next_frame_time = 0.0
         self.logger.info("Mock camera acquisition started")
         return True
 
@@ -41,34 +123,130 @@ class MockCamera(CameraInterface):
         self.acquiring = False
         self.logger.info("Mock camera acquisition stopped")
 
+    def _spot_templates(self, amplitude: float) -> np.ndarray:
+        """(steps, steps, n, n) uint16 spot templates for a peak amplitude"""
+        if amplitude != self._template_amplitude:
+            profiles = self._profiles
+            templates = amplitude * (profiles[:, None, :, None] * profiles[None, :, None, :])
+            self._templates = np.rint(np.minimum(templates, 65535)).astype(np.uint16)
+            self._template_amplitude = amplitude
+        return self._templates
+
+    def _add_spot(self, image: np.ndarray, x: float, y: float, amplitude: float):
+        """Add a spot centred at (x, y), clipping at the frame border and 65535"""
+        steps = self._subpixel_steps
+        ix, fx = divmod(int(round(x * steps)), steps)
+        iy, fy = divmod(int(round(y * steps)), steps)
+        r = self._radius
+        x0, x1 = max(ix - r, 0), min(ix + r + 1, image.shape[1])
+        y0, y1 = max(iy - r, 0), min(iy + r + 1, image.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        spot = self._spot_templates(amplitude)[fy, fx,
+                                               y0 - iy + r:y1 - iy + r,
+                                               x0 - ix + r:x1 - ix + r]
+        window = image[y0:y1, x0:x1]
+        if amplitude + self._noise_max < 65535:
+            window += spot
+        else:
+            # Saturating add (uint16 addition would wrap around)
+            window[...] = np.minimum(window.astype(np.uint32) + spot, 65535)
+
+    def _pace(self):
+        """Wait until the next frame is due"""
+        now = time.perf_counter()
+        if self._next_frame_time <= now:
+            # Late (or first frame): restart pacing from now
+            self._next_frame_time = now
+        else:
+            time.sleep(self._next_frame_time - now)
+        hstart, hend, vstart, vend, hbin, vbin = self._roi
+        self._next_frame_time += (vend - vstart) // vbin / (self.height * self.fps)
+
     def acquire_image(self) -> np.ndarray:
         """Generate synthetic image with Gaussian spots"""
+        if self.fps > 0:
+            self._pace()
         self.frame_count += 1
 
-        # Create image with noise
-        image = np.random.poisson(100, (512, 512)).astype(np.uint16)
-
-        # Add Gaussian spot that moves slightly
-        y, x = np.ogrid[:512, :512]
-        center_x = 256 + 50 * np.sin(self.frame_count * 0.1)
-        center_y = 256 + 30 * np.cos(self.frame_count * 0.1)
-
-        spot = np.exp(-((x - center_x)**2 + (y - center_y)**2) / (2 * 20**2))
-        image = image + (spot * 3000 * self.gain).astype(np.uint16)
-
-        return np.clip(image, 0, 65535)
+        # Noise: random window of a random bank frame
+        hstart, hend, vstart, vend, hbin, vbin = self._roi
+        bank = self._rng.integers(self._noise.shape[0])
+        dy, dx = self._rng.integers(self.NOISE_MARGIN + 1, size=2)
+        image = self._noise[bank, dy + vstart:dy + vend, dx + hstart:dx + hend].copy()
+
+        angle = self.frame_count * 0.1 + self._phases
+        self.positions[:, 0] = self._centers[:, 0] + self._motion[0] * np.sin(angle)
+        self.positions[:, 1] = self._centers[:, 1] + self._motion[1] * np.cos(angle)
+
+        amplitude = self.spot_amplitude * self.gain * self.exposure / 100.0
+        for x, y in self.positions:
+            self._add_spot(image, x - hstart, y - vstart, amplitude)
+        if hbin > 1 or vbin > 1:
+            height, width = image.shape
+            binned = image.reshape(height // vbin, vbin, width // hbin, hbin).sum(
+                axis=(1, 3), dtype=np.uint32)
+            image = np.minimum(binned, 65535).astype(np.uint16)
+        return image
+
+    def _readout_window(self, hstart: int, hend: Optional[int], vstart: int,
+                        vend: Optional[int], hbin: int, vbin: int) -> Tuple[int, ...]:
+        """Validate a readout window and trim it to whole bins"""
+        hend = self.width if hend is None else hend
+        vend = self.height if vend is None else vend
+        if hbin < 1 or vbin < 1:
+            raise ValueError(f"Invalid binning {hbin}x{vbin}")
+        if not (0 <= hstart < hend <= self.width and 0 <= vstart < vend <= self.height):
+            raise ValueError(f"ROI {hstart}:{hend}, {vstart}:{vend} outside the "
+                             f"{self.width}x{self.height} sensor")
+        hend = hstart + (hend - hstart) // hbin * hbin
+        vend = vstart + (vend - vstart) // vbin * vbin
+        if hend <= hstart or vend <= vstart:
+            raise ValueError(f"ROI smaller than one {hbin}x{vbin} bin")
+        return hstart, hend, vstart, vend, hbin, vbin
+
+    def set_roi(self, hstart: int = 0, hend: Optional[int] = None, vstart: int = 0,
+                vend: Optional[int] = None, hbin: int = 1, vbin: int = 1):
+        self._roi = self._readout_window(hstart, hend, vstart, vend, hbin, vbin)
+        self.readout_mode = "image"
+        self.logger.debug("Mock camera ROI set to %s", self._roi)
+
+    def get_roi(self) -> Tuple[int, int, int, int, int, int]:
+        return self._roi
+
+    def set_crop_mode(self, enabled: bool = True, width: Optional[int] = None,
+                      height: Optional[int] = None, hbin: int = 1, vbin: int = 1):
+        if not enabled:
+            self.set_roi()
+            return
+        self._roi = self._readout_window(0, width, 0, height, hbin, vbin)
+        self.readout_mode = "crop"
+        self.logger.debug("Mock camera crop mode %s", self._roi)
+
+    def set_fast_kinetics(self, enabled: bool = True, height: Optional[int] = None,
+                          n_frames: int = 1, offset: int = 0, hbin: int = 1, vbin: int = 1):
+        # Each acquire_image returns one exposed sub-area of the series
+        if not enabled:
+            self.set_roi()
+            return
+        rows = self.height - offset if height is None else height
+        self._roi = self._readout_window(0, None, offset, offset + rows, hbin, vbin)
+        self.readout_mode = "fast_kinetics"
+        self.fast_kinetics_frames = n_frames
+        self.logger.debug("Mock camera fast kinetics %s, %d frames", self._roi, n_frames)
 
     def set_exposure(self, exposure_ms: float):
         self.exposure = exposure_ms
-        self.logger.debug(f"Mock camera exposure set to {exposure_ms} ms")
+        self.logger.debug("Mock camera exposure set to %s ms", exposure_ms)
 
     def set_gain(self, gain: int):
         self.gain = gain
-        self.logger.debug(f"Mock camera gain set to {gain}")
+        self.logger.debug("Mock camera gain set to %s", gain)
 
     def set_temperature(self, temp_celsius: int):
         self.temperature = temp_celsius
-        self.logger.debug(f"Mock camera temperature setpoint: {temp_celsius}°C")
+        self.logger.debug("Mock camera temperature setpoint: %s°C", temp_celsius)
 
     def get_temperature(self) -> float:
         # Simulate slow cooling
@@ -78,6 +256,11 @@ class MockCamera(CameraInterface):
         return {
             "model": "Mock Camera",
             "index": 0,
+            "width": self.width,
+            "height": self.height,
+            "n_spots": self.n_spots,
+            "roi": self._roi,
+            "readout_mode": self.readout_mode,
             "status": "connected" if self.connected else "disconnected"
         }
 
@@ -90,6 +273,8 @@ class MockAdWin(ControlBoardInterface):
         self.connected = False
         self.parameters = {}
         self.arrays = {}
+        self.running_processes = set()
+        self.processdelays = {}
 
     def connect(self) -> bool:
         self.connected = True
@@ -110,14 +295,25 @@ class MockAdWin(ControlBoardInterface):
         self.logger.info(f"Mock: Loaded process {filename}")
 
     def Start_Process(self, process_no: int):
+        self.running_processes.add(process_no)
         self.logger.info(f"Mock: Started process {process_no}")
 
     def Stop_Process(self, process_no: int):
+        self.running_processes.discard(process_no)
         self.logger.info(f"Mock: Stopped process {process_no}")
 
+    def Process_Status(self, process_no: int) -> int:
+        return 1 if process_no in self.running_processes else 0
+
+    def Set_Processdelay(self, process_no: int, processdelay: int):
+        self.processdelays[process_no] = processdelay
+
+    def Get_Processdelay(self, process_no: int) -> int:
+        return self.processdelays.get(process_no, 1000)
+
     def set_parameter(self, param_no: int, value: float):
         self.parameters[param_no] = value
-        self.logger.debug(f"Mock AdWin: FPar[{param_no}] = {value}")
+        self.logger.debug("Mock AdWin: FPar[%d] = %s", param_no, value)
 
     def get_parameter(self, param_no: int) -> float:
         return self.parameters.get(param_no, 0.0)
@@ -128,21 +324,43 @@ class MockAdWin(ControlBoardInterface):
     def Get_FPar(self, param_no: int) -> float:
         return self.get_parameter(param_no)
 
+    def Get_FPar_Block(self, start: int, count: int) -> np.ndarray:
+        return np.array([self.get_parameter(i) for i in range(start, start + count)],
+                        dtype=np.float32)
+
+    def Get_FPar_All(self) -> np.ndarray:
+        return self.Get_FPar_Block(1, 80)
+
+    def Get_Par_All(self) -> np.ndarray:
+        return np.zeros(80, dtype=np.int32)
+
     def upload_array(self, array_no: int, data: np.ndarray):
         self.arrays[array_no] = data.copy()
-        self.logger.debug(f"Mock AdWin: Uploaded {len(data)} values to array {array_no}")
+        self.logger.debug("Mock AdWin: Uploaded %d values to array %d", len(data), array_no)
 
     def download_array(self, array_no: int, length: int) -> np.ndarray:
         if array_no in self.arrays:
             return self.arrays[array_no][:length]
         return np.zeros(length)
 
-    def SetData_Float(self, array_no: int, data: np.ndarray, start: int, count: int):
+    def SetData_Float(self, data: np.ndarray, array_no: int, start: int, count: int):
         self.upload_array(array_no, data)
 
-    def GetData_Float(self, array_no: int, data: np.ndarray, start: int, count: int):
+    def GetData_Float(self, array_no: int, start: int, count: int, out=None):
+        if out is None:
+            out = np.zeros(count, dtype=np.float32)
+        if array_no in self.arrays:
+            values = self.arrays[array_no][start - 1:start - 1 + count]
+            out[:len(values)] = values
+        return out
+
+    def GetData_Long(self, array_no: int, start: int, count: int, out=None):
+        if out is None:
+            out = np.zeros(count, dtype=np.int32)
         if array_no in self.arrays:
-            data[:] = self.arrays[array_no][:count]
+            values = self.arrays[array_no][start - 1:start - 1 + count]
+            out[:len(values)] = values
+        return out
 
-    def SetData_Long(self, array_no: int, data: np.ndarray, start: int, count: int):
+    def SetData_Long(self, data: np.ndarray, array_no: int, start: int, count: int):
         self.upload_array(array_no, data)
@@ -0,0 +1,255 @@
+"""
+Replay Camera
+Streams recorded frame stacks from disk through the camera interface
+"""
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from hardware.base import CameraInterface
+
+
+class ReplayCamera(CameraInterface):
+    """
+    Camera that replays a recorded (n_frames, height, width) stack
+
+    Supported files:
+        .npy          - memory mapped with np.load(mmap_mode="r")
+        .raw / .bin   - headerless (or fixed-size header) frames, memory
+                        mapped with np.memmap; width, height and dtype
+                        must be given
+        .h5 / .hdf5   - dataset `dataset` (requires h5py); contiguous
+                        uncompressed datasets are memory mapped directly,
+                        chunked or compressed ones are read frame by frame
+
+    Only the frames that are replayed are read from disk, so stacks larger
+    than RAM can be used. Frames are paced by the recorded timestamps
+    (scaled by `speed`) if available, otherwise by `fps` (0 = as fast as
+    possible). Timestamps in seconds come from the `timestamps` file
+    (.npy), the HDF5 dataset "<dataset>_timestamps" / "timestamps", or a
+    "<name>_timestamps.npy" file next to the stack. At the end of the
+    stack the replay starts over if `loop` is set, otherwise
+    acquire_image returns None.
+    """
+
+    RAW_SUFFIXES = (".raw", ".bin", ".dat")
+    HDF5_SUFFIXES = (".h5", ".hdf5", ".hdf")
+
+    def __init__(self, path: str, fps: float = 0.0, loop: bool = True,
+                 use_timestamps: bool = True, speed: float = 1.0,
+                 timestamps: Optional[str] = None, width: Optional[int] = None,
+                 height: Optional[int] = None, dtype: str = "uint16",
+                 header_bytes: int = 0, dataset: str = "frames"):
+        """
+        Initialize replay camera
+
+        Args:
+            path: Frame stack file (.npy, raw or HDF5)
+            fps: Replay rate when not using timestamps (0 = unpaced)
+            loop: Start over at the end of the stack
+            use_timestamps: Pace by recorded timestamps if available
+            speed: Replay speed factor for timestamp pacing
+            timestamps: Optional .npy file with one timestamp per frame
+            width, height, dtype, header_bytes: Layout of raw files
+            dataset: Frame dataset name in HDF5 files
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.fps = fps
+        self.loop = loop
+        self.use_timestamps = use_timestamps
+        self.speed = speed
+        self.timestamps_path = timestamps
+        self.width = width
+        self.height = height
+        self.dtype = np.dtype(dtype)
+        self.header_bytes = header_bytes
+        self.dataset = dataset
+
+        self.connected = False
+        self.acquiring = False
+        self.exposure = 100.0
+        self.gain = 1
+        self.temperature = -70.0
+
+        self._frames = None  # np.memmap or h5py dataset
+        self._h5file = None
+        self._timestamps: Optional[np.ndarray] = None
+        self._position = 0
+        self._start_time = 0.0
+        self._start_position = 0
+        self.frame_count = 0
+        self.loops = 0
+
+    @property
+    def n_frames(self) -> int:
+        return 0 if self._frames is None else len(self._frames)
+
+    def connect(self) -> bool:
+        """Open (memory map) the frame stack"""
+        try:
+            suffix = self.path.suffix.lower()
+            if suffix == ".npy":
+                self._frames = np.load(self.path, mmap_mode="r")
+            elif suffix in self.RAW_SUFFIXES:
+                self._frames = self._map_raw()
+            elif suffix in self.HDF5_SUFFIXES:
+                self._frames = self._open_hdf5()
+            else:
+                raise ValueError(f"Unsupported replay file type: {suffix}")
+
+            if self._frames.ndim != 3:
+                raise ValueError(f"Expected (frames, height, width), got shape "
+                                 f"{self._frames.shape}")
+            if self._timestamps is None:
+                self._timestamps = self._load_timestamps()
+
+            self._position = 0
+            self.connected = True
+            self.logger.info("Replay camera opened %s (%d frames of %s, %s)", self.path,
+                             self.n_frames, self._frames.shape[1:],
+                             "timestamps" if self._timestamps is not None else "no timestamps")
+            return True
+        except Exception as e:
+            self.logger.error("Failed to open replay file %s: %s", self.path, e)
+            self._close()
+            return False
+
+    def _map_raw(self) -> np.memmap:
+        if not (self.width and self.height):
+            raise ValueError("Raw replay files need width and height")
+        frame_bytes = self.width * self.height * self.dtype.itemsize
+        n_frames = (self.path.stat().st_size - self.header_bytes) // frame_bytes
+        return np.memmap(self.path, dtype=self.dtype, mode="r", offset=self.header_bytes,
+                         shape=(n_frames, self.height, self.width))
+
+    def _open_hdf5(self):
+        try:
+            import h5py
+        except ImportError:
+            raise ImportError("h5py is required to replay HDF5 files")
+
+        self._h5file = h5py.File(self.path, "r")
+        dataset = self._h5file[self.dataset]
+        for name in (f"{self.dataset}_timestamps", "timestamps"):
+            if name in self._h5file:
+                self._timestamps = np.asarray(self._h5file[name], dtype=np.float64)
+                break
+
+        # Contiguous, unfiltered data can be mapped like a raw file
+        offset = dataset.id.get_offset()
+        if dataset.chunks is None and offset is not None:
+            return np.memmap(self.path, dtype=dataset.dtype, mode="r", offset=offset,
+                             shape=dataset.shape)
+        return dataset
+
+    def _load_timestamps(self) -> Optional[np.ndarray]:
+        candidates = [Path(self.timestamps_path)] if self.timestamps_path else \
+            [self.path.with_name(f"{self.path.stem}_timestamps.npy")]
+        for candidate in candidates:
+            if candidate.exists():
+                timestamps = np.load(candidate).astype(np.float64).reshape(-1)
+                if timestamps.size < self.n_frames:
+                    self.logger.warning("Ignoring %s: %d timestamps for %d frames",
+                                        candidate, timestamps.size, self.n_frames)
+                    return None
+                return timestamps
+        return None
+
+    def _close(self):
+        self._frames = None
+        self._timestamps = None
+        if self._h5file is not None:
+            self._h5file.close()
+            self._h5file = None
+
+    def disconnect(self):
+        self.acquiring = False
+        self._close()
+        self.connected = False
+        self.logger.info("Replay camera disconnected")
+
+    def start_acquisition(self) -> bool:
+        if not self.connected:
+            return False
+        self.acquiring = True
+        self._restart_clock()
+        self.logger.info("Replay camera acquisition started")
+        return True
+
+    def stop_acquisition(self):
+        self.acquiring = False
+        self.logger.info("Replay camera acquisition stopped")
+
+    def _restart_clock(self):
+        self._start_time = time.perf_counter()
+        self._start_position = self._position
+
+    def _due_time(self) -> Optional[float]:
+        """Wall-clock time at which the current frame is due (None = now)"""
+        if self.use_timestamps and self._timestamps is not None:
+            elapsed = self._timestamps[self._position] - self._timestamps[self._start_position]
+            return self._start_time + elapsed / self.speed
+        if self.fps > 0:
+            return self._start_time + (self._position - self._start_position) / self.fps
+        return None
+
+    def acquire_image(self) -> Optional[np.ndarray]:
+        """
+        Read the next frame of the stack
+
+        Returns:
+            Copy of the frame (the file stays memory mapped), or None at the
+            end of the stack without looping
+        """
+        if self._frames is None:
+            return None
+
+        if self._position >= self.n_frames:
+            if not self.loop:
+                return None
+            self._position = 0
+            self.loops += 1
+            self._restart_clock()
+
+        due = self._due_time()
+        if due is not None:
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        image = np.array(self._frames[self._position])
+        self._position += 1
+        self.frame_count += 1
+        return image
+
+    def seek(self, frame: int):
+        """Continue the replay at the given frame"""
+        self._position = min(max(frame, 0), self.n_frames)
+        self._restart_clock()
+
+    def set_exposure(self, exposure_ms: float):
+        # Recorded frames keep their exposure
+        self.exposure = exposure_ms
+
+    def set_gain(self, gain: int):
+        self.gain = gain
+
+    def set_temperature(self, temp_celsius: int):
+        self.temperature = temp_celsius
+
+    def get_temperature(self) -> float:
+        return self.temperature
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "model": "Replay Camera",
+            "file": str(self.path),
+            "frames": self.n_frames,
+            "position": self._position,
+            "loops": self.loops,
+            "status": "connected" if self.connected else "disconnected"
+        }
@@ -2,64 +2,94 @@
 Lab Control Software - Main Entry Point
 Modular camera control, processing, and real-time feedback system
 """
+import argparse
 import sys
 import logging
-from pathlib import Path
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt
+from contextlib import nullcontext
 
-from core.app import LabControlApplication
-from core.config_manager import ConfigManager
-from gui.main_window import MainWindow
+from core.logging_setup import setup_logging, stop_logging
 
+# Heavy dependencies (PyQt6, numpy, hardware SDKs) are imported inside
+# main() so that --profile-startup can time them
 
-def setup_logging():
-    """Configure application logging"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('lab_control.log'),
-            logging.StreamHandler()
-        ]
-    )
+
+def parse_args():
+    """Parse command line; unknown arguments are passed on to Qt"""
+    parser = argparse.ArgumentParser(description="Lab Control Software")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print an import and startup time breakdown")
+    return parser.parse_known_args()
 
 
 def main():
     """Main application entry point"""
+    args, qt_args = parse_args()
+
+    profiler = None
+    if args.profile_startup:
+        from core.startup_profile import StartupProfiler
+        profiler = StartupProfiler()
+        profiler.install()
+
+    def stage(name):
+        return profiler.stage(name) if profiler else nullcontext()
+
     # Setup logging
     setup_logging()
     logger = logging.getLogger(__name__)
     logger.info("Starting Lab Control Software")
 
-    # Enable high DPI scaling
-    QApplication.setHighDpiScaleFactorRoundingPolicy(
-        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
-    )
+    exit_code = 1
+    try:
+        try:
+            with stage("import Qt"):
+                from PyQt6.QtWidgets import QApplication
+                from PyQt6.QtCore import Qt
 
-    # Create Qt application
-    app = QApplication(sys.argv)
-    app.setApplicationName("Lab Control Software")
-    app.setOrganizationName("Research Lab")
+            # Enable high DPI scaling
+            QApplication.setHighDpiScaleFactorRoundingPolicy(
+                Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
+            )
 
-    try:
-        # Load configuration
-        config_manager = ConfigManager("config.yaml")
-        config = config_manager.load()
+            # Create Qt application
+            with stage("create QApplication"):
+                app = QApplication(sys.argv[:1] + qt_args)
+            app.setApplicationName("Lab Control Software")
+            app.setOrganizationName("Research Lab")
+
+            with stage("import application"):
+                from core.app import LabControlApplication
+                from core.config_manager import ConfigManager
+                from gui.main_window import MainWindow
 
-        # Initialize application controller
-        lab_app = LabControlApplication(config)
+            # Load configuration
+            with stage("load configuration"):
+                config_manager = ConfigManager("config.yaml")
+                config = config_manager.load()
+                setup_logging(config.get("logging"))
 
-        # Create and show main window
-        main_window = MainWindow(lab_app)
-        main_window.show()
+            # Initialize application controller
+            with stage("initialize application"):
+                lab_app = LabControlApplication(config)
 
-        logger.info("Application started successfully")
-        sys.exit(app.exec())
+            # Create and show main window
+            with stage("create main window"):
+                main_window = MainWindow(lab_app)
+                main_window.show()
+
+            logger.info("Application started successfully")
+        finally:
+            # Report even (especially) when startup failed
+            if profiler:
+                profiler.uninstall()
+                print(profiler.report())
+        exit_code = app.exec()
 
     except Exception as e:
-        logger.error(f"Failed to start application: {e}", exc_info=True)
-        sys.exit(1)
+        logger.error("Failed to start application: %s", e, exc_info=True)
+
+    stop_logging()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
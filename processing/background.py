@@ -0,0 +1,204 @@
+"""
+Background Estimators for Background Subtraction
+Interchangeable strategies for estimating the camera background level
+"""
+import logging
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+
+Background = Union[float, np.ndarray]
+
+
+def _median_into(image: np.ndarray, scratch: np.ndarray) -> float:
+    """Median of image, partitioning a copy in the scratch buffer"""
+    flat = scratch.reshape(-1)
+    np.copyto(scratch, image)
+    n = flat.size
+    k = n // 2
+    if n % 2:
+        flat.partition(k)
+        return float(flat[k])
+    flat.partition((k - 1, k))
+    return (float(flat[k - 1]) + float(flat[k])) / 2.0
+
+
+class BackgroundEstimator(ABC):
+    """
+    Base class for background estimators
+
+    `estimate` returns either a scalar background level or a per-pixel
+    background frame with the shape of the image. `scratch` is an optional
+    float32 buffer of the image shape that may be overwritten. Per-pixel
+    estimators use `region` (set by ROI processing) to pick the part of
+    their full-frame model matching the image.
+    """
+
+    name = "background"
+    region = None  # full-frame (rows, columns) region of the images, None = full frame
+
+    @abstractmethod
+    def estimate(self, image: np.ndarray,
+                 scratch: Optional[np.ndarray] = None) -> Background:
+        """Background of image, a scalar or a per-pixel frame"""
+        pass
+
+
+class MedianBackground(BackgroundEstimator):
+    """Exact median of the full frame"""
+
+    name = "median"
+
+    def estimate(self, image: np.ndarray,
+                 scratch: Optional[np.ndarray] = None) -> Background:
+        if scratch is not None and scratch.shape == image.shape:
+            return _median_into(image, scratch)
+        return float(np.median(image))
+
+
+class HistogramMedianBackground(BackgroundEstimator):
+    """
+    Exact median of integer frames via a histogram
+
+    Counts pixel values with `np.bincount` (65536 bins for uint16) and
+    finds the median rank in the cumulative histogram, which is much
+    faster than partitioning the frame. Float frames are truncated to
+    integers first, which is exact for raw camera counts.
+    """
+
+    name = "histogram"
+
+    def estimate(self, image: np.ndarray,
+                 scratch: Optional[np.ndarray] = None) -> Background:
+        if image.dtype.kind == "u":
+            values = image.ravel()
+        elif scratch is not None and scratch.shape == image.shape:
+            # Reuse the float32 scratch buffer as int32 storage
+            values = scratch.view(np.int32).reshape(-1)
+            np.copyto(values, image.reshape(-1), casting="unsafe")
+            np.maximum(values, 0, out=values)
+        else:
+            values = np.clip(image, 0, None).astype(np.int64).ravel()
+
+        cumulative = np.cumsum(np.bincount(values))
+        n = values.size
+        lower = int(np.searchsorted(cumulative, (n - 1) // 2 + 1))
+        if n % 2:
+            return float(lower)
+        upper = int(np.searchsorted(cumulative, n // 2 + 1))
+        return (lower + upper) / 2.0
+
+
+class SubsampledMedianBackground(BackgroundEstimator):
+    """Median of every `step`-th pixel in both directions"""
+
+    name = "subsampled"
+
+    def __init__(self, step: int = 4):
+        self.step = max(1, int(step))
+
+    def estimate(self, image: np.ndarray,
+                 scratch: Optional[np.ndarray] = None) -> Background:
+        return float(np.median(image[::self.step, ::self.step]))
+
+
+class RunningBackground(BackgroundEstimator):
+    """
+    Per-pixel exponential running background model
+
+    The model is initialized with the first frame and then updated as
+    ``model += alpha * (frame - model)`` every `update_every` frames, so
+    slow drifts are tracked without paying for an update on every frame.
+    The frame that seeds the model gets its median as background instead
+    (subtracting it from itself would leave an empty frame).
+    """
+
+    name = "running"
+
+    def __init__(self, alpha: float = 0.05, update_every: int = 10):
+        self.alpha = alpha
+        self.update_every = max(1, int(update_every))
+        self._model: Optional[np.ndarray] = None
+        self._frames = 0
+
+    def reset(self):
+        """Discard background model"""
+        self._model = None
+        self._frames = 0
+
+    def estimate(self, image: np.ndarray,
+                 scratch: Optional[np.ndarray] = None) -> Background:
+        model = self._model
+        if model is not None and self.region is not None:
+            model = model[self.region]
+        if model is None or model.shape != image.shape:
+            self._model = image.astype(np.float32)
+            self._frames = 1
+            if scratch is not None and scratch.shape == image.shape:
+                return _median_into(image, scratch)
+            return float(np.median(image))
+        if self._frames % self.update_every == 0:
+            if scratch is not None and scratch.shape == image.shape:
+                np.subtract(image, model, out=scratch)
+                scratch *= self.alpha
+                model += scratch
+            else:
+                model += self.alpha * (image - model)
+        self._frames += 1
+        return model
+
+
+class DarkFrameBackground(BackgroundEstimator):
+    """Fixed dark frame loaded from a .npy file"""
+
+    name = "dark_frame"
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.dark_frame = np.load(self.path).astype(np.float32)
+
+    def estimate(self, image: np.ndarray,
+                 scratch: Optional[np.ndarray] = None) -> Background:
+        dark_frame = self.dark_frame if self.region is None else self.dark_frame[self.region]
+        if dark_frame.shape != image.shape:
+            raise ValueError(f"Dark frame shape {dark_frame.shape} does not "
+                             f"match image shape {image.shape}")
+        return dark_frame
+
+
+def make_background_estimator(config: Optional[Dict[str, Any]] = None) -> BackgroundEstimator:
+    """
+    Create background estimator from the processing.background config
+
+    Args:
+        config: Dictionary with "method" (median, histogram, subsampled,
+            running or dark_frame) and method-specific options
+
+    Returns:
+        BackgroundEstimator instance
+    """
+    config = config or {}
+    method = config.get("method", "median")
+
+    if method == "median":
+        return MedianBackground()
+    if method == "histogram":
+        return HistogramMedianBackground()
+    if method == "subsampled":
+        return SubsampledMedianBackground(step=config.get("subsample_step", 4))
+    if method == "running":
+        return RunningBackground(alpha=config.get("alpha", 0.05),
+                                 update_every=config.get("update_every", 10))
+    if method == "dark_frame":
+        if config.get("dark_frame"):
+            return DarkFrameBackground(config["dark_frame"])
+        logging.getLogger(__name__).warning(
+            "Background method 'dark_frame' needs a dark_frame file, using median")
+        return MedianBackground()
+
+    logging.getLogger(__name__).warning(
+        f"Unknown background method '{method}', using median")
+    return MedianBackground()
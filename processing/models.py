@@ -0,0 +1,26 @@
+"""
+PyTorch Models for Feature Extraction
+Imported on demand so that torch is only loaded when a model is used
+"""
+import torch
+import torch.nn as nn
+
+
+class SimpleFeatureExtractor(nn.Module):
+    """Simple CNN for feature extraction"""
+
+    def __init__(self, output_features: int = 16):
+        super().__init__()
+        self.conv1 = nn.Conv2d(1, 32, kernel_size=3, padding=1)
+        self.conv2 = nn.Conv2d(32, 64, kernel_size=3, padding=1)
+        self.pool = nn.AdaptiveAvgPool2d((1, 1))
+        self.fc = nn.Linear(64, output_features)
+
+    def forward(self, x):
+        x = torch.relu(self.conv1(x))
+        x = torch.max_pool2d(x, 2)
+        x = torch.relu(self.conv2(x))
+        x = self.pool(x)
+        x = x.view(x.size(0), -1)
+        x = self.fc(x)
+        return x
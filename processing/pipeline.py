@@ -1,13 +1,45 @@
 """
 Image Processing Pipeline with PyTorch GPU Acceleration
+
+PyTorch is only imported when GPU processing or an ML model is actually
+requested, and scipy.ndimage is resolved once on first use, so importing
+this module stays cheap.
 """
-import torch
-import torch.nn as nn
 import numpy as np
 import logging
-from typing import List, Dict, Any, Optional, Callable
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Callable, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 
+from processing.background import BackgroundEstimator, MedianBackground
+from processing.localization import GaussianLocalizer
+from processing.roi import AdaptiveROI, region_of
+from processing.tracking import SpotStatistics, SpotTracker, label_statistics
+
+if TYPE_CHECKING:
+    import torch.nn as nn
+
+
+_ndimage = None
+
+
+def _get_ndimage():
+    """Import scipy.ndimage on first use"""
+    global _ndimage
+    if _ndimage is None:
+        import scipy.ndimage
+        _ndimage = scipy.ndimage
+    return _ndimage
+
+
+def __getattr__(name: str):
+    # SimpleFeatureExtractor needs torch at class definition time; it lives
+    # in processing.models and is only imported when someone asks for it
+    if name == "SimpleFeatureExtractor":
+        from processing.models import SimpleFeatureExtractor
+        return SimpleFeatureExtractor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 @dataclass
 class ProcessingResult:
@@ -17,30 +49,93 @@ class ProcessingResult:
     metadata: Dict[str, Any]
 
 
-class ProcessingPipeline:
-    """Configurable image processing pipeline"""
+def _processor_name(processor: Callable) -> str:
+    return getattr(processor, "__name__", type(processor).__name__)
+
+
+def _shaped_buffer(storage: Optional[np.ndarray], shape, dtype) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    C-contiguous array of shape backed by reusable flat storage
 
-    def __init__(self, use_gpu: bool = True):
+    The storage only grows, so alternating between full frames and
+    smaller ROI windows does not reallocate.
+
+    Returns:
+        (storage, view of shape)
+    """
+    size = int(np.prod(shape))
+    if storage is None or storage.size < size or storage.dtype != dtype:
+        storage = np.empty(size, dtype=dtype)
+    return storage, storage[:size].reshape(shape)
+
+
+class ProcessingPipeline:
+    """
+    Configurable image processing pipeline
+
+    Processors are callables ``image -> (image, features)``. If in-place
+    mode is enabled and every processor is a `Processor`, frames instead
+    flow through two float32 work buffers owned by the pipeline. The
+    buffers are sized on the first frame and reused afterwards, so a frame
+    passes through the pipeline without per-frame full-frame allocations.
+    In that mode `ProcessingResult.processed_image` is the pipeline's work
+    buffer and is overwritten by the next frame.
+
+    With an AdaptiveROI set and every processor a `Processor`, frames are
+    processed only inside the ROI window around the tracked spot; positions
+    in the features stay in full-frame coordinates and
+    ``metadata["roi"]`` holds the processed window (x0, y0, width, height).
+    """
+
+    def __init__(self, use_gpu: bool = True, in_place: bool = False,
+                 roi: Optional[AdaptiveROI] = None):
         """
         Initialize processing pipeline
 
         Args:
             use_gpu: Use GPU acceleration if available
+            in_place: Run Processor stages in place on preallocated buffers
+            roi: Optional adaptive region of interest
         """
         self.logger = logging.getLogger(__name__)
-        self.device = torch.device('cuda' if use_gpu and torch.cuda.is_available() 
-                                   else 'cpu')
-        self.logger.info(f"Processing pipeline using device: {self.device}")
+        self.use_gpu = use_gpu
+        self._device = None
+        if use_gpu:
+            # Resolve device (and import torch) only if GPU was requested
+            self.logger.info("Processing pipeline using device: %s", self.device)
+        else:
+            self.logger.info("Processing pipeline using device: cpu")
 
         self.processors: List[Callable] = []
-        self.ml_model: Optional[nn.Module] = None
+        self.ml_model: Optional["nn.Module"] = None
+
+        self.in_place = in_place
+        self.roi = roi
+        self._work: Optional[np.ndarray] = None
+        self._scratch: Optional[np.ndarray] = None
+        self._work_storage: Optional[np.ndarray] = None
+        self._scratch_storage: Optional[np.ndarray] = None
 
     def add_processor(self, processor: Callable):
         """Add processing step to pipeline"""
         self.processors.append(processor)
-        self.logger.info(f"Added processor: {processor.__name__}")
-
-    def load_ml_model(self, model: nn.Module):
+        self._work = None  # new stage may need its own buffers
+        self.logger.info("Added processor: %s", _processor_name(processor))
+
+    def can_process_in_place(self) -> bool:
+        """Whether all processors support the in-place protocol"""
+        return all(isinstance(p, Processor) for p in self.processors)
+
+    @property
+    def device(self):
+        """Torch device used for ML inference (imports torch on first access)"""
+        if self._device is None:
+            import torch
+            self._device = torch.device('cuda' if self.use_gpu and torch.cuda.is_available()
+                                        else 'cpu')
+        return self._device
+
+    def load_ml_model(self, model: "nn.Module"):
         """Load PyTorch model for GPU-accelerated processing"""
         self.ml_model = model.to(self.device)
         self.ml_model.eval()
@@ -56,30 +151,91 @@ class ProcessingPipeline:
         Returns:
             ProcessingResult with processed image and extracted features
         """
-        processed = image.copy()
-        features = {}
+        window = None
+        all_processors = self.can_process_in_place()
+        if self.roi is not None and all_processors:
+            image, window = self._apply_roi(image)
 
-        # Apply sequential processors
-        for processor in self.processors:
-            try:
-                processed, proc_features = processor(processed)
-                features.update(proc_features)
-            except Exception as e:
-                self.logger.error(f"Processor {processor.__name__} failed: {e}")
+        if self.in_place and all_processors:
+            processed, features = self._process_in_place(image)
+        else:
+            processed, features = self._process_copy(image)
 
         # Apply ML model if loaded
         if self.ml_model is not None:
             ml_features = self._apply_ml_model(processed)
             features.update(ml_features)
 
+        if self.roi is not None and all_processors:
+            self.roi.update(features)
+
         return ProcessingResult(
             processed_image=processed,
             features=features,
-            metadata={"pipeline_steps": len(self.processors)}
+            metadata={"pipeline_steps": len(self.processors), "roi": window}
         )
 
+    def _apply_roi(self, image: np.ndarray):
+        """Cut the ROI window out of image and tell processors where it lies"""
+        region, origin = self.roi.plan(image.shape)
+        if region is not None:
+            image = image[region]
+
+        window = None
+        if region is not None or image.shape != self.roi.frame_shape:
+            window = (origin[0], origin[1], image.shape[1], image.shape[0])
+        full_region = region_of(window) if window is not None else None
+        for processor in self.processors:
+            processor.set_region(full_region)
+        return image, window
+
+    def _process_copy(self, image: np.ndarray):
+        """Run processors on a copy of the image, each returning a new array"""
+        processed = image.copy()
+        features = {}
+
+        # Apply sequential processors
+        for processor in self.processors:
+            try:
+                processed, proc_features = processor(processed)
+                features.update(proc_features)
+            except Exception as e:
+                self.logger.error("Processor %s failed: %s", _processor_name(processor), e)
+
+        return processed, features
+
+    def _process_in_place(self, image: np.ndarray):
+        """Run processors in place on the pipeline's float32 work buffer"""
+        if self._work is None or self._work.shape != image.shape:
+            self._allocate(image.shape)
+
+        work = self._work
+        np.copyto(work, image, casting="unsafe")
+        features = {}
+
+        for processor in self.processors:
+            try:
+                features.update(processor.process_into(work, self._scratch))
+            except Exception as e:
+                self.logger.error("Processor %s failed: %s", _processor_name(processor), e)
+
+        return work, features
+
+    def _allocate(self, shape):
+        """Allocate (or reuse) work buffers for the given frame shape"""
+        grows = self._work_storage is None or self._work_storage.size < int(np.prod(shape))
+        self._work_storage, self._work = _shaped_buffer(self._work_storage, shape, np.float32)
+        self._scratch_storage, self._scratch = _shaped_buffer(self._scratch_storage, shape,
+                                                              np.float32)
+        for processor in self.processors:
+            processor.allocate(shape)
+        if grows:
+            self.logger.info("Allocated in-place pipeline buffers for %s frames", shape)
+
     def _apply_ml_model(self, image: np.ndarray) -> Dict[str, float]:
         """Apply ML model for feature extraction"""
+        import torch
+
         try:
             # Convert to torch tensor
             img_tensor = torch.from_numpy(image).float().unsqueeze(0).unsqueeze(0)
@@ -119,9 +275,7 @@ def background_subtraction(image: np.ndarray,
 
 def gaussian_filter(image: np.ndarray, sigma: float = 1.0) -> tuple:
     """Apply Gaussian smoothing"""
-    from scipy.ndimage import gaussian_filter as gf
-
-    result = gf(image.astype(np.float32), sigma=sigma)
+    result = _get_ndimage().gaussian_filter(image.astype(np.float32), sigma=sigma)
     features = {"filter_sigma": sigma}
 
     return result.astype(image.dtype), features
@@ -129,42 +283,495 @@ def gaussian_filter(image: np.ndarray, sigma: float = 1.0) -> tuple:
 
 def find_centroids(image: np.ndarray, threshold: float = 0.5) -> tuple:
     """Find bright spots and calculate centroids"""
-    from scipy.ndimage import label, center_of_mass
+    ndimage = _get_ndimage()
 
     # Threshold image
     normalized = (image - image.min()) / (image.max() - image.min())
     binary = normalized > threshold
 
     # Label connected components
-    labeled, num_features = label(binary)
+    labeled, num_features = ndimage.label(binary)
 
-    # Calculate centroids
-    centroids = center_of_mass(image, labeled, range(1, num_features + 1))
-
-    features = {
-        "num_spots": num_features,
-        "centroid_x": centroids[0][1] if num_features > 0 else 0,
-        "centroid_y": centroids[0][0] if num_features > 0 else 0
-    }
+    # Centroid of the brightest spot (no centroid_x/centroid_y without one)
+    features = {"num_spots": num_features, "spot_intensity": 0.0}
+    if num_features > 0:
+        stats = label_statistics(image, labeled, num_features)
+        brightest = int(np.argmax(stats.intensity))
+        features["centroid_x"] = float(stats.x[brightest])
+        features["centroid_y"] = float(stats.y[brightest])
+        features["spot_intensity"] = float(stats.intensity[brightest])
 
     return image, features
 
 
-class SimpleFeatureExtractor(nn.Module):
-    """Simple CNN for feature extraction"""
-
-    def __init__(self, output_features: int = 16):
-        super().__init__()
-        self.conv1 = nn.Conv2d(1, 32, kernel_size=3, padding=1)
-        self.conv2 = nn.Conv2d(32, 64, kernel_size=3, padding=1)
-        self.pool = nn.AdaptiveAvgPool2d((1, 1))
-        self.fc = nn.Linear(64, output_features)
-
-    def forward(self, x):
-        x = torch.relu(self.conv1(x))
-        x = torch.max_pool2d(x, 2)
-        x = torch.relu(self.conv2(x))
-        x = self.pool(x)
-        x = x.view(x.size(0), -1)
-        x = self.fc(x)
-        return x
+# In-place processor protocol
+
+class Processor(ABC):
+    """
+    Processing stage usable both as a plain processor and in place
+
+    Calling the instance runs the allocating ``image -> (image, features)``
+    path. `process_into` instead modifies the pipeline-owned float32 work
+    buffer in place, using the equally sized scratch buffer for temporary
+    results, and returns only the features. Per-stage buffers are created
+    in `allocate`, which the pipeline calls whenever the frame shape
+    changes.
+    """
+
+    name = "processor"
+    region: Optional[Tuple[slice, slice]] = None  # full-frame region of the images
+
+    @property
+    def __name__(self) -> str:
+        return self.name
+
+    def set_region(self, region: Optional[Tuple[slice, slice]]):
+        """Full-frame region (rows, columns) the next images are cut from, None = full frame"""
+        self.region = region
+
+    @property
+    def origin(self) -> Tuple[int, int]:
+        """Full-frame (x, y) of the first pixel of the current images"""
+        if self.region is None:
+            return 0, 0
+        return self.region[1].start, self.region[0].start
+
+    def _to_frame(self, features: Dict[str, float]) -> Dict[str, float]:
+        """Shift centroid features from image to full-frame coordinates"""
+        if self.region is not None and features.get("num_spots"):
+            x0, y0 = self.origin
+            features["centroid_x"] += x0
+            features["centroid_y"] += y0
+        return features
+
+    @abstractmethod
+    def __call__(self, image: np.ndarray) -> tuple:
+        """Process a copy of image and return (image, features)"""
+        pass
+
+    def allocate(self, shape):
+        """Preallocate per-stage buffers for frames of the given shape"""
+        pass
+
+    @abstractmethod
+    def process_into(self, work: np.ndarray, scratch: np.ndarray) -> Dict[str, float]:
+        """Process work buffer in place and return extracted features"""
+        pass
+
+
+class BackgroundSubtraction(Processor):
+    """
+    Background subtraction (see `background_subtraction`)
+
+    The background is estimated by a BackgroundEstimator from
+    processing.background, by default the exact full-frame median.
+    """
+
+    name = "background_subtraction"
+
+    def __init__(self, estimator: Optional[BackgroundEstimator] = None):
+        self.estimator = estimator or MedianBackground()
+
+    def set_region(self, region: Optional[Tuple[slice, slice]]):
+        super().set_region(region)
+        self.estimator.region = region
+
+    def __call__(self, image: np.ndarray) -> tuple:
+        return background_subtraction(image, self.estimator.estimate(image))
+
+    def process_into(self, work: np.ndarray, scratch: np.ndarray) -> Dict[str, float]:
+        background = self.estimator.estimate(work, scratch)
+        np.subtract(work, background, out=work)
+        np.maximum(work, 0, out=work)
+        return {"mean_intensity": float(work.mean())}
+
+
+class GaussianFilter(Processor):
+    """Gaussian smoothing (see `gaussian_filter`)"""
+
+    name = "gaussian_filter"
+
+    def __init__(self, sigma: float = 1.0):
+        self.sigma = sigma
+
+    def __call__(self, image: np.ndarray) -> tuple:
+        return gaussian_filter(image, sigma=self.sigma)
+
+    def process_into(self, work: np.ndarray, scratch: np.ndarray) -> Dict[str, float]:
+        _get_ndimage().gaussian_filter(work, sigma=self.sigma, output=scratch)
+        np.copyto(work, scratch)
+        return {"filter_sigma": self.sigma}
+
+
+class CentroidDetection(Processor):
+    """
+    Thresholded centroid detection of the brightest spot (see `find_centroids`)
+
+    Also reports the spot's integrated intensity as ``spot_intensity``.
+    Frames without a spot have no ``centroid_x``/``centroid_y``, so
+    feedback on them holds its output instead of steering towards 0.
+    """
+
+    name = "centroid_detection"
+
+    def __init__(self, threshold: float = 0.5):
+        self.threshold = threshold
+        self._mask: Optional[np.ndarray] = None
+        self._labels: Optional[np.ndarray] = None
+        self._mask_storage: Optional[np.ndarray] = None
+        self._labels_storage: Optional[np.ndarray] = None
+
+    def __call__(self, image: np.ndarray) -> tuple:
+        image, features = find_centroids(image, threshold=self.threshold)
+        return image, self._to_frame(features)
+
+    def allocate(self, shape):
+        self._mask_storage, self._mask = _shaped_buffer(self._mask_storage, shape, bool)
+        self._labels_storage, self._labels = _shaped_buffer(self._labels_storage, shape,
+                                                            np.int32)
+
+    def process_into(self, work: np.ndarray, scratch: np.ndarray) -> Dict[str, float]:
+        return self._locate(work, float(work.min()), float(work.max()))
+
+    def _locate(self, work: np.ndarray, low: float, high: float) -> Dict[str, float]:
+        """Brightest spot, given the min/max range of the work buffer"""
+        num_features = 0
+        if high > low:
+            # Same as thresholding the min/max normalized image
+            np.greater(work, low + self.threshold * (high - low), out=self._mask)
+            num_features = _get_ndimage().label(self._mask, output=self._labels)
+
+        features = {"num_spots": num_features, "spot_intensity": 0.0}
+        if num_features > 0:
+            stats = label_statistics(work, self._labels, num_features)
+            brightest = int(np.argmax(stats.intensity))
+            features["centroid_x"] = float(stats.x[brightest])
+            features["centroid_y"] = float(stats.y[brightest])
+            features["spot_intensity"] = float(stats.intensity[brightest])
+
+        return self._to_frame(features)
+
+
+class FusedPreprocessing(CentroidDetection):
+    """
+    Background subtraction, Gaussian smoothing and centroid detection fused
+
+    Produces the image and features of the default chain
+    `BackgroundSubtraction`, `GaussianFilter`, `CentroidDetection` (up to
+    float32 rounding) with far fewer passes over frame-sized memory.
+    After the background estimate the frame is processed in blocks of
+    rows small enough to stay in cache: each block, with `radius` rows
+    above and below, is background subtracted and clipped, summed for
+    ``mean_intensity``, filtered along columns and then along rows into
+    the work buffer, and its min/max are taken while it is still in
+    cache. Only thresholding, labelling and label statistics pass over
+    the frame again.
+
+    The separable filter uses the precomputed float32 kernel of
+    scipy.ndimage.gaussian_filter (reflect boundary) as sums of shifted
+    row and column views, which also avoids the slow strided column pass
+    of ndimage.
+    """
+
+    name = "fused_preprocessing"
+    BLOCK_BYTES = 1 << 18  # bytes of float32 rows per block, sized for the L2 cache
+
+    def __init__(self, estimator: Optional[BackgroundEstimator] = None,
+                 sigma: float = 1.0, threshold: float = 0.5, truncate: float = 4.0):
+        """
+        Initialize fused preprocessing
+
+        Args:
+            estimator: Background estimator (default MedianBackground)
+            sigma: Gaussian filter sigma in pixels
+            threshold: Detection threshold relative to the min/max range
+            truncate: Kernel radius in sigmas (as scipy.ndimage.gaussian_filter)
+        """
+        super().__init__(threshold=threshold)
+        self.estimator = estimator or MedianBackground()
+        self.sigma = sigma
+        self.radius = int(truncate * sigma + 0.5)
+        kernel = np.exp(-0.5 * (np.arange(-self.radius, self.radius + 1) / sigma) ** 2)
+        self.kernel = (kernel / kernel.sum()).astype(np.float32)
+        self.block_rows = 0
+        self._slab: Optional[np.ndarray] = None  # block rows with row halos
+        self._padded: Optional[np.ndarray] = None  # vertically filtered block with column halos
+        self._term: Optional[np.ndarray] = None
+
+    def set_region(self, region: Optional[Tuple[slice, slice]]):
+        super().set_region(region)
+        self.estimator.region = region
+
+    def allocate(self, shape):
+        super().allocate(shape)
+        height, width = shape
+        radius = self.radius
+        self.block_rows = min(max(self.BLOCK_BYTES // (4 * width), 1), height)
+        rows = self.block_rows
+        if self._term is None or self._term.shape != (rows, width):
+            self._slab = np.empty((rows + 2 * radius, width), dtype=np.float32)
+            self._padded = np.empty((rows, width + 2 * radius), dtype=np.float32)
+            self._term = np.empty((rows, width), dtype=np.float32)
+
+    def __call__(self, image: np.ndarray) -> tuple:
+        work = image.astype(np.float32)
+        if self._labels is None or self._labels.shape != work.shape:
+            self.allocate(work.shape)
+        return work, self.process_into(work, np.empty_like(work))
+
+    def _smooth(self, source: np.ndarray, shift, out: np.ndarray, term: np.ndarray):
+        """out = sum over k of kernel[k] * source shifted by k (see `shift`)"""
+        kernel, radius = self.kernel, self.radius
+        np.multiply(shift(source, 0), kernel[radius], out=out)
+        for k in range(1, radius + 1):
+            np.add(shift(source, -k), shift(source, k), out=term)
+            term *= kernel[radius + k]
+            out += term
+
+    def process_into(self, work: np.ndarray, scratch: np.ndarray) -> Dict[str, float]:
+        background = self.estimator.estimate(work, scratch)
+        height, width = work.shape
+        radius = self.radius
+        if min(height, width) <= radius:
+            # Too small for one reflection at the border: unfused
+            np.subtract(work, background, out=work)
+            np.maximum(work, 0, out=work)
+            mean = float(work.mean())
+            _get_ndimage().gaussian_filter(work, sigma=self.sigma, output=scratch)
+            np.copyto(work, scratch)
+            features = {"mean_intensity": mean, "filter_sigma": self.sigma}
+            features.update(super().process_into(work, scratch))
+            return features
+
+        per_pixel = isinstance(background, np.ndarray)
+        slab, padded = self._slab, self._padded
+        total, low, high = 0.0, np.inf, -np.inf
+        for start in range(0, height, self.block_rows):
+            stop = min(start + self.block_rows, height)
+            n = stop - start
+            # slab[radius + i] holds processed row start + i; the rows
+            # above were moved there at the end of the previous block
+            end = min(stop + radius, height)
+            new = slab[radius:radius + end - start]
+            np.subtract(work[start:end], background[start:end] if per_pixel else background,
+                        out=new)
+            np.maximum(new, 0, out=new)
+            total += float(slab[radius:radius + n].sum(dtype=np.float64))
+            if start == 0:
+                slab[:radius] = slab[2 * radius - 1:radius - 1:-1]
+            if end < stop + radius:
+                edge = radius + height - start  # slab row of image row `height`
+                slab[edge:edge + stop + radius - end] = \
+                    slab[edge - 1:edge - 1 - (stop + radius - end):-1]
+
+            # Along columns into the middle of the padded buffer, reflect
+            # the column halos, then along rows into the work buffer
+            rows = padded[:n]
+            term = self._term[:n]
+            self._smooth(slab, lambda a, k: a[radius + k:radius + k + n],
+                         rows[:, radius:radius + width], term)
+            rows[:, :radius] = rows[:, 2 * radius - 1:radius - 1:-1]
+            rows[:, radius + width:] = rows[:, radius + width - 1:width - 1:-1]
+            block = work[start:stop]
+            self._smooth(rows, lambda a, k: a[:, radius + k:radius + k + width], block, term)
+            low, high = min(low, float(block.min())), max(high, float(block.max()))
+
+            slab[:radius] = slab[n:n + radius]
+
+        features = {"mean_intensity": total / work.size, "filter_sigma": self.sigma}
+        features.update(self._locate(work, low, high))
+        return features
+
+
+class _SpotDetection(Processor):
+    """Thresholded detection of all spots with per-label statistics"""
+
+    def __init__(self, threshold: float = 0.5, min_area: int = 1):
+        self.threshold = threshold
+        self.min_area = min_area
+        self._mask: Optional[np.ndarray] = None
+        self._labels: Optional[np.ndarray] = None
+        self._mask_storage: Optional[np.ndarray] = None
+        self._labels_storage: Optional[np.ndarray] = None
+
+    def allocate(self, shape):
+        self._mask_storage, self._mask = _shaped_buffer(self._mask_storage, shape, bool)
+        self._labels_storage, self._labels = _shaped_buffer(self._labels_storage, shape,
+                                                            np.int32)
+
+    def __call__(self, image: np.ndarray) -> tuple:
+        if self._labels is None or self._labels.shape != image.shape:
+            self.allocate(image.shape)
+        return image, self.process_into(image.astype(np.float32, copy=False), None)
+
+    def _detect(self, work: np.ndarray) -> SpotStatistics:
+        """Spots of the work buffer in image coordinates"""
+        low, high = float(work.min()), float(work.max())
+        num_features = 0
+        if high > low:
+            np.greater(work, low + self.threshold * (high - low), out=self._mask)
+            num_features = _get_ndimage().label(self._mask, output=self._labels)
+
+        stats = label_statistics(work, self._labels, num_features) if num_features else \
+            SpotStatistics(*(np.zeros(0),) * 7)
+        if self.min_area > 1:
+            stats = stats.select(stats.area >= self.min_area)
+        return stats
+
+
+class SpotTracking(_SpotDetection):
+    """
+    Multi-spot detection and tracking
+
+    Thresholds like `CentroidDetection`, computes centroid, integrated
+    intensity, area and second moments of every spot in one vectorized
+    pass (`label_statistics`), and keeps stable spot IDs across frames
+    with a nearest-neighbour `SpotTracker`. For every spot with ID n the
+    features ``spot_<n>_x``, ``_y``, ``_intensity``, ``_area``, ``_xx``,
+    ``_yy`` and ``_xy`` are reported. ``centroid_x``/``centroid_y`` hold
+    the target spot (`target_id`), or the brightest spot if no target is
+    set (``target_id`` is -1 then), with its ``spot_intensity``. While a
+    selected target is not visible ``target_id`` is -1 and there is no
+    ``centroid_x``/``centroid_y`` at all, so feedback on them pauses
+    instead of moving to another particle; the same holds for frames
+    without any spot.
+
+    With a `localizer` the centroids are replaced by Gaussian fit
+    positions, and ``_sigma``, ``_amplitude``, ``_x_err`` and ``_y_err``
+    are reported as well.
+
+    With an adaptive ROI only the window is searched; spots outside it
+    keep their IDs (they are not counted as missed) but are not reported
+    until the next full frame.
+    """
+
+    name = "spot_tracking"
+
+    def __init__(self, threshold: float = 0.5, min_area: int = 1,
+                 max_distance: float = 10.0, max_missed: int = 5,
+                 target_id: Optional[int] = None,
+                 localizer: Optional[GaussianLocalizer] = None):
+        """
+        Initialize spot tracking
+
+        Args:
+            threshold: Detection threshold relative to the min/max range
+            min_area: Smallest spot area in pixels
+            max_distance: Largest frame-to-frame displacement in pixels
+            max_missed: Frames a spot may be missing before its ID is dropped
+            target_id: Spot ID reported as centroid_x/centroid_y
+            localizer: Optional Gaussian fit refining the spot positions
+        """
+        super().__init__(threshold=threshold, min_area=min_area)
+        self.target_id = target_id
+        self.localizer = localizer
+        self.tracker = SpotTracker(max_distance=max_distance, max_missed=max_missed)
+
+    def select_target(self, spot_id: Optional[int]):
+        """Report this spot as centroid_x/centroid_y (None = brightest)"""
+        self.target_id = spot_id
+
+    def process_into(self, work: np.ndarray, scratch: np.ndarray) -> Dict[str, float]:
+        stats = self._detect(work)
+        fit = None
+        if self.localizer is not None and len(stats):
+            fit = self.localizer.localize(work, stats.x, stats.y)
+            stats.x, stats.y = fit.x, fit.y
+
+        # Track in full-frame coordinates
+        x0, y0 = self.origin
+        stats.x += x0
+        stats.y += y0
+        ids = self.tracker.update(stats.x, stats.y, self.region)
+
+        features = {"num_spots": len(stats), "target_id": -1}
+        for i, spot_id in enumerate(ids):
+            prefix = f"spot_{spot_id}_"
+            features[prefix + "x"] = float(stats.x[i])
+            features[prefix + "y"] = float(stats.y[i])
+            features[prefix + "intensity"] = float(stats.intensity[i])
+            features[prefix + "area"] = float(stats.area[i])
+            features[prefix + "xx"] = float(stats.xx[i])
+            features[prefix + "yy"] = float(stats.yy[i])
+            features[prefix + "xy"] = float(stats.xy[i])
+            if fit is not None:
+                features[prefix + "sigma"] = float(fit.sigma[i])
+                features[prefix + "amplitude"] = float(fit.amplitude[i])
+                features[prefix + "x_err"] = float(fit.x_err[i])
+                features[prefix + "y_err"] = float(fit.y_err[i])
+
+        if self.target_id is not None:
+            target = np.flatnonzero(ids == self.target_id)
+            if not len(target):
+                # Never hand another particle to the feedback loop
+                return features
+            index = int(target[0])
+            features["target_id"] = self.target_id
+        elif len(stats):
+            index = int(np.argmax(stats.intensity))
+        else:
+            return features
+        features["centroid_x"] = float(stats.x[index])
+        features["centroid_y"] = float(stats.y[index])
+        features["spot_intensity"] = float(stats.intensity[index])
+        return features
+
+
+class GaussianLocalization(_SpotDetection):
+    """
+    Subpixel spot positions from Gaussian fits (see processing.localization)
+
+    Spots are detected like in `CentroidDetection`, then the `max_spots`
+    brightest are fitted together by a `GaussianLocalizer` seeded at their
+    centroids. Unlike the thresholded centroid, the fit is not biased by
+    the background or the threshold. ``centroid_x``/``centroid_y`` hold
+    the brightest spot with its uncertainties ``centroid_x_err`` and
+    ``centroid_y_err`` and its thresholded ``spot_intensity`` (absent
+    without a spot, as in `CentroidDetection`); every fitted spot k (brightest first) is reported
+    as ``fit_<k>_x``, ``_y``, ``_sigma``, ``_amplitude``, ``_x_err`` and
+    ``_y_err``. Fitted sigmas include the blur of earlier filter stages,
+    and since smoothing correlates the pixel noise the uncertainties are
+    then optimistic.
+    """
+
+    name = "gaussian_localization"
+
+    def __init__(self, threshold: float = 0.5, min_area: int = 1, max_spots: int = 10,
+                 localizer: Optional[GaussianLocalizer] = None):
+        """
+        Initialize Gaussian localization
+
+        Args:
+            threshold: Detection threshold relative to the min/max range
+            min_area: Smallest spot area in pixels
+            max_spots: Fit at most this many of the brightest spots
+            localizer: Fit settings (default GaussianLocalizer())
+        """
+        super().__init__(threshold=threshold, min_area=min_area)
+        self.max_spots = max_spots
+        self.localizer = localizer or GaussianLocalizer()
+
+    def process_into(self, work: np.ndarray, scratch: np.ndarray) -> Dict[str, float]:
+        stats = self._detect(work)
+        features = {"num_spots": len(stats), "spot_intensity": 0.0}
+        if not len(stats):
+            return features
+
+        brightest = np.argsort(stats.intensity)[::-1][:self.max_spots]
+        features["spot_intensity"] = float(stats.intensity[brightest[0]])
+        fit = self.localizer.localize(work, stats.x[brightest], stats.y[brightest])
+        x0, y0 = self.origin
+        for k in range(len(fit)):
+            prefix = f"fit_{k}_"
+            features[prefix + "x"] = float(fit.x[k] + x0)
+            features[prefix + "y"] = float(fit.y[k] + y0)
+            features[prefix + "sigma"] = float(fit.sigma[k])
+            features[prefix + "amplitude"] = float(fit.amplitude[k])
+            features[prefix + "x_err"] = float(fit.x_err[k])
+            features[prefix + "y_err"] = float(fit.y_err[k])
+
+        features["centroid_x"] = features["fit_0_x"]
+        features["centroid_y"] = features["fit_0_y"]
+        features["centroid_x_err"] = features["fit_0_x_err"]
+        features["centroid_y_err"] = features["fit_0_y_err"]
+        return features
@@ -0,0 +1,202 @@
+"""
+Adaptive Region of Interest
+Restricts processing to a window that follows the tracked spot
+"""
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+
+Region = Tuple[slice, slice]  # (rows, columns) in full-frame coordinates
+Window = Tuple[int, int, int, int]  # x0, y0, width, height
+
+
+def region_of(window: Window) -> Region:
+    x0, y0, width, height = window
+    return slice(y0, y0 + height), slice(x0, x0 + width)
+
+
+class AdaptiveROI:
+    """
+    Window around the last spot position
+
+    The first frame (and every frame after the spot was lost) is processed
+    in full. Afterwards only a (2 * half_size + 1)^2 window centred on the
+    last `centroid_x`/`centroid_y` is processed, and every
+    `reacquire_every` frames a full frame is processed again to pick up
+    new spots (0 disables periodic re-acquisition). The window keeps its
+    size near the frame border by shifting inwards.
+
+    The spot counts as lost when no spot is reported, or when its
+    ``spot_intensity`` drops below `loss_fraction` of the reference
+    intensity taken on full frames. The threshold of the detection stages
+    is relative to the image's min/max, so a window of pure noise still
+    yields spots; only the absolute intensity tells them from the real
+    one. Full frames that are that dim do not start a window either, and
+    they do not lower the reference (`reset` with ``forget_intensity``
+    does, e.g. for a new, dimmer particle).
+
+    With a `crop` callback (e.g. a camera hardware ROI) a larger window of
+    `crop_half_size` around the spot is requested from the camera and only
+    moved when the processing window would leave it; ``crop(None)``
+    restores the full sensor for re-acquisition. Frames whose shape
+    matches the requested crop are taken to be cropped frames, so the
+    callback must apply the crop before it returns (frames still in
+    flight with the previous crop would be misplaced).
+    """
+
+    def __init__(self, half_size: int = 32, reacquire_every: int = 100,
+                 crop: Optional[Callable[[Optional[Window]], None]] = None,
+                 crop_half_size: Optional[int] = None, loss_fraction: float = 0.25):
+        """
+        Initialize adaptive ROI
+
+        Args:
+            half_size: Processing window margin around the spot in pixels
+            reacquire_every: Process a full frame every n frames (0 = only
+                when the spot is lost)
+            crop: Optional callback setting a hardware crop window (None =
+                full sensor)
+            crop_half_size: Hardware crop margin (default 2 * half_size)
+            loss_fraction: Spot lost below this fraction of the reference
+                spot intensity (0 = only when no spot is reported)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.half_size = half_size
+        self.reacquire_every = reacquire_every
+        self.crop = crop
+        self.crop_half_size = max(crop_half_size or 2 * half_size, half_size)
+        self.loss_fraction = loss_fraction
+
+        self.frame_shape: Optional[Tuple[int, int]] = None
+        self.center: Optional[Tuple[float, float]] = None
+        self.crop_window: Optional[Window] = None
+        self._since_full = 0
+        self._reacquiring = True  # no hardware crop until a full frame was processed
+        self._full_frame = False  # the last planned image was a full frame
+        self.reference_intensity: Optional[float] = None  # spot_intensity on full frames
+
+        # Statistics
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.losses = 0
+
+    def reset(self, forget_intensity: bool = False):
+        """
+        Forget the spot; the next frame is processed in full
+
+        Args:
+            forget_intensity: Also forget the reference spot intensity
+        """
+        if forget_intensity:
+            self.reference_intensity = None
+        self.center = None
+        self._reacquiring = True
+        self._set_crop(None)
+
+    def _window(self, half_size: int) -> Window:
+        """Window of the given margin around the centre, inside the frame"""
+        height, width = self.frame_shape
+        sizes = (min(2 * half_size + 1, width), min(2 * half_size + 1, height))
+        origin = [int(np.clip(round(c) - half_size, 0, limit - size))
+                  for c, size, limit in zip(self.center, sizes, (width, height))]
+        return origin[0], origin[1], sizes[0], sizes[1]
+
+    def _set_crop(self, window: Optional[Window]):
+        if self.crop is not None and window != self.crop_window:
+            try:
+                self.crop(window)
+                self.crop_window = window
+            except Exception as e:
+                self.logger.error("Failed to set hardware crop: %s", e)
+                self.crop = None
+                self.crop_window = None
+
+    def plan(self, shape: Tuple[int, int]) -> Tuple[Optional[Region], Tuple[int, int]]:
+        """
+        Choose the part of the next image to process
+
+        Args:
+            shape: Shape of the image (full frame or hardware crop)
+
+        Returns:
+            (region of the image to process or None for all of it,
+             (x, y) full-frame position of that region's first pixel)
+        """
+        cropped = self.crop_window is not None and \
+            shape == (self.crop_window[3], self.crop_window[2]) and shape != self.frame_shape
+        if not cropped:
+            self.frame_shape = tuple(shape)
+        image_origin = (self.crop_window[0], self.crop_window[1]) if cropped else (0, 0)
+        self._full_frame = False
+
+        reacquire = self.reacquire_every and self._since_full >= self.reacquire_every
+        if self.center is None or reacquire:
+            if not cropped:
+                self.full_frames += 1
+                self._since_full = 0
+                self._reacquiring = False
+                self._full_frame = True
+                return None, (0, 0)
+            # Full sensor requested but this frame is still cropped
+            self._reacquiring = True
+            self._set_crop(None)
+            return None, image_origin
+
+        x0, y0, width, height = self._window(self.half_size)
+        # Shift to image coordinates and clip to the image (in-flight crops)
+        left, top = max(x0 - image_origin[0], 0), max(y0 - image_origin[1], 0)
+        right = min(x0 + width - image_origin[0], shape[1])
+        bottom = min(y0 + height - image_origin[1], shape[0])
+        if right <= left or bottom <= top:
+            self.center = None
+            return None, image_origin
+
+        self._since_full += 1
+        self.roi_frames += 1
+        return (slice(top, bottom), slice(left, right)), \
+            (left + image_origin[0], top + image_origin[1])
+
+    def update(self, features: Dict[str, float]):
+        """
+        Follow the spot reported in full-frame coordinates
+
+        Args:
+            features: Processing features with num_spots, centroid_x,
+                centroid_y and (optionally) spot_intensity
+        """
+        lost = not features.get("num_spots") or "centroid_x" not in features
+        intensity = features.get("spot_intensity")
+        if not lost and intensity is not None and self.loss_fraction > 0:
+            reference = self.reference_intensity
+            lost = reference is not None and intensity < self.loss_fraction * reference
+            if self._full_frame and not lost:
+                self.reference_intensity = float(intensity)
+
+        if lost:
+            if self.center is not None:
+                self.losses += 1
+                self.logger.debug("ROI lost the spot, re-acquiring on the full frame")
+            self.reset()
+            return
+
+        self.center = (float(features["centroid_x"]), float(features["centroid_y"]))
+        if self.crop is not None and self.frame_shape is not None and not self._reacquiring:
+            x0, y0, width, height = self._window(self.half_size)
+            crop = self.crop_window
+            inside = crop is not None and crop[0] <= x0 and crop[1] <= y0 and \
+                x0 + width <= crop[0] + crop[2] and y0 + height <= crop[1] + crop[3]
+            if not inside:
+                self._set_crop(self._window(self.crop_half_size))
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Get ROI usage statistics"""
+        return {
+            "roi_frames": self.roi_frames,
+            "full_frames": self.full_frames,
+            "losses": self.losses,
+            "reference_intensity": self.reference_intensity,
+            "center": self.center,
+            "crop_window": self.crop_window,
+        }
@@ -0,0 +1,112 @@
+"""
+AdWin Streaming Tests
+"""
+import numpy as np
+import pytest
+
+from hardware.adwin_board import AdWinGoldIII, PackedDecoder, adc_scale
+from hardware.adwin_sim import PackedAnalogProcess
+from hardware.adwin_stream import PackedBufferReader
+
+N_CHANNELS = 4
+BUFFER_STEPS = 10
+PERIOD_S = 1e-3
+
+
+def step_codes(steps: np.ndarray) -> np.ndarray:
+    """Code of channel k at step n, unique while n < 2**14"""
+    return steps[:, None] * N_CHANNELS + np.arange(N_CHANNELS)
+
+
+def counting_signal(t: np.ndarray) -> np.ndarray:
+    """Input voltages that the 16-bit ADC converts to step_codes"""
+    gain, offset = adc_scale(16)
+    steps = np.rint(t / PERIOD_S).astype(np.int64)
+    return step_codes(steps) * gain + offset
+
+
+@pytest.fixture
+def stream():
+    """Board, packed process and reader; events are run by calling `run(n)`"""
+    board = AdWinGoldIII(simulate=True)
+    sim = board._adwin.dll
+    process = PackedAnalogProcess(n_channels=N_CHANNELS, bits=16,
+                                  buffer_size=BUFFER_STEPS * N_CHANNELS // 2,
+                                  signal=counting_signal)
+    process.init(sim)
+    events = [0]
+
+    def run(n_events):
+        process.event(sim, events[0], n_events, PERIOD_S)
+        events[0] += n_events
+
+    reader = PackedBufferReader(board, n_channels=N_CHANNELS)
+    reader.sync()
+    yield reader, run
+    sim.close()
+
+
+def test_read_across_wrap_around(stream):
+    reader, run = stream
+
+    run(6)
+    block = reader.read()
+    assert block.first_step == 0
+    np.testing.assert_array_equal(block.data, step_codes(np.arange(6)))
+    assert reader.transfers == 1
+
+    # Steps 6..11 wrap around the end of the 10-step buffer
+    run(6)
+    block = reader.read()
+    assert block.first_step == 6
+    assert not block.overrun
+    np.testing.assert_array_equal(block.data, step_codes(np.arange(6, 12)))
+    assert reader.transfers == 3
+    assert reader.read() is None
+
+
+def test_overrun_counts_lost_steps(stream):
+    reader, run = stream
+
+    run(25)
+    block = reader.read()
+    assert block.overrun
+    assert reader.overruns == 1
+    # The newest half buffer is kept
+    assert reader.lost_steps == 25 - BUFFER_STEPS // 2
+    assert block.first_step == reader.lost_steps
+    np.testing.assert_array_equal(block.data, step_codes(np.arange(20, 25)))
+
+    run(3)
+    block = reader.read()
+    assert not block.overrun
+    np.testing.assert_array_equal(block.data, step_codes(np.arange(25, 28)))
+    assert reader.get_statistics()["steps_read"] == 8
+
+
+@pytest.mark.parametrize("bits", [12, 14, 16])
+def test_decoder_codes(bits):
+    rng = np.random.default_rng(bits)
+    codes = rng.integers(0, 1 << bits, size=(50, 16), dtype=np.uint32)
+    # Bits above the ADC resolution are not part of the sample
+    noisy = codes | (rng.integers(0, 1 << 16, size=codes.shape, dtype=np.uint32)
+                     & ~np.uint32((1 << bits) - 1))
+    raw = (noisy[:, 0::2] | (noisy[:, 1::2] << 16)).view(np.int32)
+
+    decoded = PackedDecoder(n_channels=16, bits=bits).decode(raw)
+    assert decoded.dtype == np.uint16
+    np.testing.assert_array_equal(decoded, codes)
+
+
+@pytest.mark.parametrize("bits", [12, 14, 16])
+def test_decoder_volts(bits):
+    process = PackedAnalogProcess(n_channels=16, bits=bits)
+    volts = np.random.default_rng(0).uniform(-9.5, 9.5, size=(50, 16))
+    codes = process.convert(volts)
+    raw = (codes[:, 0::2] | (codes[:, 1::2] << 16)).view(np.int32)
+
+    out = np.empty((50, 16), dtype=np.float32)
+    decoded = PackedDecoder(n_channels=16, bits=bits, volts=True).decode(raw, out=out)
+    assert decoded is out
+    lsb = adc_scale(bits)[0]
+    np.testing.assert_allclose(decoded, volts, atol=0.5 * lsb + 1e-5)
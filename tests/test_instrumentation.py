@@ -0,0 +1,55 @@
+"""
+Instrumentation Tests
+"""
+import numpy as np
+import pytest
+
+from control.instrumentation import LatencyHistogram
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram(sub_bucket_bits=5)
+    for value in range(32):
+        histogram.record(value)
+
+    assert histogram.percentile(50) == 15
+    assert histogram.min_ns == 0
+    assert histogram.max_ns == 31
+    assert histogram.percentile(100) == 31
+
+
+@pytest.mark.parametrize("percent", [50, 90, 99, 99.9])
+def test_percentile_relative_precision(percent):
+    values = np.random.default_rng(0).lognormal(13.0, 1.0, 20_000).astype(np.int64)
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    exact = np.percentile(values, percent, method="inverted_cdf")
+    # Buckets span at most 1 / 2**(sub_bucket_bits - 1) of their lower bound
+    assert exact * (1 - 1 / 16) <= histogram.percentile(percent) <= exact
+
+
+def test_values_are_clamped():
+    histogram = LatencyHistogram(max_value_ns=10**6)
+    histogram.record(-5)
+    histogram.record(10**9)
+
+    assert histogram.min_ns == 0
+    assert histogram.max_ns == 10**6
+    assert histogram.total_count == 2
+
+
+def test_summary_and_reset():
+    histogram = LatencyHistogram()
+    for value in (1_000_000, 2_000_000, 3_000_000):
+        histogram.record(value)
+
+    summary = histogram.summary()
+    assert summary["count"] == 3
+    assert summary["mean_ms"] == pytest.approx(2.0)
+    assert summary["max_ms"] == pytest.approx(3.0)
+
+    histogram.reset()
+    assert histogram.summary()["count"] == 0
+    assert histogram.percentile(50) == 0
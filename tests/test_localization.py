@@ -0,0 +1,59 @@
+"""
+Gaussian Localization Tests
+"""
+import numpy as np
+import pytest
+
+from processing.localization import GaussianLocalizer
+
+
+def spot_image(positions, sigma=1.5, amplitude=500.0, background=100.0, seed=0):
+    """Noisy image with one Gaussian spot per (x, y) position"""
+    rows, cols = np.indices((64, 64), dtype=np.float64)
+    image = np.full((64, 64), background)
+    for x, y in positions:
+        image += amplitude * np.exp(-((cols - x) ** 2 + (rows - y) ** 2) / (2 * sigma ** 2))
+    return np.random.default_rng(seed).poisson(image).astype(np.float64)
+
+
+POSITIONS = [(12.3, 15.6), (40.8, 22.1), (25.5, 50.2)]
+
+
+@pytest.mark.parametrize("method", ["lsq", "mle"])
+def test_fit_recovers_positions(method):
+    image = spot_image(POSITIONS)
+    seeds = np.rint(POSITIONS)
+    fit = GaussianLocalizer(method=method).localize(image, seeds[:, 0], seeds[:, 1])
+
+    truth = np.array(POSITIONS)
+    np.testing.assert_allclose(fit.x, truth[:, 0], atol=0.1)
+    np.testing.assert_allclose(fit.y, truth[:, 1], atol=0.1)
+    np.testing.assert_allclose(fit.sigma, 1.5, atol=0.1)
+    assert np.all(fit.x_err > 0) and np.all(fit.x_err < 0.1)
+
+
+def test_spot_at_image_border_stays_in_bounds():
+    image = spot_image([(0.4, 30.0)])
+    fit = GaussianLocalizer().localize(image, [0.0], [30.0])
+
+    assert abs(fit.x[0] - 0.4) < 0.2
+    assert abs(fit.y[0] - 30.0) < 0.2
+
+
+def test_no_spots():
+    fit = GaussianLocalizer().localize(spot_image([]), [], [])
+    assert len(fit) == 0
+
+
+@pytest.mark.parametrize("method", ["lsq", "mle"])
+def test_torch_matches_numpy(method):
+    pytest.importorskip("torch")
+    image = spot_image(POSITIONS)
+    seeds = np.rint(POSITIONS)
+    numpy_fit = GaussianLocalizer(method=method).localize(image, seeds[:, 0], seeds[:, 1])
+    torch_fit = GaussianLocalizer(method=method, use_torch=True, device="cpu").localize(
+        image, seeds[:, 0], seeds[:, 1])
+
+    for name in ("x", "y", "sigma", "amplitude", "offset", "x_err", "cost"):
+        np.testing.assert_allclose(getattr(torch_fit, name), getattr(numpy_fit, name),
+                                   rtol=1e-9, err_msg=name)
@@ -0,0 +1,29 @@
+"""
+Logging Setup Tests
+"""
+import logging
+
+from core.logging_setup import LOG_FORMAT, RateLimitFilter, SuppressedNoteFormatter
+
+
+def make_record(msg, *args):
+    return logging.LogRecord("lab", logging.INFO, __file__, 1, msg, args, None)
+
+
+def test_suppressed_note_keeps_args():
+    rate_limit = RateLimitFilter(rate=1e-9, burst=1)
+    assert rate_limit.filter(make_record("first"))
+    assert not rate_limit.filter(make_record("dropped %d%%", 50))
+
+    rate_limit._buckets["lab"][0] = 1.0
+    record = make_record("value %d of %s", 5, "x")
+    assert rate_limit.filter(record)
+    assert record.msg == "value %d of %s"
+
+    text = SuppressedNoteFormatter("%(message)s").format(record)
+    assert text == "value 5 of x [1 messages suppressed by rate limit]"
+
+
+def test_formatter_without_note():
+    text = SuppressedNoteFormatter(LOG_FORMAT).format(make_record("plain %s", "text"))
+    assert text.endswith(" - lab - INFO - plain text")
@@ -0,0 +1,39 @@
+"""
+Mock Device Tests
+"""
+import numpy as np
+import pytest
+
+from hardware.mock_devices import MockCamera
+
+
+def acquire(camera: MockCamera) -> np.ndarray:
+    camera.connect()
+    camera.start_acquisition()
+    return camera.acquire_image()
+
+
+def test_background_only_frames():
+    camera = MockCamera(width=64, height=48, n_spots=0, background=100.0)
+    image = acquire(camera)
+
+    assert image.shape == (48, 64)
+    assert camera.positions.shape == (0, 2)
+    assert abs(image.mean() - 100.0) < 2.0
+
+
+@pytest.mark.parametrize("n_spots", [1, 3])
+def test_spots_above_background(n_spots):
+    camera = MockCamera(width=128, height=96, n_spots=n_spots, spot_sigma=2.0,
+                        spot_amplitude=1000.0)
+    image = acquire(camera)
+
+    assert camera.positions.shape == (n_spots, 2)
+    for x, y in camera.positions:
+        assert image[int(round(y)), int(round(x))] > 500
+
+
+def test_binned_roi_shape():
+    camera = MockCamera(width=128, height=96, n_spots=0)
+    camera.set_roi(0, 64, 0, 32, hbin=2, vbin=2)
+    assert acquire(camera).shape == (16, 32)
@@ -0,0 +1,40 @@
+"""
+Processing Pipeline Tests
+"""
+import numpy as np
+import pytest
+
+from processing.pipeline import (CentroidDetection, FusedPreprocessing, GaussianLocalization,
+                                 ProcessingPipeline, SpotTracking)
+
+DETECTORS = [CentroidDetection, FusedPreprocessing, SpotTracking, GaussianLocalization]
+
+
+def make_pipeline(detector) -> ProcessingPipeline:
+    pipeline = ProcessingPipeline(use_gpu=False, in_place=True)
+    pipeline.add_processor(detector())
+    return pipeline
+
+
+def spot_frame(x: float = 40.0, y: float = 25.0) -> np.ndarray:
+    yy, xx = np.mgrid[:64, :96]
+    spot = 1000.0 * np.exp(-((xx - x) ** 2 + (yy - y) ** 2) / (2 * 2.0 ** 2))
+    return (100.0 + spot).astype(np.uint16)
+
+
+@pytest.mark.parametrize("detector", DETECTORS)
+def test_no_centroid_without_spots(detector):
+    features = make_pipeline(detector).process(np.full((64, 96), 100, np.uint16)).features
+
+    assert features["num_spots"] == 0
+    assert "centroid_x" not in features
+    assert "centroid_y" not in features
+
+
+@pytest.mark.parametrize("detector", DETECTORS)
+def test_centroid_of_spot(detector):
+    features = make_pipeline(detector).process(spot_frame()).features
+
+    assert features["num_spots"] == 1
+    assert features["centroid_x"] == pytest.approx(40.0, abs=0.5)
+    assert features["centroid_y"] == pytest.approx(25.0, abs=0.5)
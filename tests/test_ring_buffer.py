@@ -0,0 +1,63 @@
+"""
+Ring Buffer Tests
+"""
+import numpy as np
+import pytest
+
+from core.ring_buffer import RingBuffer
+
+
+def test_view_is_oldest_first_after_wrap():
+    ring = RingBuffer(4)
+    ring.extend(range(6))
+
+    assert len(ring) == 4
+    assert ring.full
+    np.testing.assert_array_equal(ring.view(), [2, 3, 4, 5])
+    assert ring.latest() == 5
+
+
+def test_view_is_not_a_copy():
+    ring = RingBuffer(3)
+    ring.extend([1.0, 2.0])
+    view = ring.view()
+    assert np.shares_memory(view, ring._data)
+
+
+@pytest.mark.parametrize("n", [3, 10, 1000])
+def test_running_stats_match_numpy(n):
+    values = np.random.default_rng(n).normal(5.0, 2.0, n)
+    ring = RingBuffer(64)
+    ring.extend(values)
+
+    kept = values[-64:]
+    assert ring.sum() == pytest.approx(kept.sum())
+    assert ring.mean() == pytest.approx(kept.mean())
+    assert ring.rms() == pytest.approx(np.sqrt(np.mean(kept ** 2)))
+
+
+def test_vector_items():
+    ring = RingBuffer(3, item_shape=2, dtype=np.int64)
+    for i in range(5):
+        ring.append((i, -i))
+
+    np.testing.assert_array_equal(ring.view(), [[2, -2], [3, -3], [4, -4]])
+    np.testing.assert_allclose(ring.mean(), [3.0, -3.0])
+
+
+def test_clear_and_empty():
+    ring = RingBuffer(2)
+    ring.extend([1.0, 2.0, 3.0])
+    ring.clear()
+
+    assert len(ring) == 0
+    assert ring.mean() == 0.0
+    with pytest.raises(IndexError):
+        ring.latest()
+
+
+def test_stats_disabled():
+    ring = RingBuffer(2, track_stats=False)
+    ring.append(1.0)
+    with pytest.raises(RuntimeError):
+        ring.mean()